@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Dedup Benchmark
+Misst Durchsatz und Genauigkeit der Duplikat-Erkennung auf synthetischen
+Korpora mit bekannten Duplikaten (Ground Truth)
+
+Verwendung:
+    python scripts/dev/benchmark_dedup.py
+    python scripts/dev/benchmark_dedup.py --sizes 1000,10000,100000
+    python scripts/dev/benchmark_dedup.py --compare scripts/dev/benchmarks/dedup-<alt>.json
+
+Duplikat-Varianten:
+    - typo:   Tippfehler im Titel
+    - alias:  Venue-Alias aus _data/venues.csv statt kanonischem Namen
+    - shift:  Startzeit ±30 Minuten verschoben
+    - copy:   Identische Kopie aus anderer Quelle
+"""
+
+import sys
+import json
+import time
+import random
+import platform
+import subprocess
+import tracemalloc
+from datetime import date, datetime, timedelta
+from itertools import combinations
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR / 'editorial'))
+sys.path.insert(0, str(SCRIPTS_DIR / 'json_workflow'))
+sys.path.insert(0, str(SCRIPTS_DIR / 'lib'))
+
+import deduplication_engine
+from deduplication_engine import DeduplicationEngine
+from venue_manager import VenueManager
+import reviewer
+from schemas import Event
+from dedup_index import DedupIndex
+
+PROJECT_ROOT = SCRIPTS_DIR.parent
+RESULTS_DIR = Path(__file__).parent / "benchmarks"
+
+TITLE_WORDS = [
+    "Konzert", "Lesung", "Karaoke", "Jazz", "Filmtage", "Stammtisch",
+    "Workshop", "Flohmarkt", "Theater", "Poetry Slam", "Vortrag", "Quiz",
+    "Ausstellung", "Wochenmarkt", "Tanzabend", "Matinee", "Führung", "Kabarett",
+]
+TITLE_SUFFIXES = [
+    "im Keller", "am Abend", "für Familien", "Spezial", "mit Gästen",
+    "unplugged", "zum Jahresende", "im Hof", "open air", "Teil 2",
+]
+SOURCES = ["stadt-hof", "freiheitshalle-web", "facebook", "frankenpost", "vhs-web"]
+VARIANTS = ["typo", "alias", "shift", "copy"]
+
+# Engines mit quadratischem Aufwand werden ab dieser Größe übersprungen
+DEFAULT_SCALAR_LIMIT = 10000
+
+
+# ============================================================
+# Korpus-Generator
+# ============================================================
+
+def load_venue_aliases():
+    """Venues mit Aliases aus _data/venues.csv"""
+    manager = VenueManager()
+    return [(venue['name'], venue['aliases']) for venue in manager.venues]
+
+
+def _typo(text, rng):
+    """Einzelner Tippfehler (Löschen, Vertauschen oder Verdoppeln)"""
+    if len(text) < 4:
+        return text + text[-1]
+    pos = rng.randrange(1, len(text) - 1)
+    kind = rng.choice(["delete", "swap", "double"])
+    if kind == "delete":
+        return text[:pos] + text[pos + 1:]
+    if kind == "swap":
+        return text[:pos] + text[pos + 1] + text[pos] + text[pos + 2:]
+    return text[:pos] + text[pos] + text[pos:]
+
+
+def _shift_time(time_str, rng):
+    hours, minutes = map(int, time_str.split(':'))
+    total = hours * 60 + minutes + rng.choice([-30, -15, 15, 30])
+    total %= 24 * 60
+    return f"{total // 60:02d}:{total % 60:02d}"
+
+
+def generate_corpus(size, duplicate_rate=0.25, seed=42, venues=None):
+    """
+    Erzeugt `size` Events, davon ca. duplicate_rate Duplikate
+
+    Returns:
+        list of dicts: {'event': event_data, 'source': str, 'group': int, 'variant': str}
+    """
+    rng = random.Random(seed)
+    venues = venues or load_venue_aliases()
+    days = max(30, size // 40)
+    start = date(2026, 1, 1)
+
+    corpus = []
+    group = 0
+    while len(corpus) < size:
+        venue_name, aliases = rng.choice(venues)
+        title = f"{rng.choice(TITLE_WORDS)} {rng.choice(TITLE_SUFFIXES)} #{group}"
+        base = {
+            'title': title,
+            'date': (start + timedelta(days=rng.randrange(days))).isoformat(),
+            'start_time': f"{rng.randint(10, 22):02d}:{rng.choice(['00', '30'])}",
+            'location': venue_name,
+            'description': "Lorem ipsum " * rng.randint(0, 20),
+            'event_hash': f"g{group}",
+        }
+        corpus.append({'event': base, 'source': rng.choice(SOURCES), 'group': group, 'variant': 'original'})
+
+        if rng.random() < duplicate_rate:
+            for _ in range(rng.randint(1, 2)):
+                if len(corpus) >= size:
+                    break
+                variant = rng.choice(VARIANTS)
+                dup = dict(base)
+                dup['event_hash'] = f"g{group}-{len(corpus)}"
+                if variant == "typo":
+                    dup['title'] = _typo(base['title'], rng)
+                elif variant == "alias" and aliases:
+                    dup['location'] = rng.choice(aliases)
+                elif variant == "shift":
+                    dup['start_time'] = _shift_time(base['start_time'], rng)
+                source = rng.choice([s for s in SOURCES if s != corpus[-1]['source']])
+                corpus.append({'event': dup, 'source': source, 'group': group, 'variant': variant})
+        group += 1
+
+    rng.shuffle(corpus)
+    return corpus
+
+
+def truth_pairs(corpus):
+    """Alle Paare (i, j) mit i < j aus derselben Ground-Truth-Gruppe"""
+    groups = {}
+    for position, item in enumerate(corpus):
+        groups.setdefault(item['group'], []).append(position)
+    pairs = set()
+    for members in groups.values():
+        pairs.update(combinations(sorted(members), 2))
+    return pairs
+
+
+def pairs_from_labels(labels):
+    """Paare aus Cluster-Zuordnung (gleiches Label = Duplikat)"""
+    groups = {}
+    for position, label in enumerate(labels):
+        groups.setdefault(label, []).append(position)
+    pairs = set()
+    for members in groups.values():
+        pairs.update(combinations(members, 2))
+    return pairs
+
+
+# ============================================================
+# Kandidaten
+# ============================================================
+
+class Counter:
+    """Zählt Aufrufe einer Scoring-Funktion"""
+
+    def __init__(self, func):
+        self.func = func
+        self.calls = 0
+
+    def __call__(self, *args, **kwargs):
+        self.calls += 1
+        return self.func(*args, **kwargs)
+
+
+def run_engine(corpus, vectorized=False):
+    """DeduplicationEngine.cluster_events (skalar oder NumPy-Fast-Path)"""
+    engine = DeduplicationEngine.__new__(DeduplicationEngine)
+    engine.clusters, engine.event_signatures = {}, {}
+    counter = Counter(engine.calculate_similarity)
+    engine.calculate_similarity = counter
+
+    items = [(item['event'], item['source']) for item in corpus]
+    labels = engine.cluster_events(items, vectorized=vectorized)
+
+    pairs_scored = counter.calls
+    if vectorized:
+        dates = {}
+        for item in corpus:
+            dates[item['event']['date']] = dates.get(item['event']['date'], 0) + 1
+        pairs_scored += sum(n * (n - 1) // 2 for n in dates.values())
+    return pairs_from_labels(labels), pairs_scored
+
+
+def run_reviewer(corpus):
+    """reviewer.find_duplicates gegen alle vorherigen Events (Referenz)"""
+    events = [
+        Event(id=item['event']['event_hash'], title=item['event']['title'],
+              date=item['event']['date'], start_time=item['event']['start_time'],
+              place={'name': item['event']['location']})
+        for item in corpus
+    ]
+    position = {id(event): n for n, event in enumerate(events)}
+    pairs = set()
+    pairs_scored = 0
+    for n, event in enumerate(events):
+        pairs_scored += n
+        for match, _ in reviewer.find_duplicates(event, events[:n]):
+            pairs.add((position[id(match)], n))
+    return pairs, pairs_scored
+
+
+def run_dedup_index(corpus):
+    """DedupIndex (scripts/lib): exakte + Fuzzy-Treffer pro Abfrage"""
+    index = DedupIndex()
+    counter = Counter(index.score)
+    index.score = counter
+    position = {}
+    pairs = set()
+    for n, item in enumerate(corpus):
+        result = index.query_event(item['event'])
+        for record in result.exact:
+            pairs.add((position[id(record)], n))
+        for record, _ in result.fuzzy:
+            pairs.add((position[id(record)], n))
+        record = index.add_front_matter(item['event'])
+        position[id(record)] = n
+    return pairs, counter.calls
+
+
+CANDIDATES = {
+    'engine-scalar': (lambda corpus: run_engine(corpus, vectorized=False), True),
+    'engine-vectorized': (lambda corpus: run_engine(corpus, vectorized=True), False),
+    'reviewer': (run_reviewer, True),
+    'dedup-index': (run_dedup_index, False),
+}
+
+
+# ============================================================
+# Messung
+# ============================================================
+
+def measure(name, corpus, truth, with_memory=True):
+    runner, _ = CANDIDATES[name]
+
+    started = time.perf_counter()
+    predicted, pairs_scored = runner(corpus)
+    wall_time = time.perf_counter() - started
+
+    peak_mb = None
+    if with_memory:
+        # Separater Lauf, damit tracemalloc die Zeitmessung nicht verfälscht
+        tracemalloc.start()
+        runner(corpus)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        peak_mb = round(peak / (1024 * 1024), 2)
+
+    true_positives = len(predicted & truth)
+    precision = true_positives / len(predicted) if predicted else 1.0
+    recall = true_positives / len(truth) if truth else 1.0
+
+    return {
+        'engine': name,
+        'size': len(corpus),
+        'wall_time_s': round(wall_time, 4),
+        'pairs_scored': pairs_scored,
+        'pairs_per_sec': round(pairs_scored / wall_time) if wall_time > 0 else None,
+        'peak_memory_mb': peak_mb,
+        'predicted_pairs': len(predicted),
+        'truth_pairs': len(truth),
+        'precision': round(precision, 4),
+        'recall': round(recall, 4),
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, cwd=PROJECT_ROOT)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def print_comparison(results, baseline_file):
+    """Zeigt Veränderungen gegenüber einem früheren Ergebnis"""
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(r['engine'], r['size']): r for r in baseline.get('results', [])}
+
+    print(f"\n📈 Vergleich mit {Path(baseline_file).name} ({baseline.get('git_commit')})")
+    for result in results:
+        old = previous.get((result['engine'], result['size']))
+        if not old or result.get('skipped') or old.get('skipped'):
+            continue
+        speedup = old['wall_time_s'] / result['wall_time_s'] if result['wall_time_s'] else 0
+        print(f"  {result['engine']:<18} n={result['size']:<7} "
+              f"Zeit {old['wall_time_s']:.3f}s → {result['wall_time_s']:.3f}s ({speedup:.2f}x) | "
+              f"P {old['precision']:.3f} → {result['precision']:.3f} | "
+              f"R {old['recall']:.3f} → {result['recall']:.3f}")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark für Duplikat-Erkennung')
+    parser.add_argument('--sizes', default='1000,5000',
+                        help='Korpus-Größen, kommasepariert (default: 1000,5000)')
+    parser.add_argument('--engines', default=','.join(CANDIDATES),
+                        help=f"Kandidaten (default: {','.join(CANDIDATES)})")
+    parser.add_argument('--duplicate-rate', type=float, default=0.25,
+                        help='Anteil Events mit Duplikaten (default: 0.25)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--scalar-limit', type=int, default=DEFAULT_SCALAR_LIMIT,
+                        help='Quadratische Kandidaten ab dieser Größe überspringen')
+    parser.add_argument('--no-memory', action='store_true',
+                        help='Peak-Memory nicht messen (halbiert die Laufzeit)')
+    parser.add_argument('--output', type=str,
+                        help='Ergebnis-Datei (default: scripts/dev/benchmarks/dedup-<datum>-<commit>.json)')
+    parser.add_argument('--compare', type=str,
+                        help='Früheres Ergebnis zum Vergleich')
+    args = parser.parse_args()
+
+    sizes = [int(s) for s in args.sizes.split(',') if s]
+    engines = [e for e in args.engines.split(',') if e]
+    unknown = [e for e in engines if e not in CANDIDATES]
+    if unknown:
+        parser.error(f"Unbekannte Engines: {', '.join(unknown)}")
+    if 'engine-vectorized' in engines and deduplication_engine.np is None:
+        print("⚠️  numpy nicht installiert - engine-vectorized übersprungen")
+        engines.remove('engine-vectorized')
+
+    print("=" * 80)
+    print("⏱️  Dedup Benchmark")
+    print("=" * 80)
+
+    venues = load_venue_aliases()
+    results = []
+
+    for size in sizes:
+        corpus = generate_corpus(size, args.duplicate_rate, args.seed, venues)
+        truth = truth_pairs(corpus)
+        print(f"\n📦 Korpus: {size} Events, {len(truth)} Duplikat-Paare")
+
+        for name in engines:
+            if CANDIDATES[name][1] and size > args.scalar_limit:
+                print(f"  ⏭️  {name:<18} übersprungen (> --scalar-limit {args.scalar_limit})")
+                results.append({'engine': name, 'size': size, 'skipped': True})
+                continue
+
+            result = measure(name, corpus, truth, with_memory=not args.no_memory)
+            results.append(result)
+            memory = f"{result['peak_memory_mb']:.1f} MB" if result['peak_memory_mb'] is not None else "-"
+            print(f"  ✓ {name:<18} {result['wall_time_s']:>8.3f}s | "
+                  f"{result['pairs_per_sec'] or 0:>10,} Paare/s | {memory:>9} | "
+                  f"P {result['precision']:.3f} R {result['recall']:.3f}")
+
+    commit = git_commit()
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'numpy': getattr(deduplication_engine.np, '__version__', None),
+        'seed': args.seed,
+        'duplicate_rate': args.duplicate_rate,
+        'results': results,
+    }
+
+    if args.output:
+        output = Path(args.output)
+    else:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"dedup-{datetime.now().strftime('%Y%m%d')}-{commit or 'local'}.json"
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Ergebnis gespeichert: {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
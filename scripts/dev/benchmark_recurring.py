@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Recurring Benchmark
+Misst die Expansion vieler wiederkehrender Serien im Lookahead-Fenster:
+skalare Referenz (expand_scalar, jede Serie einzeln) gegen den
+numpy-Batch (expand_batch) und prüft, dass beide dieselbe Tabelle liefern.
+
+Verwendung:
+    python scripts/dev/benchmark_recurring.py
+    python scripts/dev/benchmark_recurring.py --series 100,1000,10000 --months 3,12
+    python scripts/dev/benchmark_recurring.py --compare scripts/dev/benchmarks/recurring-<alt>.json
+"""
+
+import sys
+import json
+import time
+import random
+import platform
+import subprocess
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(SCRIPTS_DIR / 'lib'))
+
+import rrule
+from rrule import RRule, expand_batch, expand_scalar, random_config
+
+PROJECT_ROOT = SCRIPTS_DIR.parent
+RESULTS_DIR = Path(__file__).parent / "benchmarks"
+
+# Typische Serien (Wochenmarkt, Karaoke, Stammtisch, ...) plus Zufallsregeln
+TYPICAL_CONFIGS = [
+    {'frequency': 'weekly', 'by_day': ['WE', 'SA']},
+    {'frequency': 'weekly', 'by_day': ['WE']},
+    {'frequency': 'biweekly', 'by_day': ['TH']},
+    {'frequency': 'monthly', 'by_day': ['TU'], 'by_set_pos': 2},
+    {'frequency': 'monthly', 'by_day': ['1FR']},
+    {'frequency': 'monthly', 'by_month_day': [15]},
+    {'frequency': 'daily', 'by_day': ['MO', 'TU', 'WE', 'TH', 'FR']},
+]
+
+
+def generate_series(count, seed):
+    """count Regeln: 80% typische Serien, 20% Zufallskonfigurationen"""
+    rng = random.Random(seed)
+    today = date.today()
+    rules = {}
+    for i in range(count):
+        if rng.random() < 0.8:
+            config = dict(rng.choice(TYPICAL_CONFIGS))
+            config['start_date'] = (today - timedelta(days=rng.randint(0, 1500))).isoformat()
+            config['exceptions'] = [(today + timedelta(days=rng.randint(0, 90))).isoformat()
+                                    for _ in range(rng.randint(0, 2))]
+        else:
+            config = random_config(rng)
+        rules[f"series-{i:05d}"] = RRule.from_config(config)
+    return rules
+
+
+def measure(name, expand, rules, start, end):
+    started = time.perf_counter()
+    table = expand(rules, start, end)
+    wall_time = time.perf_counter() - started
+    return table, {
+        'engine': name,
+        'series': len(rules),
+        'window_days': (end - start).days + 1,
+        'wall_time_s': round(wall_time, 4),
+        'occurrences': len(table),
+        'occurrences_per_sec': round(len(table) / wall_time) if wall_time > 0 else None,
+    }
+
+
+def git_commit():
+    try:
+        result = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'],
+                                capture_output=True, text=True, cwd=PROJECT_ROOT)
+        return result.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def print_comparison(results, baseline_file):
+    """Zeigt Veränderungen gegenüber einem früheren Ergebnis"""
+    with open(baseline_file, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    key = lambda r: (r['engine'], r['series'], r['window_days'])
+    previous = {key(r): r for r in baseline.get('results', [])}
+
+    print(f"\n📈 Vergleich mit {Path(baseline_file).name} ({baseline.get('git_commit')})")
+    for result in results:
+        old = previous.get(key(result))
+        if not old:
+            continue
+        speedup = old['wall_time_s'] / result['wall_time_s'] if result['wall_time_s'] else 0
+        print(f"  {result['engine']:<7} n={result['series']:<6} {result['window_days']:>4} Tage "
+              f"Zeit {old['wall_time_s']:.3f}s → {result['wall_time_s']:.3f}s ({speedup:.2f}x)")
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark für Recurring-Expansion')
+    parser.add_argument('--series', default='100,1000,5000',
+                        help='Anzahl Serien, kommasepariert (default: 100,1000,5000)')
+    parser.add_argument('--months', default='3',
+                        help='Lookahead in Monaten, kommasepariert (default: 3)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', type=str,
+                        help='Ergebnis-Datei (default: scripts/dev/benchmarks/recurring-<datum>-<commit>.json)')
+    parser.add_argument('--compare', type=str,
+                        help='Früheres Ergebnis zum Vergleich')
+    args = parser.parse_args()
+
+    if rrule.np is None:
+        print("⚠️  numpy nicht installiert - batch fällt auf die skalare Expansion zurück")
+
+    print("=" * 80)
+    print("⏱️  Recurring Benchmark")
+    print("=" * 80)
+
+    results = []
+    start = date.today()
+    for count in [int(s) for s in args.series.split(',') if s]:
+        rules = generate_series(count, args.seed)
+        for months in [int(m) for m in args.months.split(',') if m]:
+            end = start + timedelta(days=months * 30)
+            print(f"\n📦 {count} Serien, {months} Monate")
+
+            scalar_table, scalar = measure('scalar', expand_scalar, rules, start, end)
+            batch_table, batch = measure('batch', expand_batch, rules, start, end)
+            batch['matches_scalar'] = batch_table == scalar_table
+            speedup = scalar['wall_time_s'] / batch['wall_time_s'] if batch['wall_time_s'] else 0
+
+            for result in (scalar, batch):
+                results.append(result)
+                print(f"  ✓ {result['engine']:<7} {result['wall_time_s']:>8.3f}s | "
+                      f"{result['occurrences']:>8,} Termine | "
+                      f"{result['occurrences_per_sec'] or 0:>12,} Termine/s")
+            status = "✅ identisch" if batch['matches_scalar'] else "❌ ABWEICHUNG"
+            print(f"  → {speedup:.1f}x schneller, {status}")
+
+    commit = git_commit()
+    report = {
+        'generated_at': datetime.now().isoformat(),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'numpy': getattr(rrule.np, '__version__', None),
+        'seed': args.seed,
+        'results': results,
+    }
+
+    if args.output:
+        output = Path(args.output)
+    else:
+        RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+        output = RESULTS_DIR / f"recurring-{datetime.now().strftime('%Y%m%d')}-{commit or 'local'}.json"
+
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 Ergebnis gespeichert: {output}")
+
+    if args.compare:
+        print_comparison(results, args.compare)
+
+    if not all(r.get('matches_scalar', True) for r in results):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -201,7 +201,7 @@ def main():
     print("1. Review generated JSON files in _data/places/ and _data/organizers/")
     print("2. Run scraper V2 to populate _data/staging/")
     print("3. Use reviewer.py to review staged events")
-    print("4. Use merger.py to apply approved events to _data/events.json")
+    print("4. Use merger.py to apply approved events to _data/events/ (month shards)")
 
 if __name__ == '__main__':
     main()
@@ -44,14 +44,18 @@ except ImportError:
     print("⚠️  Warning: 'PyPDF2' not installed - PDF support disabled")
     PyPDF2 = None
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from geocoder import get_geocoder
+
 
 class FlyerAnalyzer:
-    def __init__(self):
+    def __init__(self, geocoder=None):
         self.github_token = os.environ.get('GITHUB_TOKEN')
         self.default_coordinates = {
             'lat': 50.3197,
             'lng': 11.9168
         }
+        self.geocoder = geocoder or get_geocoder()
         
         # GitHub Models API Endpoint
         self.github_models_endpoint = "https://models.inference.ai.azure.com/chat/completions"
@@ -330,37 +334,14 @@ Antworte NUR mit JSON."""
         
         return data
     
-    def geocode_address(self, address):
-        """Geocodiert Adresse zu Koordinaten"""
-        if not address:
+    def geocode_address(self, address, location=None):
+        """Geocodiert Adresse zu Koordinaten (Gazetteer → Cache → Nominatim)"""
+        if not address and not location:
             return self.default_coordinates
         
-        print(f"🗺️  Geocoding: {address}")
-        
-        try:
-            # Nominatim (OpenStreetMap)
-            response = requests.get(
-                "https://nominatim.openstreetmap.org/search",
-                params={
-                    'q': f"{address}, Hof, Saale, Deutschland",
-                    'format': 'json',
-                    'limit': 1
-                },
-                headers={'User-Agent': 'krawl.ist/1.0'},
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                results = response.json()
-                if results:
-                    return {
-                        'lat': float(results[0]['lat']),
-                        'lng': float(results[0]['lon'])
-                    }
-        except Exception as e:
-            print(f"⚠️  Geocoding failed: {e}")
-        
-        return self.default_coordinates
+        print(f"🗺️  Geocoding: {address or location}")
+        coords = self.geocoder.geocode(address, location)
+        return coords or self.default_coordinates
     
     def generate_event_file(self, data):
         """Generiert Event Markdown Datei"""
@@ -378,7 +359,7 @@ Antworte NUR mit JSON."""
         filepath = events_dir / filename
         
         # Koordinaten
-        coords = self.geocode_address(data.get('address'))
+        coords = self.geocode_address(data.get('address'), data.get('location'))
         
         # Markdown generieren
         frontmatter = {
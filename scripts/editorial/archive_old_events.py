@@ -6,18 +6,82 @@ Monatliche Archivierung für bessere Übersicht
 """
 
 import os
+import re
 import shutil
+import sys
 import yaml
 import json
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Tuple, Set
+from typing import List, Dict, Optional, Tuple, Set
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from archive_index import update_months
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 EVENTS_DIR = PROJECT_ROOT / "_events"
 HISTORY_DIR = PROJECT_ROOT / "_events" / "_history"
 RECURRING_INDEX = PROJECT_ROOT / "_data" / "recurring_index.json"
 
+# Transaktions-Manifest des Batch-Modus (existiert nur während eines Laufs
+# bzw. nach einem Abbruch - dann --resume oder --rollback)
+ARCHIVE_MANIFEST = PROJECT_ROOT / ".cache" / "archive_transaction.json"
+MANIFEST_VERSION = 1
+
+# status-Zeile im Front Matter ("status: Öffentlich", 'status: "Entwurf"', ...)
+STATUS_LINE = re.compile(r'^status:\s*(["\']?)(.*?)\1\s*$')
+ARCHIVABLE_STATUS = ('Öffentlich', 'Entwurf')
+
+
+def _status_line(content: str) -> Tuple[int, int, Optional[re.Match]]:
+    """Position und Match der status-Zeile im Front Matter ((-1, -1, None) ohne Front Matter)"""
+    header_end = content.find('\n---', 3) if content.startswith('---') else -1
+    if header_end == -1:
+        return -1, -1, None
+    line_start = content.find('\n') + 1
+    while 0 < line_start <= header_end:
+        line_end = content.find('\n', line_start)
+        if line_end == -1 or line_end > header_end:
+            line_end = header_end
+        match = STATUS_LINE.match(content[line_start:line_end])
+        if match:
+            return line_start, line_end, match
+        line_start = line_end + 1
+    return header_end, header_end, None
+
+
+def rewrite_status(content: str) -> str:
+    """
+    Setzt den Status im Front Matter auf "Archiviert" (nur die status-Zeile)
+    
+    Öffentlich/Entwurf werden ersetzt (Anführungszeichen bleiben), andere
+    Status bleiben stehen; ohne status-Zeile wird eine eingefügt.
+    """
+    line_start, line_end, match = _status_line(content)
+    if line_start == -1:
+        return content
+    if match is None:
+        return content.replace('---\n', '---\nstatus: "Archiviert"\n', 1)
+    if match.group(2) not in ARCHIVABLE_STATUS:
+        return content
+    quote = match.group(1)
+    return content[:line_start] + f"status: {quote}Archiviert{quote}" + content[line_end:]
+
+
+def restore_status(content: str, original: Optional[str]) -> str:
+    """Macht rewrite_status rückgängig (original: Status vor der Archivierung, None = keiner)"""
+    line_start, line_end, match = _status_line(content)
+    if match is None or match.group(2) != 'Archiviert':
+        return content
+    if original is None:
+        return content.replace('---\nstatus: "Archiviert"\n', '---\n', 1)
+    if original not in ARCHIVABLE_STATUS:
+        return content
+    quote = match.group(1)
+    return content[:line_start] + f"status: {quote}{original}{quote}" + content[line_end:]
+
 
 class EventArchiver:
     """Verwaltet Archivierung alter Events mit monatlicher Struktur"""
@@ -32,6 +96,7 @@ class EventArchiver:
         self.threshold_date = datetime.now() - timedelta(days=days_threshold)
         self.scan_recurring = scan_recurring
         self.recurring_events = {}
+        self.touched_months: Set[str] = set()
         self.stats = {
             'total': 0,
             'archived': 0,
@@ -172,6 +237,7 @@ class EventArchiver:
                 
                 # Original-Datei löschen
                 filepath.unlink()
+                self.touched_months.add(archive_path.parent.name)
             
             print(f"  ✅ {filepath.name} → {archive_path.relative_to(EVENTS_DIR)}")
             return True
@@ -180,6 +246,176 @@ class EventArchiver:
             print(f"  ❌ Fehler bei {filepath.name}: {e}")
             return False
     
+    # ============================================================
+    # Batch-Modus (Transaktions-Manifest, os.rename, parallel je Monat)
+    # ============================================================
+    
+    def plan_moves(self, events: List[Dict]) -> List[Dict]:
+        """Plant die Verschiebungen (Pfade relativ zum Projekt, Status vor der Archivierung)"""
+        moves = []
+        for event in events:
+            if self.scan_recurring:
+                self.check_recurring(event)
+            filepath = event['_filepath']
+            archive_path = self.get_archive_path(event, filepath)
+            moves.append({
+                'src': str(filepath.relative_to(PROJECT_ROOT)),
+                'dst': str(archive_path.relative_to(PROJECT_ROOT)),
+                'month': archive_path.parent.name,
+                'status': event.get('status')
+            })
+        return moves
+    
+    def write_manifest(self, moves: List[Dict]):
+        """Schreibt das Transaktions-Manifest (vor dem ersten Move)"""
+        ARCHIVE_MANIFEST.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = ARCHIVE_MANIFEST.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'version': MANIFEST_VERSION,
+                'started_at': datetime.now().isoformat(),
+                'days_threshold': self.days_threshold,
+                'moves': moves
+            }, f, indent=1, ensure_ascii=False)
+        tmp_file.replace(ARCHIVE_MANIFEST)
+    
+    @staticmethod
+    def load_manifest() -> Optional[Dict]:
+        """Manifest eines unterbrochenen Laufs (None wenn keins existiert)"""
+        if not ARCHIVE_MANIFEST.exists():
+            return None
+        with open(ARCHIVE_MANIFEST, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('version') != MANIFEST_VERSION:
+            raise ValueError(f"Unbekannte Manifest-Version in {ARCHIVE_MANIFEST}")
+        return manifest
+    
+    @staticmethod
+    def apply_move(move: Dict) -> str:
+        """
+        Führt einen geplanten Move aus (idempotent, für --resume)
+        
+        status-Zeile in der Quelle umschreiben (tmp + os.replace), dann
+        os.rename ins Monatsverzeichnis. Der Zustand ergibt sich aus dem
+        Dateisystem: Quelle weg + Ziel da = erledigt.
+        
+        Returns:
+            'moved', 'done' (bereits erledigt), 'conflict' (Ziel existiert) oder 'missing'
+        """
+        src, dst = PROJECT_ROOT / move['src'], PROJECT_ROOT / move['dst']
+        if not src.exists():
+            return 'done' if dst.exists() else 'missing'
+        if dst.exists():
+            return 'conflict'
+        
+        with open(src, 'r', encoding='utf-8') as f:
+            content = f.read()
+        new_content = rewrite_status(content)
+        if new_content != content:
+            tmp_file = src.with_name(src.name + '.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(new_content)
+            os.replace(tmp_file, src)
+        os.rename(src, dst)
+        return 'moved'
+    
+    def _move_month(self, month_moves: List[Dict]) -> List[Tuple[Dict, str]]:
+        """Alle Moves eines Monatsverzeichnisses (ein Thread je Monat)"""
+        (PROJECT_ROOT / month_moves[0]['dst']).parent.mkdir(parents=True, exist_ok=True)
+        results = []
+        for move in month_moves:
+            try:
+                results.append((move, self.apply_move(move)))
+            except OSError as e:
+                results.append((move, f"error: {e}"))
+        return results
+    
+    def execute_moves(self, moves: List[Dict], workers: int = 8):
+        """Führt das Manifest aus: Monate parallel, danach Manifest entfernen"""
+        by_month = defaultdict(list)
+        for move in moves:
+            by_month[move['month']].append(move)
+        
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            month_results = list(pool.map(self._move_month, by_month.values()))
+        
+        for results in month_results:
+            for move, result in results:
+                name = Path(move['src']).name
+                if result in ('moved', 'done'):
+                    self.stats['archived'] += 1
+                    self.touched_months.add(move['month'])
+                    if result == 'moved':
+                        print(f"  ✅ {name} → {Path(move['dst']).relative_to('_events')}")
+                elif result == 'conflict':
+                    print(f"  ❌ {name}: Ziel existiert bereits ({move['dst']})")
+                    self.stats['errors'] += 1
+                elif result == 'missing':
+                    print(f"  ⚠️  {name}: Datei nicht mehr vorhanden")
+                    self.stats['errors'] += 1
+                else:
+                    print(f"  ❌ {name}: {result}")
+                    self.stats['errors'] += 1
+        
+        ARCHIVE_MANIFEST.unlink(missing_ok=True)
+    
+    def archive_batch(self, events: List[Dict], dry_run: bool = False, workers: int = 8):
+        """Batch-Archivierung: planen, Manifest schreiben, parallel verschieben"""
+        moves = self.plan_moves(events)
+        if dry_run:
+            for move in moves:
+                print(f"  • {Path(move['src']).name} → {Path(move['dst']).relative_to('_events')}")
+            return
+        
+        self.write_manifest(moves)
+        self.execute_moves(moves, workers)
+    
+    def resume(self, workers: int = 8) -> bool:
+        """Setzt einen unterbrochenen Batch-Lauf fort"""
+        manifest = self.load_manifest()
+        if not manifest:
+            print("ℹ️  Kein unterbrochener Archivierungs-Lauf gefunden")
+            return False
+        print(f"▶️  Setze Lauf vom {manifest['started_at']} fort ({len(manifest['moves'])} Events)")
+        self.execute_moves(manifest['moves'], workers)
+        self.update_archive_index()
+        print(f"Archiviert: {self.stats['archived']} Events, Fehler: {self.stats['errors']}")
+        return True
+    
+    def rollback(self) -> bool:
+        """
+        Macht einen unterbrochenen Batch-Lauf rückgängig
+        
+        Verschobene Dateien zurück nach _events/ (os.rename), status-Zeile
+        wieder auf den Stand vor dem Lauf ("Archiviert" → Öffentlich/Entwurf
+        bzw. eingefügte Zeile entfernen).
+        """
+        manifest = self.load_manifest()
+        if not manifest:
+            print("ℹ️  Kein unterbrochener Archivierungs-Lauf gefunden")
+            return False
+        
+        restored = 0
+        for move in reversed(manifest['moves']):
+            src, dst = PROJECT_ROOT / move['src'], PROJECT_ROOT / move['dst']
+            if dst.exists() and not src.exists():
+                os.rename(dst, src)
+            if not src.exists():
+                continue
+            with open(src, 'r', encoding='utf-8') as f:
+                content = f.read()
+            original_content = restore_status(content, move['status'])
+            if original_content != content:
+                with open(src, 'w', encoding='utf-8') as f:
+                    f.write(original_content)
+            restored += 1
+            self.touched_months.add(move['month'])
+        
+        ARCHIVE_MANIFEST.unlink()
+        self.update_archive_index()
+        print(f"↩️  Rollback abgeschlossen: {restored} Events wieder in _events/")
+        return True
+    
     def find_events_to_archive(self) -> List[Dict]:
         """Findet alle Events die archiviert werden sollen"""
         events_to_archive = []
@@ -211,17 +447,26 @@ class EventArchiver:
         
         return events_to_archive
     
-    def run(self, dry_run: bool = False, interactive: bool = False):
+    def run(self, dry_run: bool = False, interactive: bool = False, batch: bool = False,
+            workers: int = 8, force: bool = False):
         """
         Hauptfunktion: Archiviert alte Events
         
         Args:
             dry_run: Zeigt nur was passieren würde, ohne Änderungen
             interactive: Fragt bei jedem Event nach
+            batch: Batch-Modus (Manifest, os.rename, Monate parallel)
+            workers: Threads im Batch-Modus
+            force: Keine Bestätigung
         """
         print("\n" + "="*60)
         print("📦 EVENT ARCHIVIERUNG")
         print("="*60)
+        
+        if ARCHIVE_MANIFEST.exists():
+            print(f"⚠️  Unterbrochener Lauf gefunden ({ARCHIVE_MANIFEST.relative_to(PROJECT_ROOT)})")
+            print("   Erst mit --resume fortsetzen oder mit --rollback zurücknehmen.")
+            return
         print(f"Threshold: Events älter als {self.days_threshold} Tage")
         print(f"Stichtag: {self.threshold_date.strftime('%Y-%m-%d')}")
         
@@ -263,7 +508,7 @@ class EventArchiver:
                 print(f"  • _history/{month}/: {len(month_events)} Events")
         
         # Bestätigung einholen (wenn nicht dry_run)
-        if not dry_run and not interactive:
+        if not dry_run and not interactive and not force:
             print("\n" + "-"*60)
             response = input(f"❓ {len(events)} Events archivieren? (j/n): ")
             if response.lower() != 'j':
@@ -274,6 +519,10 @@ class EventArchiver:
         print("\n📦 Archiviere Events...")
         print("-"*60)
         
+        if batch:
+            self.archive_batch(events, dry_run=dry_run, workers=workers)
+            events = []
+        
         for event in events:
             if interactive and not dry_run:
                 print(f"\n📄 {event['_filepath'].name}")
@@ -293,6 +542,9 @@ class EventArchiver:
         if self.recurring_events and not dry_run:
             self.update_recurring_index()
         
+        # Monats-Zusammenfassungen für Archiv-Abfragen
+        self.update_archive_index()
+        
         # Abschluss-Statistik
         print("\n" + "="*60)
         print("✅ ARCHIVIERUNG ABGESCHLOSSEN")
@@ -312,6 +564,17 @@ class EventArchiver:
                 print("\n🔄 Tipp: Führe 'python3 scripts/recurring_expander.py' aus,")
                 print("   um neue Instanzen für wiederkehrende Events zu generieren.")
     
+    def update_archive_index(self):
+        """Aktualisiert die Zusammenfassungen der Monate, in die archiviert wurde"""
+        if not self.touched_months:
+            return
+        try:
+            count = update_months(self.touched_months, HISTORY_DIR)
+            print(f"\n🗂️  Archiv-Index: {len(self.touched_months)} Monate, {count} Events")
+        except Exception as e:
+            print(f"⚠️  Fehler beim Aktualisieren des Archiv-Index: {e}")
+        self.touched_months.clear()
+    
     def update_recurring_index(self):
         """Aktualisiert Recurring-Events-Index"""
         if not self.recurring_events:
@@ -381,14 +644,43 @@ def main():
         action='store_true',
         help='Keine Bestätigung erforderlich'
     )
+    parser.add_argument(
+        '--batch',
+        action='store_true',
+        help='Batch-Modus: Manifest, os.rename, Monatsverzeichnisse parallel'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Threads im Batch-Modus (default: 8)'
+    )
+    parser.add_argument(
+        '--resume',
+        action='store_true',
+        help='Unterbrochenen Batch-Lauf fortsetzen'
+    )
+    parser.add_argument(
+        '--rollback',
+        action='store_true',
+        help='Unterbrochenen Batch-Lauf rückgängig machen'
+    )
     
     args = parser.parse_args()
     
     archiver = EventArchiver(days_threshold=args.days)
-    archiver.run(
-        dry_run=args.dry_run,
-        interactive=args.interactive
-    )
+    if args.resume:
+        archiver.resume(workers=args.workers)
+    elif args.rollback:
+        archiver.rollback()
+    else:
+        archiver.run(
+            dry_run=args.dry_run,
+            interactive=args.interactive and not args.batch,
+            batch=args.batch,
+            workers=args.workers,
+            force=args.force
+        )
 
 
 if __name__ == "__main__":
@@ -6,15 +6,39 @@ Erkennt Duplikate, clustert Events und reichert Daten an
 
 import csv
 import hashlib
+import json
 import re
+import sys
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 from difflib import SequenceMatcher
 import yaml
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Vektorisierter Fast-Path nicht verfügbar
+
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from organizer_registry import get_registry
+from spatial_index import SAME_VENUE_KM, coords_of, haversine_km, pairwise_within
+
+# Ab diesem Score gehört ein Event zu einem bestehenden Cluster
+CLUSTER_THRESHOLD = 0.8
+
+# Review-Queue für admin.html (sortierte Seiten + Detail-Shards + Manifest)
+REVIEW_QUEUE_DIR = PROJECT_ROOT / "assets" / "data" / "admin_review"
+REVIEW_PAGE_SIZE = 25
+REVIEW_SORT_KEYS = {
+    # Niedrigste Confidence zuerst (benötigen am ehesten Review)
+    'confidence': lambda r: (r['confidence'], r['date'], r['cluster_id']),
+    'date': lambda r: (r['date'], r['confidence'], r['cluster_id']),
+}
+
 
 class EventCluster:
     """Repräsentiert ein Cluster von ähnlichen/doppelten Events"""
@@ -133,6 +157,93 @@ class EventCluster:
         return merged
 
 
+class BlockScorer:
+    """
+    Vektorisierte Kandidatensuche für einen Block (z.B. ein Tag)
+    
+    Berechnet für alle Paare eines Blocks eine obere Schranke des Scores von
+    calculate_similarity (Titel 60%, Ort 30%, Zeit 10%). Für Titel und Ort
+    wird statt SequenceMatcher.ratio() die Zeichen-Überdeckung
+    2 * Σ min(Anzahl) / (Länge a + Länge b) verwendet (wie quick_ratio(),
+    das nie kleiner als ratio() ist). Paare unter der Cluster-Schwelle können
+    daher skalar nicht zusammenfallen; nur der Rest wird skalar geprüft.
+    Benötigt numpy.
+    """
+    
+    def __init__(self):
+        if np is None:
+            raise ImportError("numpy ist nicht installiert (pip install numpy)")
+    
+    @staticmethod
+    def char_counts(texts: List[str]) -> 'np.ndarray':
+        """Zeichen-Häufigkeiten (n x Alphabet) für normalisierte Texte"""
+        alphabet: Dict[str, int] = {}
+        rows, cols = [], []
+        for row, text in enumerate(texts):
+            for char in text:
+                rows.append(row)
+                cols.append(alphabet.setdefault(char, len(alphabet)))
+        
+        counts = np.zeros((len(texts), max(len(alphabet), 1)), dtype=np.int32)
+        if rows:
+            np.add.at(counts, (np.array(rows), np.array(cols)), 1)
+        return counts
+    
+    def field_bound(self, texts: List[str]) -> 'np.ndarray':
+        """
+        Obere Schranke von SequenceMatcher.ratio() für alle Paare eines Feldes;
+        zwei leere Werte ergeben 1.0 (wie SequenceMatcher('', '').ratio())
+        """
+        counts = self.char_counts(texts)
+        lengths = counts.sum(axis=1)
+        overlap = np.empty((len(texts), len(texts)), dtype=np.int64)
+        for row in range(len(texts)):
+            overlap[row] = np.minimum(counts[row], counts).sum(axis=1)
+        
+        total = lengths[:, None] + lengths[None, :]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            bound = np.where(total > 0, 2.0 * overlap / total, 1.0)
+        return bound
+    
+    def score_bound(self, events: List[Dict]) -> 'np.ndarray':
+        """Obere Schranke von calculate_similarity (n x n) für Events desselben Blocks"""
+        normalize = DeduplicationEngine.normalize_text
+        titles = [normalize(e.get('title', '') or '') for e in events]
+        locations = [normalize(e.get('location', '') or '') for e in events]
+        
+        # Orte ≤ 50 m auseinander gelten als gleicher Ort (wie calculate_similarity)
+        same_venue = np.asarray(pairwise_within([coords_of(e) for e in events], SAME_VENUE_KM))
+        scores = 0.6 * self.field_bound(titles) \
+            + 0.3 * np.maximum(self.field_bound(locations), same_venue)
+        
+        # Zeit-Toleranz ±30min (nur wenn beide Zeiten gesetzt)
+        times = [e.get('start_time', '') for e in events]
+        has_time = np.array([bool(t) for t in times])
+        minutes = np.array([DeduplicationEngine.parse_time_to_minutes(str(t)) if t else 0
+                            for t in times])
+        time_ok = (np.abs(minutes[:, None] - minutes[None, :]) <= 30) \
+            & has_time[:, None] & has_time[None, :]
+        scores += 0.1 * time_ok
+        
+        # Datum muss identisch sein
+        dates = np.array([str(e.get('date', '')) for e in events])
+        scores *= (dates[:, None] == dates[None, :])
+        return scores
+    
+    def pairs_above(self, events: List[Dict], threshold: float) -> List[Tuple[int, int, float]]:
+        """Alle Paare (i < j), deren Schranke >= threshold ist"""
+        if len(events) < 2:
+            return []
+        scores = self.score_bound(events)
+        upper_i, upper_j = np.triu_indices(len(events), k=1)
+        # Rundungsreserve: der skalare Score wird anders summiert
+        mask = scores[upper_i, upper_j] >= threshold - 1e-9
+        return [
+            (int(i), int(j), float(scores[i, j]))
+            for i, j in zip(upper_i[mask], upper_j[mask])
+        ]
+
+
 class DeduplicationEngine:
     """Engine für Event-Deduplication und Enrichment"""
     
@@ -143,36 +254,12 @@ class DeduplicationEngine:
         
         self.clusters = {}  # cluster_id -> EventCluster
         self.event_signatures = {}  # signature -> cluster_id
+        self.organizer_registry = get_registry()
         self.organizers = self.load_organizers()
     
     def load_organizers(self) -> Dict[str, Dict]:
-        """Lädt Veranstalter-Datenbank mit vollständigen Kontaktdaten"""
-        organizers = {}
-        if self.organizers_csv.exists():
-            with open(self.organizers_csv, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    organizers[row['name']] = {
-                        'aliases': [a.strip() for a in row['aliases'].split(',') if a],
-                        'verified_sources': [s.strip() for s in row['verified_sources'].split(',') if s],
-                        'typical_venues': [v.strip() for v in row['typical_venues'].split(',') if v],
-                        'website': row.get('website', ''),
-                        'contact_email': row.get('contact_email', ''),
-                        'contact_phone': row.get('contact_phone', ''),
-                        'contact_person': row.get('contact_person', ''),
-                        'contact_role': row.get('contact_role', ''),
-                        'social_media_facebook': row.get('social_media_facebook', ''),
-                        'social_media_instagram': row.get('social_media_instagram', ''),
-                        'press_contact': row.get('press_contact', ''),
-                        'press_email': row.get('press_email', ''),
-                        'press_phone': row.get('press_phone', ''),
-                        'best_contact_time': row.get('best_contact_time', ''),
-                        'preferred_contact_method': row.get('preferred_contact_method', ''),
-                        'notes': row.get('notes', ''),
-                        'last_contact_date': row.get('last_contact_date', ''),
-                        'relationship_status': row.get('relationship_status', '')
-                    }
-        return organizers
+        """Lädt Veranstalter-Datenbank mit vollständigen Kontaktdaten (aus der Registry)"""
+        return self.organizer_registry.crm_organizers()
     
     def generate_signature(self, event_data: Dict) -> str:
         """Generiert Signature für Similarity-Matching"""
@@ -213,9 +300,14 @@ class DeduplicationEngine:
         score += title_sim * 0.6
         
         # Location-Ähnlichkeit (30% Gewichtung)
-        loc1 = self.normalize_text(event1.get('location', ''))
-        loc2 = self.normalize_text(event2.get('location', ''))
-        loc_sim = SequenceMatcher(None, loc1, loc2).ratio()
+        # Koordinaten ≤ 50 m auseinander zählen als gleicher Ort
+        coords1, coords2 = coords_of(event1), coords_of(event2)
+        if coords1 and coords2 and haversine_km(*coords1, *coords2) <= SAME_VENUE_KM:
+            loc_sim = 1.0
+        else:
+            loc1 = self.normalize_text(event1.get('location', ''))
+            loc2 = self.normalize_text(event2.get('location', ''))
+            loc_sim = SequenceMatcher(None, loc1, loc2).ratio()
         score += loc_sim * 0.3
         
         # Zeit-Ähnlichkeit (10% Gewichtung)
@@ -240,19 +332,31 @@ class DeduplicationEngine:
         except:
             return 0
     
-    def find_or_create_cluster(self, event_data: Dict, source: str) -> str:
-        """Findet existierendes Cluster oder erstellt neues"""
+    def find_or_create_cluster(self, event_data: Dict, source: str,
+                               candidate_clusters: Optional[List[str]] = None) -> str:
+        """
+        Findet existierendes Cluster oder erstellt neues
+        
+        Args:
+            candidate_clusters: Optional vorgefilterte Cluster-IDs (Fast-Path);
+                None = alle Cluster prüfen
+        """
         signature = self.generate_signature(event_data)
         
         # Prüfe ob ähnliches Event bereits existiert
         best_match_cluster = None
         best_similarity = 0.0
         
-        for cluster_id, cluster in self.clusters.items():
+        if candidate_clusters is None:
+            cluster_items = self.clusters.items()
+        else:
+            cluster_items = [(cid, self.clusters[cid]) for cid in candidate_clusters]
+        
+        for cluster_id, cluster in cluster_items:
             similarity = self.calculate_similarity(event_data, cluster.canonical)
             
             # Threshold: 0.8 = sehr wahrscheinlich dasselbe Event
-            if similarity >= 0.8 and similarity > best_similarity:
+            if similarity >= CLUSTER_THRESHOLD and similarity > best_similarity:
                 best_similarity = similarity
                 best_match_cluster = cluster_id
         
@@ -269,27 +373,96 @@ class DeduplicationEngine:
             self.event_signatures[signature] = cluster_id
             return cluster_id
     
-    def find_organizer_for_event(self, event_data: Dict) -> Optional[Dict]:
-        """Findet Veranstalter-Informationen für ein Event"""
-        organizer_name = event_data.get('organizer', '')
-        location = event_data.get('location', '')
-        
-        # Direkte Übereinstimmung
-        if organizer_name in self.organizers:
-            return self.organizers[organizer_name]
-        
-        # Suche über Aliases
-        for org_name, org_data in self.organizers.items():
-            if organizer_name in org_data['aliases']:
-                return org_data
-        
-        # Suche über typische Venues
-        for org_name, org_data in self.organizers.items():
-            if location in org_data['typical_venues']:
-                # Fuzzy-Match: Venue könnte Hinweis sein
-                return {**org_data, 'match_type': 'venue_based', 'confidence': 0.7}
+    def cluster_events(self, items: List[Tuple[Dict, str]], vectorized: bool = False) -> List[str]:
+        """
+        Clustert eine Liste von (event_data, source) in Eingabe-Reihenfolge
+        
+        Args:
+            vectorized: NumPy-Fast-Path nutzen. Die Schranken-Matrix wird
+                einmal pro Datum berechnet; nur Cluster, deren kanonisches Event
+                die Cluster-Schwelle erreichen kann, werden skalar geprüft
+                (gleiche Zuordnung wie der skalare Pfad).
+        
+        Returns:
+            Cluster-IDs pro Event (gleiche Reihenfolge wie items)
+        """
+        if not vectorized or np is None:
+            if vectorized:
+                print("⚠️  numpy nicht installiert - verwende skalaren Scorer")
+            return [self.find_or_create_cluster(event, source) for event, source in items]
+        
+        scorer = BlockScorer()
+        
+        # Pool: kanonische Events bestehender Cluster + neue Events
+        prior = list(self.clusters.items())
+        pool = [cluster.canonical for _, cluster in prior] + [event for event, _ in items]
+        offset = len(prior)
+        
+        # Blöcke nach Datum (verschiedene Daten haben Similarity 0.0)
+        blocks = defaultdict(list)
+        for position, event in enumerate(pool):
+            blocks[str(event.get('date', ''))].append(position)
+        
+        # Kandidaten-Nachbarn je Event aus der Block-Matrix
+        neighbors = defaultdict(set)
+        for positions in blocks.values():
+            block_events = [pool[p] for p in positions]
+            for i, j, _ in scorer.pairs_above(block_events, CLUSTER_THRESHOLD):
+                neighbors[positions[i]].add(positions[j])
+                neighbors[positions[j]].add(positions[i])
+        
+        cluster_order = {cid: n for n, (cid, _) in enumerate(prior)}
+        assigned = [cid for cid, _ in prior]  # Pool-Position -> Cluster-ID
+        position_of = {id(cluster.canonical): n for n, (_, cluster) in enumerate(prior)}
+        
+        for position, (event, source) in enumerate(items, start=offset):
+            # Nur Cluster, deren aktuelles kanonisches Event ein Nachbar ist
+            candidates = set()
+            for neighbor in neighbors[position]:
+                if neighbor >= position:
+                    continue
+                cluster = self.clusters[assigned[neighbor]]
+                if position_of.get(id(cluster.canonical)) == neighbor:
+                    candidates.add(assigned[neighbor])
+            
+            ordered = sorted(candidates, key=cluster_order.__getitem__)
+            cluster_id = self.find_or_create_cluster(event, source, candidate_clusters=ordered)
+            cluster_order.setdefault(cluster_id, len(cluster_order))
+            position_of[id(event)] = position
+            assigned.append(cluster_id)
         
-        return None
+        return assigned[offset:]
+    
+    def check_parity(self, items: List[Tuple[Dict, str]]) -> Dict:
+        """
+        Vergleicht skalaren Scorer und NumPy-Fast-Path auf denselben Events
+        
+        Returns:
+            Dict mit 'matches' (bool), Cluster-Anzahl beider Pfade und
+            Positionen mit abweichender Zuordnung
+        """
+        scalar = DeduplicationEngine.__new__(DeduplicationEngine)
+        scalar.clusters, scalar.event_signatures = {}, {}
+        fast = DeduplicationEngine.__new__(DeduplicationEngine)
+        fast.clusters, fast.event_signatures = {}, {}
+        
+        scalar_ids = scalar.cluster_events(items, vectorized=False)
+        fast_ids = fast.cluster_events(items, vectorized=True)
+        mismatches = [n for n, (a, b) in enumerate(zip(scalar_ids, fast_ids)) if a != b]
+        
+        return {
+            'matches': not mismatches,
+            'scalar_clusters': len(scalar.clusters),
+            'vectorized_clusters': len(fast.clusters),
+            'mismatches': mismatches
+        }
+    
+    def find_organizer_for_event(self, event_data: Dict) -> Optional[Dict]:
+        """Findet Veranstalter-Informationen für ein Event (Name/Alias → Venue)"""
+        return self.organizer_registry.resolve(
+            event_data.get('organizer', '') or '',
+            event_data.get('location', '') or ''
+        )
     
     def detect_organizer_patterns(self):
         """Erkennt Muster: Welcher Veranstalter nutzt welche Quellen?"""
@@ -401,8 +574,119 @@ class DeduplicationEngine:
         return score / max_score if max_score > 0 else 0.0
 
 
+def write_review_queue(review_data: List[Dict], output_dir: Path = REVIEW_QUEUE_DIR,
+                       page_size: int = REVIEW_PAGE_SIZE, sort_by: str = 'confidence') -> Dict:
+    """
+    Schreibt die Review-Queue als sortierte, paginierte Shards
+
+    Layout:
+        manifest.json          Gesamtzahl, Sortierung, Seiten- und Detail-Dateien
+        page-0001.json ...     Schlanke Einträge (alles, was die Karte braucht)
+        clusters/YYYY-MM.json  canonical_data je cluster_id (nach Event-Monat)
+        organizers.json        Kontaktdaten je Veranstalter-Slug
+
+    Schlanke Einträge referenzieren canonical_data über cluster_id + detail_shard
+    und Kontaktdaten über organizer.slug, damit die erste Seite unabhängig von
+    der Größe des Backlogs sofort geladen werden kann.
+
+    Returns:
+        Das geschriebene Manifest
+    """
+    if sort_by not in REVIEW_SORT_KEYS:
+        raise ValueError(f"Unbekannte Sortierung: {sort_by} (erlaubt: {', '.join(REVIEW_SORT_KEYS)})")
+    page_size = max(1, page_size)
+
+    ordered = sorted(review_data, key=REVIEW_SORT_KEYS[sort_by])
+    slim_records = []
+    detail_shards: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+    organizers: Dict[str, Dict] = {}
+
+    for item in ordered:
+        shard = str(item['date'])[:7] or 'undated'
+        detail_shards[shard][item['cluster_id']] = item['canonical_data']
+
+        organizer_ref = None
+        organizer_info = item.get('organizer_info')
+        if organizer_info:
+            slug = organizer_info.get('slug')
+            organizers[slug] = {k: v for k, v in organizer_info.items()
+                                if k not in ('match_type', 'confidence')}
+            organizer_ref = {
+                'slug': slug,
+                'name': organizer_info.get('name', ''),
+                'match_type': organizer_info.get('match_type'),
+                'confidence': organizer_info.get('confidence'),
+            }
+
+        description = item['canonical_data'].get('description') or ''
+        slim_records.append({
+            'cluster_id': item['cluster_id'],
+            'title': item['title'],
+            'date': item['date'],
+            'location': item['location'],
+            'duplicate_count': item['duplicate_count'],
+            'confidence': item['confidence'],
+            'requires_review': item['requires_review'],
+            'data_quality_score': item['data_quality_score'],
+            'source_links': item['source_links'],
+            'description_preview': description[:300],
+            'description_truncated': len(description) > 300,
+            'organizer': organizer_ref,
+            'detail_shard': shard,
+        })
+
+    output_dir = Path(output_dir)
+    clusters_dir = output_dir / "clusters"
+    clusters_dir.mkdir(parents=True, exist_ok=True)
+
+    # Alte Shards entfernen (Anzahl Seiten/Monate kann schrumpfen)
+    for stale in list(output_dir.glob("page-*.json")) + list(clusters_dir.glob("*.json")):
+        stale.unlink()
+
+    def dump(path: Path, data):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+
+    pages = []
+    for start in range(0, len(slim_records), page_size):
+        chunk = slim_records[start:start + page_size]
+        filename = f"page-{len(pages) + 1:04d}.json"
+        dump(output_dir / filename, chunk)
+        pages.append({'file': filename, 'count': len(chunk)})
+
+    for shard, clusters in detail_shards.items():
+        dump(clusters_dir / f"{shard}.json", clusters)
+    dump(output_dir / "organizers.json", organizers)
+
+    manifest = {
+        'generated_at': datetime.now().isoformat(),
+        'total': len(slim_records),
+        'requires_review': sum(1 for r in slim_records if r['requires_review']),
+        'sort_by': sort_by,
+        'page_size': page_size,
+        'pages': pages,
+        'detail_shards': sorted(detail_shards),
+        'organizers': 'organizers.json',
+    }
+    dump(output_dir / "manifest.json", manifest)
+    return manifest
+
+
 def main():
     """Hauptfunktion für Testing"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Erkennt Duplikate und clustert Events')
+    parser.add_argument('--vectorized', action='store_true',
+                        help='NumPy-Fast-Path verwenden (benötigt numpy)')
+    parser.add_argument('--check-parity', action='store_true',
+                        help='Skalaren und vektorisierten Scorer vergleichen')
+    parser.add_argument('--sort', choices=sorted(REVIEW_SORT_KEYS), default='confidence',
+                        help='Sortierung der Review-Queue (default: confidence)')
+    parser.add_argument('--page-size', type=int, default=REVIEW_PAGE_SIZE,
+                        help=f'Einträge pro Review-Seite (default: {REVIEW_PAGE_SIZE})')
+    args = parser.parse_args()
+    
     engine = DeduplicationEngine()
     
     # Beispiel: Events laden und clustern
@@ -413,6 +697,8 @@ def main():
     event_files = list(Path("_events").glob("*.md"))
     print(f"📄 {len(event_files)} Event-Dateien gefunden")
     
+    items = []
+    item_files = []
     for event_file in event_files[:20]:  # Test mit ersten 20
         try:
             with open(event_file, 'r', encoding='utf-8') as f:
@@ -423,12 +709,21 @@ def main():
                     if len(parts) >= 3:
                         event_data = yaml.safe_load(parts[1])
                         source = event_data.get('source', 'unknown')
-                        
-                        cluster_id = engine.find_or_create_cluster(event_data, source)
-                        print(f"  → {event_file.name}: Cluster {cluster_id}")
+                        items.append((event_data, source))
+                        item_files.append(event_file)
         except Exception as e:
             print(f"  ❌ Fehler bei {event_file.name}: {e}")
     
+    if args.check_parity:
+        parity = engine.check_parity(items)
+        status = "✅ identisch" if parity['matches'] else f"❌ {len(parity['mismatches'])} Abweichungen"
+        print(f"\n🔬 Parität skalar/vektorisiert: {status}")
+        print(f"   Cluster: {parity['scalar_clusters']} (skalar) / {parity['vectorized_clusters']} (vektorisiert)")
+    
+    cluster_ids = engine.cluster_events(items, vectorized=args.vectorized)
+    for event_file, cluster_id in zip(item_files, cluster_ids):
+        print(f"  → {event_file.name}: Cluster {cluster_id}")
+    
     print(f"\n📊 Ergebnis: {len(engine.clusters)} Cluster gefunden")
     
     # Muster erkennen
@@ -444,13 +739,10 @@ def main():
     review_data = engine.generate_admin_review_data()
     print(f"\n📝 {len(review_data)} Events benötigen Review")
     
-    # JSON für Admin-Interface
-    import json
-    review_json = Path("_data/admin_review_queue.json")
-    with open(review_json, 'w', encoding='utf-8') as f:
-        json.dump(review_data, f, indent=2, ensure_ascii=False, default=str)
-    print(f"✅ Review-Queue gespeichert: {review_json}")
-
+    # Paginierte Shards für Admin-Interface
+    manifest = write_review_queue(review_data, page_size=args.page_size, sort_by=args.sort)
+    print(f"✅ Review-Queue gespeichert: {REVIEW_QUEUE_DIR.relative_to(PROJECT_ROOT)}/ "
+          f"({len(manifest['pages'])} Seiten, {len(manifest['detail_shards'])} Detail-Shards)")
 
 if __name__ == "__main__":
     main()
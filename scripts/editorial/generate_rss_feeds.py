@@ -4,9 +4,52 @@ RSS Feed Generator
 Generiert RSS-Feed-Dateien basierend auf _config.yml Konfiguration
 """
 
+import json
+import sys
 import yaml
 from pathlib import Path
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from spatial_index import build_event_index, load_event_records, radius_membership
+
+RADIUS_INDEX = Path('_data') / 'event_radius.json'
+RECURRING_INSTANCES = Path('_data') / 'recurring_instances.json'
+
+
+def generate_radius_index(config):
+    """
+    Schreibt _data/event_radius.json: Event-Pfade je Radius um das Stadtzentrum
+
+    Radien aus filters.radius_filters (km) und den radius-Angaben der Feeds.
+    _layouts/rss.xml filtert Radius-Feeds über diese Listen.
+    """
+    filters = config.get('filters', {})
+    radii = {f['km'] for f in filters.get('radius_filters', []) if f.get('km')}
+    radii |= {float(f['radius']) for f in filters.get('rss_feeds', []) if f.get('radius')}
+    
+    center = config.get('city', {}).get('center') or config.get('default_center')
+    records = load_event_records()
+    
+    # Virtuelle wiederkehrende Termine: eine Position je Serie ("recurring:<id>")
+    if RECURRING_INSTANCES.exists():
+        with open(RECURRING_INSTANCES, 'r', encoding='utf-8') as f:
+            series = json.load(f).get('series', {})
+        records += [{**s, '_path': f"recurring:{series_id}"} for series_id, s in series.items()]
+    
+    index = build_event_index(records)
+    membership = radius_membership(index, (float(center['lat']), float(center['lng'])), radii)
+    
+    RADIUS_INDEX.parent.mkdir(exist_ok=True)
+    with open(RADIUS_INDEX, 'w', encoding='utf-8') as f:
+        json.dump({
+            'center': {'lat': center['lat'], 'lng': center['lng']},
+            'radii': membership
+        }, f, indent=2, ensure_ascii=False)
+    
+    print(f"📍 {RADIUS_INDEX} erstellt ({len(index)} Events mit Koordinaten, "
+          f"Radien: {', '.join(f'{r} km' for r in membership)})")
+
+
 def generate_rss_feeds():
     """Generiert RSS-Feed-Dateien aus _config.yml"""
     
@@ -20,6 +63,9 @@ def generate_rss_feeds():
         print("⚠️  Keine RSS-Feeds in _config.yml definiert")
         return
     
+    # Umkreis-Zuordnung für Radius-Feeds
+    generate_radius_index(config)
+    
     # Feeds erstellen
     for feed in rss_feeds:
         name = feed.get('name', 'Unnamed Feed')
@@ -27,6 +73,9 @@ def generate_rss_feeds():
         time_filter = feed.get('time', '')
         category_filter = feed.get('category', '')
         radius_filter = feed.get('radius', '')
+        if radius_filter:
+            # Gleiche Schreibweise wie die Schlüssel in event_radius.json ("10", "2.5")
+            radius_filter = f"{float(radius_filter):g}"
         
         # Pfad bestimmen
         if filename == 'feed.xml':
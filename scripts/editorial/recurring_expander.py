@@ -5,23 +5,41 @@ Generiert automatisch Instanzen für wiederkehrende Events
 """
 
 import json
+import sys
 import yaml
 import re
 import hashlib
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional, Set
+from typing import List, Dict, Optional, Set, Tuple
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from compiled_cache import CACHE_DIR
+from occurrence_cache import get_occurrence_cache
+from rrule import RRule, expand_batch, expand_scalar
 
 EVENTS_DIR = Path("_events")
 HISTORY_DIR = Path("_events/_history")
 INDEX_FILE = Path("_data/recurring_index.json")
 
-WEEKDAY_MAP = {
-    'MO': 0, 'TU': 1, 'WE': 2, 'TH': 3,
-    'FR': 4, 'SA': 5, 'SU': 6
-}
+# Scan-Manifest (templates/directories mit mtimes) für inkrementelle Scans;
+# lokal in .cache/, da git keine mtimes erhält
+MANIFEST_FILE = CACHE_DIR / "recurring_manifest.json"
+MANIFEST_VERSION = 1
+
+# Virtueller Modus: Termine als Daten-Datei statt einer Markdown-Datei pro Termin
+INSTANCES_FILE = Path("_data/recurring_instances.json")
+
+# Felder der Vorlage, die je Serie in recurring_instances.json landen
+SERIES_FIELDS = [
+    'title', 'location', 'address', 'start_time', 'end_time', 'category', 'tags',
+    'description', 'url', 'coordinates', 'status', 'source', 'template_file'
+]
 
+# Erlaubte Felder in recurring.overrides (cancelled: true → status "Abgesagt")
+OVERRIDE_FIELDS = ['start_time', 'end_time', 'location', 'address', 'description', 'status', 'cancelled']
 
 class RecurringExpander:
     """
@@ -33,20 +51,36 @@ class RecurringExpander:
     3. Generiert fehlende Instanzen für konfigurierten Zeitraum
     """
     
-    def __init__(self, lookahead_months: int = 3):
+    def __init__(self, lookahead_months: int = 3, batch: bool = True, virtual: bool = False,
+                 workers: int = 8):
         """
         Args:
             lookahead_months: Wie viele Monate im Voraus generieren (default: 3)
+            batch: Alle Serien in einem numpy-Durchlauf expandieren
+                   (False = skalare Referenz, ohne numpy automatisch)
+            virtual: Termine nach _data/recurring_instances.json schreiben statt
+                     eine Markdown-Datei pro Termin (nur overrides als Datei)
+            workers: Threads für die Schreibphase (1 = sequentiell)
         """
         self.lookahead_months = lookahead_months
+        self.batch = batch
+        self.virtual = virtual
+        self.workers = max(1, workers)
         self.recurring_events = {}
         self.existing_hashes = set()
+        self.existing_files = set()
+        self._slugs = {}
+        self.occurrences = get_occurrence_cache()
         self.generated_count = 0
+        self.directories = {}
+        self.templates = {}
         self.stats = {
             'scanned_files': 0,
+            'parsed_files': 0,
             'recurring_found': 0,
             'instances_generated': 0,
             'instances_skipped': 0,
+            'instances_virtual': 0,
             'errors': 0
         }
     
@@ -54,34 +88,48 @@ class RecurringExpander:
         """Lädt Event-YAML aus Datei"""
         try:
             with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-                
-                if content.startswith('---'):
-                    parts = content.split('---', 2)
-                    if len(parts) >= 3:
-                        event_data = yaml.safe_load(parts[1])
-                        event_data['_content'] = parts[2].strip()
-                        event_data['_filepath'] = str(filepath)
-                        event_data['_filename'] = filepath.name
-                        return event_data
+                return self.parse_event_content(f.read(), filepath)
         except Exception as e:
             print(f"⚠️  Fehler beim Laden von {filepath.name}: {e}")
             self.stats['errors'] += 1
         
         return None
     
+    @staticmethod
+    def parse_event_content(content: str, filepath: Path) -> Optional[Dict]:
+        """Parst Front Matter + Inhalt einer Event-Datei"""
+        if content.startswith('---'):
+            parts = content.split('---', 2)
+            if len(parts) >= 3:
+                event_data = yaml.safe_load(parts[1])
+                if not isinstance(event_data, dict):
+                    return None
+                event_data['_content'] = parts[2].strip()
+                event_data['_filepath'] = str(filepath)
+                event_data['_filename'] = filepath.name
+                return event_data
+        return None
+    
     def generate_event_hash(self, title: str, date: str, time: str, location: str) -> str:
         """Generiert Hash für Event (zur Duplikat-Erkennung)"""
         hash_string = f"{title}{date}{time}{location}".lower()
         return hashlib.md5(hash_string.encode()).hexdigest()[:12]
     
     def load_existing_hashes(self):
-        """Lädt Hashes aller existierenden Events"""
+        """
+        Lädt Hashes aller existierenden Events
+        
+        Die Dateinamen in _events/ werden dabei als Snapshot gemerkt
+        (existing_files) - die Planung prüft Zieldateien gegen diesen
+        Snapshot statt mit einem stat() pro Termin.
+        """
         self.existing_hashes = set()
+        self.existing_files = set()
         
         # _events/ durchsuchen
         if EVENTS_DIR.exists():
             for filepath in EVENTS_DIR.glob("*.md"):
+                self.existing_files.add(filepath.name)
                 event = self.load_event_file(filepath)
                 if event:
                     event_hash = event.get('event_hash')
@@ -97,201 +145,272 @@ class RecurringExpander:
                         )
                         self.existing_hashes.add(event_hash)
     
-    def scan_for_recurring_events(self):
+    def _scan_dirs(self, previous_dirs: Dict) -> List[Tuple[str, Path]]:
+        """
+        Zu scannende Verzeichnisse in Prioritäts-Reihenfolge
+        
+        Reihenfolge: _events/ → _history/YYYYMM/ (neueste zuerst)
+        """
+        scan_paths = [("_events", EVENTS_DIR)]
+        
+        if HISTORY_DIR.exists():
+            # Unterordner nur neu auflisten, wenn sich _history/ geändert hat
+            history_mtime = HISTORY_DIR.stat().st_mtime_ns
+            cached = previous_dirs.get(str(HISTORY_DIR))
+            if cached and cached.get('mtime_ns') == history_mtime:
+                archive_names = cached['subdirs']
+            else:
+                archive_names = sorted((d.name for d in HISTORY_DIR.iterdir() if d.is_dir()), reverse=True)
+            self.directories[str(HISTORY_DIR)] = {'mtime_ns': history_mtime, 'subdirs': archive_names}
+            
+            for name in archive_names:
+                scan_paths.append((f"_history/{name}", HISTORY_DIR / name))
+        
+        return scan_paths
+    
+    def _template_entry(self, event: Dict, filepath: Path, location_name: str) -> Optional[Dict]:
+        """Index-Eintrag für ein Event mit aktivem recurring-Flag (sonst None)"""
+        recurring_config = event.get('recurring')
+        if not (isinstance(recurring_config, dict) and recurring_config.get('enabled')):
+            return None
+        
+        event_id = event.get('event_hash') or self.generate_event_hash(
+            event.get('title', ''),
+            str(event.get('date', '')),
+            event.get('start_time', ''),
+            event.get('location', '')
+        )
+        return {
+            'id': event_id,
+            'title': event.get('title'),
+            'location': event.get('location'),
+            'start_time': event.get('start_time'),
+            'end_time': event.get('end_time', ''),
+            'category': event.get('category'),
+            'tags': event.get('tags', []),
+            'description': event.get('description', ''),
+            'url': event.get('url', ''),
+            'coordinates': event.get('coordinates', {}),
+            'address': event.get('address', ''),
+            'status': event.get('status', 'Öffentlich'),
+            'source': event.get('source', ''),
+            'recurring': recurring_config,
+            'template_file': str(filepath),
+            'found_in': location_name
+        }
+    
+    def scan_for_recurring_events(self, previous: Optional[Dict] = None):
         """
         Scannt alle Event-Dateien nach recurring-Flag
         Reihenfolge: _events/ → _history/YYYYMM/ (aktuelles Jahr) → _history/YYYYMM/ (Folgejahre)
+        
+        Mit previous (Scan-Manifest aus .cache/) wird inkrementell gescannt:
+        Verzeichnisse mit unveränderter mtime werden nicht neu aufgelistet,
+        Dateien mit unveränderter mtime/Größe (oder gleichem Inhalts-Hash)
+        nicht neu geparst.
         """
         print("🔍 Scanne nach wiederkehrenden Events...")
         
-        scan_paths = []
+        previous = previous or {}
+        previous_dirs = previous.get('directories', {})
+        previous_templates = previous.get('templates', {})
+        self.directories = {}
+        self.templates = {}
         
-        # 1. Aktueller Events-Ordner
-        scan_paths.append(("_events", EVENTS_DIR))
-        
-        # 2. Archive (monatlich sortiert, neueste zuerst)
-        if HISTORY_DIR.exists():
-            archive_dirs = sorted(HISTORY_DIR.glob("*/"), reverse=True)
-            for archive_dir in archive_dirs:
-                scan_paths.append((f"_history/{archive_dir.name}", archive_dir))
-        
-        # Scannen
-        for location_name, scan_path in scan_paths:
+        for location_name, scan_path in self._scan_dirs(previous_dirs):
             if not scan_path.exists():
                 continue
             
-            for filepath in scan_path.glob("*.md"):
+            dir_mtime = scan_path.stat().st_mtime_ns
+            cached_dir = previous_dirs.get(str(scan_path))
+            if cached_dir and cached_dir.get('mtime_ns') == dir_mtime:
+                names = cached_dir['files']
+            else:
+                names = sorted(p.name for p in scan_path.glob("*.md"))
+            self.directories[str(scan_path)] = {'mtime_ns': dir_mtime, 'files': names}
+            
+            for name in names:
+                filepath = scan_path / name
+                try:
+                    stat = filepath.stat()
+                except FileNotFoundError:
+                    continue
                 self.stats['scanned_files'] += 1
-                event = self.load_event_file(filepath)
                 
-                if not event:
+                key = str(filepath)
+                record = previous_templates.get(key)
+                if record and record['mtime_ns'] == stat.st_mtime_ns and record['size'] == stat.st_size:
+                    self.templates[key] = record
+                    continue
+                
+                try:
+                    raw = filepath.read_bytes()
+                except OSError as e:
+                    print(f"⚠️  Fehler beim Laden von {name}: {e}")
+                    self.stats['errors'] += 1
+                    continue
+                content_hash = hashlib.sha256(raw).hexdigest()[:16]
+                
+                if record and record['hash'] == content_hash:
+                    # Nur mtime geändert (z.B. frischer Checkout)
+                    self.templates[key] = {**record, 'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size}
                     continue
                 
-                # Prüfe auf recurring-Flag
-                recurring_config = event.get('recurring')
-                if recurring_config and recurring_config.get('enabled'):
-                    event_id = event.get('event_hash') or self.generate_event_hash(
-                        event.get('title', ''),
-                        str(event.get('date', '')),
-                        event.get('start_time', ''),
-                        event.get('location', '')
-                    )
-                    
-                    # Nur hinzufügen, wenn noch nicht im Index
-                    if event_id not in self.recurring_events:
-                        self.recurring_events[event_id] = {
-                            'id': event_id,
-                            'title': event.get('title'),
-                            'location': event.get('location'),
-                            'start_time': event.get('start_time'),
-                            'end_time': event.get('end_time', ''),
-                            'category': event.get('category'),
-                            'tags': event.get('tags', []),
-                            'description': event.get('description', ''),
-                            'url': event.get('url', ''),
-                            'coordinates': event.get('coordinates', {}),
-                            'address': event.get('address', ''),
-                            'status': event.get('status', 'Öffentlich'),
-                            'source': event.get('source', ''),
-                            'recurring': recurring_config,
-                            'template_file': str(filepath),
-                            'found_in': location_name
-                        }
-                        self.stats['recurring_found'] += 1
-                        print(f"  ✓ {event.get('title')} ({location_name})")
-        
-        print(f"\n📊 {self.stats['recurring_found']} wiederkehrende Events gefunden")
-    
-    def calculate_next_occurrences(self, recurring_event: Dict) -> List[datetime]:
+                self.stats['parsed_files'] += 1
+                try:
+                    event = self.parse_event_content(raw.decode('utf-8'), filepath)
+                except Exception as e:
+                    print(f"⚠️  Fehler beim Laden von {name}: {e}")
+                    self.stats['errors'] += 1
+                    event = None
+                
+                entry = self._template_entry(event, filepath, location_name) if event else None
+                self.templates[key] = {
+                    'mtime_ns': stat.st_mtime_ns,
+                    'size': stat.st_size,
+                    'hash': content_hash,
+                    'event': entry
+                }
+                if entry:
+                    print(f"  ✓ {entry['title']} ({location_name})")
+        
+        # Index ableiten: erste Vorlage je ID gewinnt (Scan-Reihenfolge)
+        self.recurring_events = {}
+        for record in self.templates.values():
+            entry = record.get('event')
+            if entry and entry['id'] not in self.recurring_events:
+                self.recurring_events[entry['id']] = entry
+        self.stats['recurring_found'] = len(self.recurring_events)
+        
+        removed = len(set(previous_templates) - set(self.templates))
+        print(f"\n📊 {self.stats['recurring_found']} wiederkehrende Events gefunden "
+              f"({self.stats['parsed_files']} von {self.stats['scanned_files']} Dateien neu geparst"
+              f"{f', {removed} entfernt' if removed else ''})")
+    
+    def _build_rule(self, recurring_event: Dict) -> Optional[RRule]:
+        """RRULE eines Recurring-Events (None bei ungültiger Konfiguration)"""
+        try:
+            # Ohne start_date gilt die Regel ab heute
+            return RRule.from_config(recurring_event['recurring'], default_start=datetime.now().date())
+        except ValueError as e:
+            print(f"  ⚠️  Ungültige Regel ({recurring_event.get('title')}): {e}")
+            self.stats['errors'] += 1
+            return None
+    
+    def _window(self):
+        """Expansions-Fenster: heute … heute + lookahead"""
+        today = datetime.now().date()
+        return today, today + timedelta(days=self.lookahead_months * 30)
+    
+    def calculate_next_occurrences(self, recurring_event: Dict) -> List[date]:
         """
         Berechnet nächste Vorkommnisse eines wiederkehrenden Events
         
+        Nutzt die gemeinsame RRULE-Engine (lib/rrule.py) und fragt nur das
+        Fenster heute … heute + lookahead ab.
+        
         Returns:
-            List[datetime]: Datumsangaben für nächste Instanzen
+            List[date]: Datumsangaben für nächste Instanzen
         """
-        recurring_config = recurring_event['recurring']
-        frequency = recurring_config.get('frequency', 'weekly')
-        interval = recurring_config.get('interval', 1)
-        by_day = recurring_config.get('by_day', [])
-        
-        start_date_str = recurring_config.get('start_date')
-        end_date_str = recurring_config.get('end_date')
-        exceptions = recurring_config.get('exceptions', [])
-        
-        # Start-Datum ermitteln
-        if start_date_str:
-            try:
-                start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date()
-            except ValueError:
-                start_date = datetime.now().date()
-        else:
-            start_date = datetime.now().date()
-        
-        # End-Datum ermitteln
-        if end_date_str:
-            try:
-                end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date()
-            except ValueError:
-                end_date = None
-        else:
-            end_date = None
-        
-        # Lookahead-Datum berechnen
-        lookahead_date = datetime.now().date() + timedelta(days=self.lookahead_months * 30)
-        if end_date and end_date < lookahead_date:
-            lookahead_date = end_date
-        
-        occurrences = []
-        current_date = max(start_date, datetime.now().date())
-        
-        # Generiere Instanzen basierend auf Frequenz
-        if frequency == 'daily':
-            while current_date <= lookahead_date:
-                if str(current_date) not in exceptions:
-                    occurrences.append(current_date)
-                current_date += timedelta(days=interval)
-        
-        elif frequency == 'weekly':
-            # Wöchentlich mit spezifischen Wochentagen
-            if by_day:
-                target_weekdays = [WEEKDAY_MAP[day] for day in by_day if day in WEEKDAY_MAP]
-                
-                while current_date <= lookahead_date:
-                    if current_date.weekday() in target_weekdays:
-                        if str(current_date) not in exceptions:
-                            occurrences.append(current_date)
-                    current_date += timedelta(days=1)
-            else:
-                # Wöchentlich ohne spezifische Tage
-                while current_date <= lookahead_date:
-                    if str(current_date) not in exceptions:
-                        occurrences.append(current_date)
-                    current_date += timedelta(weeks=interval)
-        
-        elif frequency == 'biweekly':
-            while current_date <= lookahead_date:
-                if str(current_date) not in exceptions:
-                    occurrences.append(current_date)
-                current_date += timedelta(weeks=2 * interval)
-        
-        elif frequency == 'monthly':
-            # Monatlich (gleicher Tag im Monat)
-            while current_date <= lookahead_date:
-                if str(current_date) not in exceptions:
-                    occurrences.append(current_date)
-                # Nächster Monat
-                month = current_date.month + interval
-                year = current_date.year
-                while month > 12:
-                    month -= 12
-                    year += 1
-                try:
-                    current_date = current_date.replace(year=year, month=month)
-                except ValueError:
-                    # Tag existiert nicht im Zielmonat (z.B. 31. Februar)
-                    break
-        
-        elif frequency == 'yearly':
-            while current_date <= lookahead_date:
-                if str(current_date) not in exceptions:
-                    occurrences.append(current_date)
-                current_date = current_date.replace(year=current_date.year + interval)
-        
-        return occurrences
+        try:
+            return self.occurrences.occurrences(
+                recurring_event['recurring'], *self._window(), default_start=datetime.now().date()
+            )
+        except ValueError as e:
+            print(f"  ⚠️  Ungültige Regel ({recurring_event.get('title')}): {e}")
+            self.stats['errors'] += 1
+            return []
     
-    def create_event_instance(self, template_event: Dict, occurrence_date: datetime) -> bool:
+    def calculate_occurrence_table(self) -> List[Tuple[str, date]]:
         """
-        Erstellt eine neue Event-Instanz basierend auf Template
+        Termine aller Recurring-Events im Fenster als eine flache Tabelle
+        
+        Serien, deren Termine für dieses Fenster schon im Occurrence-Cache
+        liegen, werden nicht neu expandiert. Den Rest expandiert batch=True
+        in einem numpy-Durchlauf (expand_batch), sonst jede Regel einzeln
+        (expand_scalar, Referenz); die Ergebnisse gehen in den Cache.
         
         Returns:
-            bool: True wenn erfolgreich erstellt
+            [(event_id, date), ...] nach Event, dann Datum
         """
-        # Dateiname generieren
+        window = self._window()
+        today = datetime.now().date()
+        dates_by_event = {}
+        rules = {}
+        for event_id, recurring_event in self.recurring_events.items():
+            cached = self.occurrences.cached(recurring_event['recurring'], *window, default_start=today)
+            if cached is not None:
+                dates_by_event[event_id] = cached
+                continue
+            rule = self._build_rule(recurring_event)
+            if rule:
+                rules[event_id] = rule
+        
+        if rules:
+            expand = expand_batch if self.batch else expand_scalar
+            expanded = defaultdict(list)
+            for event_id, occurrence_date in expand(rules, *window):
+                expanded[event_id].append(occurrence_date)
+            for event_id in rules:
+                dates_by_event[event_id] = expanded[event_id]
+                self.occurrences.store(self.recurring_events[event_id]['recurring'], *window,
+                                       expanded[event_id], default_start=today)
+        
+        return [(event_id, occurrence_date)
+                for event_id in self.recurring_events
+                for occurrence_date in dates_by_event.get(event_id, [])]
+    
+    def title_slug(self, title: str) -> str:
+        """Slug für Dateinamen (einmal pro Titel berechnet)"""
+        slug = self._slugs.get(title)
+        if slug is None:
+            slug = re.sub(r'[^\w\s-]', '', title.lower())
+            slug = re.sub(r'[-\s]+', '-', slug)[:50]
+            self._slugs[title] = slug
+        return slug
+    
+    def instance_target(self, template_event: Dict, occurrence_date: date) -> Tuple[Path, str]:
+        """Zieldatei und Event-Hash einer Instanz"""
         date_str = occurrence_date.strftime("%Y-%m-%d")
-        title_slug = re.sub(r'[^\w\s-]', '', template_event['title'].lower())
-        title_slug = re.sub(r'[-\s]+', '-', title_slug)[:50]
-        filename = f"{date_str}-{title_slug}.md"
-        filepath = EVENTS_DIR / filename
-        
-        # Prüfe ob Datei bereits existiert
-        if filepath.exists():
-            self.stats['instances_skipped'] += 1
-            return False
-        
-        # Hash für neue Instanz generieren
+        filepath = EVENTS_DIR / f"{date_str}-{self.title_slug(template_event['title'])}.md"
         event_hash = self.generate_event_hash(
             template_event['title'],
             date_str,
             template_event['start_time'],
             template_event['location']
         )
+        return filepath, event_hash
+    
+    def instance_exists(self, template_event: Dict, occurrence_date: date) -> bool:
+        """True, wenn die Instanz bereits als Datei existiert (Name oder Hash)"""
+        filepath, event_hash = self.instance_target(template_event, occurrence_date)
+        return filepath.name in self.existing_files or event_hash in self.existing_hashes
+    
+    @staticmethod
+    def get_overrides(template_event: Dict) -> Dict[str, Dict]:
+        """
+        Abweichungen einzelner Termine aus recurring.overrides
         
-        # Prüfe auf Duplikat via Hash
-        if event_hash in self.existing_hashes:
-            self.stats['instances_skipped'] += 1
-            return False
+        Beispiel:
+            overrides:
+              "2026-01-07": {start_time: "20:00"}
+              "2026-02-04": {cancelled: true}
         
-        # Event-Daten vorbereiten
+        Returns:
+            {"YYYY-MM-DD": {feld: wert}} (nur OVERRIDE_FIELDS)
+        """
+        overrides = {}
+        for day, values in (template_event['recurring'].get('overrides') or {}).items():
+            if not isinstance(values, dict):
+                continue
+            values = {k: v for k, v in values.items() if k in OVERRIDE_FIELDS}
+            if values:
+                overrides[str(day)] = values
+        return overrides
+    
+    def render_instance(self, template_event: Dict, date_str: str, event_hash: str,
+                        overrides: Optional[Dict] = None) -> str:
+        """Markdown-Inhalt (Front Matter + Text) einer Instanz"""
         event_data = {
             'title': template_event['title'],
             'date': date_str,
@@ -311,11 +430,16 @@ class RecurringExpander:
             'recurring_parent': template_event['id']
         }
         
+        # Abweichungen dieses Termins (z.B. andere Uhrzeit, Absage)
+        overrides = dict(overrides or {})
+        if overrides.pop('cancelled', False):
+            event_data['status'] = 'Abgesagt'
+        event_data.update(overrides)
+        
         # YAML Front Matter
         front_matter = yaml.dump(event_data, allow_unicode=True, sort_keys=False)
         
-        # Markdown-Inhalt
-        content = f"""---
+        return f"""---
 {front_matter}---
 
 {template_event.get('description', '')}
@@ -323,6 +447,33 @@ class RecurringExpander:
 ---
 *Diese Instanz wurde automatisch aus einem wiederkehrenden Event generiert.*
 """
+    
+    def create_event_instance(self, template_event: Dict, occurrence_date: datetime,
+                              overrides: Optional[Dict] = None) -> bool:
+        """
+        Erstellt eine neue Event-Instanz basierend auf Template
+        
+        Args:
+            overrides: Abweichende Felder für diesen Termin (siehe get_overrides)
+        
+        Returns:
+            bool: True wenn erfolgreich erstellt
+        """
+        date_str = occurrence_date.strftime("%Y-%m-%d")
+        filepath, event_hash = self.instance_target(template_event, occurrence_date)
+        filename = filepath.name
+        
+        # Prüfe ob Datei bereits existiert
+        if filename in self.existing_files or filepath.exists():
+            self.stats['instances_skipped'] += 1
+            return False
+        
+        # Prüfe auf Duplikat via Hash
+        if event_hash in self.existing_hashes:
+            self.stats['instances_skipped'] += 1
+            return False
+        
+        content = self.render_instance(template_event, date_str, event_hash, overrides)
         
         # Datei schreiben
         try:
@@ -330,6 +481,7 @@ class RecurringExpander:
                 f.write(content)
             
             self.existing_hashes.add(event_hash)
+            self.existing_files.add(filename)
             self.stats['instances_generated'] += 1
             print(f"  ✅ {filename}")
             return True
@@ -338,6 +490,104 @@ class RecurringExpander:
             self.stats['errors'] += 1
             return False
     
+    def plan_instances(self) -> List[Dict]:
+        """
+        Planungsphase: Zieldatei und Hash jedes Termins im Speicher
+        
+        Geprüft wird gegen den Verzeichnis-Snapshot (existing_files) und den
+        Hash-Index (existing_hashes) aus load_existing_hashes() - ohne
+        Dateisystemzugriff pro Termin. Innerhalb des Plans belegte Namen und
+        Hashes zählen ebenfalls als vorhanden.
+        
+        Returns:
+            [{'event_id', 'date', 'filepath', 'event_hash', 'overrides', 'action'}, ...]
+            action: 'create', 'exists' (Dateiname) oder 'duplicate' (Hash)
+        """
+        taken_files = set(self.existing_files)
+        taken_hashes = set(self.existing_hashes)
+        overrides_by_event = {}
+        plan = []
+        
+        for event_id, occurrence_date in self.calculate_occurrence_table():
+            template = self.recurring_events[event_id]
+            if event_id not in overrides_by_event:
+                overrides_by_event[event_id] = self.get_overrides(template)
+            filepath, event_hash = self.instance_target(template, occurrence_date)
+            
+            if filepath.name in taken_files:
+                action = 'exists'
+            elif event_hash in taken_hashes:
+                action = 'duplicate'
+            else:
+                action = 'create'
+                taken_files.add(filepath.name)
+                taken_hashes.add(event_hash)
+            
+            plan.append({
+                'event_id': event_id,
+                'date': occurrence_date.isoformat(),
+                'filepath': filepath,
+                'event_hash': event_hash,
+                'overrides': overrides_by_event[event_id].get(occurrence_date.isoformat()),
+                'action': action
+            })
+        return plan
+    
+    def _write_planned(self, entry: Dict) -> Optional[str]:
+        """Rendert und schreibt eine geplante Instanz (Thread-Worker), gibt Fehler zurück"""
+        content = self.render_instance(
+            self.recurring_events[entry['event_id']], entry['date'],
+            entry['event_hash'], entry['overrides']
+        )
+        try:
+            # 'x': nicht überschreiben, falls die Datei seit dem Snapshot entstanden ist
+            with open(entry['filepath'], 'x', encoding='utf-8') as f:
+                f.write(content)
+            return None
+        except FileExistsError:
+            return 'exists'
+        except Exception as e:
+            return str(e)
+    
+    def write_plan(self, plan: List[Dict]):
+        """Schreibphase: neue Instanzen parallel im Thread-Pool schreiben"""
+        pending = [entry for entry in plan if entry['action'] == 'create']
+        self.stats['instances_skipped'] += len(plan) - len(pending)
+        if not pending:
+            return
+        
+        if self.workers > 1 and len(pending) > 1:
+            with ThreadPoolExecutor(max_workers=self.workers) as pool:
+                results = list(pool.map(self._write_planned, pending))
+        else:
+            results = [self._write_planned(entry) for entry in pending]
+        
+        for entry, error in zip(pending, results):
+            filename = entry['filepath'].name
+            if error is None:
+                self.existing_files.add(filename)
+                self.existing_hashes.add(entry['event_hash'])
+                self.stats['instances_generated'] += 1
+                print(f"  ✅ {filename}")
+            elif error == 'exists':
+                self.stats['instances_skipped'] += 1
+            else:
+                print(f"  ❌ Fehler bei {filename}: {error}")
+                self.stats['errors'] += 1
+    
+    def print_plan(self, plan: List[Dict]):
+        """--plan: zeigt, welche Instanzen angelegt würden (ohne zu schreiben)"""
+        by_action = defaultdict(int)
+        for entry in plan:
+            by_action[entry['action']] += 1
+        
+        print(f"\n📋 Plan: {by_action['create']} neu, {by_action['exists']} vorhanden (Dateiname), "
+              f"{by_action['duplicate']} vorhanden (Hash)")
+        for entry in plan:
+            if entry['action'] == 'create':
+                marker = " (overrides)" if entry['overrides'] else ""
+                print(f"  + {entry['filepath']}{marker}")
+    
     def expand_recurring_events(self):
         """Generiert fehlende Instanzen für alle wiederkehrenden Events"""
         if not self.recurring_events:
@@ -348,29 +598,121 @@ class RecurringExpander:
         print(f"   Zeitraum: {self.lookahead_months} Monate im Voraus")
         print("-" * 60)
         
+        # Phase 1: Plan (Dateinamen + Hashes im Speicher)
+        plan = self.plan_instances()
+        
+        entries_by_event = defaultdict(list)
+        for entry in plan:
+            entries_by_event[entry['event_id']].append(entry)
+        
         for event_id, recurring_event in self.recurring_events.items():
-            print(f"\n📅 {recurring_event['title']}")
-            
-            # Berechne nächste Vorkommnisse
-            occurrences = self.calculate_next_occurrences(recurring_event)
-            
+            entries = entries_by_event.get(event_id)
+            if not entries:
+                print(f"📅 {recurring_event['title']}: keine Termine im Zeitraum")
+                continue
+            new = sum(1 for entry in entries if entry['action'] == 'create')
+            print(f"📅 {recurring_event['title']}: {len(entries)} Termine berechnet, {new} neu")
+        
+        # Phase 2: neue Dateien parallel schreiben
+        print()
+        self.write_plan(plan)
+    
+    def write_virtual_instances(self):
+        """
+        Virtueller Modus: Termine als _data/recurring_instances.json statt Dateien
+        
+        Jede Serie steht einmal unter "series" (Felder der Vorlage + page_url,
+        siehe series_page_url),
+        jeder Termin als {"series", "date"} unter "instances". Als Markdown-Datei
+        materialisiert werden nur Termine mit overrides (andere Uhrzeit, Absage,
+        ...); sie und bereits existierende Instanz-Dateien tragen
+        "materialized": true und werden von den Templates über site.events
+        gerendert.
+        """
+        if not self.recurring_events:
+            print("\nℹ️  Keine wiederkehrenden Events gefunden")
+            return
+        
+        window_start, window_end = self._window()
+        print(f"\n🔄 Schreibe virtuelle Instanzen für {len(self.recurring_events)} wiederkehrende Events...")
+        print(f"   Zeitraum: {window_start} bis {window_end}")
+        
+        occurrences_by_event = defaultdict(list)
+        for event_id, occurrence_date in self.calculate_occurrence_table():
+            occurrences_by_event[event_id].append(occurrence_date)
+        
+        series = {}
+        instances = []
+        for event_id, template in self.recurring_events.items():
+            occurrences = occurrences_by_event.get(event_id)
             if not occurrences:
-                print(f"  ℹ️  Keine neuen Instanzen zu generieren")
                 continue
             
-            print(f"  → {len(occurrences)} Termine berechnet")
+            series[event_id] = {field: template.get(field) for field in SERIES_FIELDS}
+            overrides = self.get_overrides(template)
+            materialized = []
             
-            # Erstelle Instanzen
             for occurrence_date in occurrences:
-                self.create_event_instance(recurring_event, occurrence_date)
+                date_str = occurrence_date.isoformat()
+                instance = {'series': event_id, 'date': date_str}
+                override = overrides.get(date_str)
+                if override:
+                    instance['overrides'] = override
+                    self.create_event_instance(template, occurrence_date, override)
+                    instance['materialized'] = True
+                elif self.instance_exists(template, occurrence_date):
+                    instance['materialized'] = True
+                else:
+                    self.stats['instances_virtual'] += 1
+                if instance.get('materialized'):
+                    materialized.append(occurrence_date)
+                instances.append(instance)
+            
+            series[event_id]['page_url'] = self.series_page_url(template, materialized)
+        
+        instances.sort(key=lambda i: (i['date'], i['series']))
+        INSTANCES_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(INSTANCES_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'generated_at': datetime.now().isoformat(),
+                'window': {'start': window_start.isoformat(), 'end': window_end.isoformat()},
+                'series': series,
+                'instances': instances
+            }, f, ensure_ascii=False, separators=(',', ':'))
+        
+        print(f"💾 {INSTANCES_FILE}: {self.stats['instances_virtual']} virtuelle Termine "
+              f"({len(instances) - self.stats['instances_virtual']} als Datei)")
+    
+    def series_page_url(self, template: Dict, materialized: List[date]) -> Optional[str]:
+        """
+        Detailseite einer Serie für virtuelle Termine
+        
+        Nur Templates in _events/ haben eine eigene Seite; archivierte
+        Templates (_events/_history/) werden nicht veröffentlicht. Dann
+        verlinkt die Serie den ersten materialisierten Termin mit eigener
+        Datei, sonst gar nichts (None).
+        """
+        if template.get('found_in') == "_events":
+            return f"/events/{Path(template['template_file']).stem}/"
+        for occurrence_date in materialized:
+            filepath, _event_hash = self.instance_target(template, occurrence_date)
+            if filepath.exists():
+                return f"/events/{filepath.stem}/"
+        return None
     
     def save_index(self):
-        """Speichert Recurring-Events-Index"""
-        INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+        """
+        Speichert den Recurring-Events-Index und das Scan-Manifest
         
+        _data/recurring_index.json (committet, von admin.html gelesen) enthält
+        nur recurring_events/stats und wird nur bei inhaltlichen Änderungen
+        neu geschrieben. Das Manifest (templates/directories: je Datei mtime,
+        Größe und Inhalts-Hash, je Verzeichnis mtime und Dateiliste) liegt
+        in .cache/recurring_manifest.json.
+        """
+        # Feste Reihenfolge (nach ID), damit gleiche Daten eine gleiche Datei ergeben
         index_data = {
-            'last_update': datetime.now().isoformat(),
-            'recurring_events': list(self.recurring_events.values()),
+            'recurring_events': [self.recurring_events[key] for key in sorted(self.recurring_events)],
             'stats': {
                 'total_recurring': len(self.recurring_events),
                 'last_scan_files': self.stats['scanned_files']
@@ -378,41 +720,99 @@ class RecurringExpander:
         }
         
         try:
-            with open(INDEX_FILE, 'w', encoding='utf-8') as f:
-                json.dump(index_data, f, indent=2, ensure_ascii=False)
-            print(f"\n💾 Index gespeichert: {INDEX_FILE}")
+            existing = {}
+            if INDEX_FILE.exists():
+                with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                    existing = json.load(f)
+            if {key: existing.get(key) for key in index_data} != index_data:
+                INDEX_FILE.parent.mkdir(parents=True, exist_ok=True)
+                with open(INDEX_FILE, 'w', encoding='utf-8') as f:
+                    json.dump({'last_update': datetime.now().isoformat(), **index_data},
+                              f, indent=2, ensure_ascii=False)
+                print(f"\n💾 Index gespeichert: {INDEX_FILE}")
         except Exception as e:
             print(f"⚠️  Fehler beim Speichern des Index: {e}")
+        
+        manifest = {
+            'version': MANIFEST_VERSION,
+            'directories': self.directories,
+            'templates': {
+                path: self._manifest_record(record) for path, record in self.templates.items()
+            }
+        }
+        try:
+            MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = MANIFEST_FILE.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, ensure_ascii=False, separators=(',', ':'))
+            tmp_file.replace(MANIFEST_FILE)
+        except OSError as e:
+            print(f"⚠️  Scan-Manifest konnte nicht geschrieben werden: {e}")
     
-    def load_index(self) -> bool:
+    def load_index(self) -> Optional[Dict]:
         """
-        Lädt Recurring-Events-Index (falls vorhanden)
+        Lädt Scan-Manifest (.cache/) und Recurring-Events-Index (_data/)
         
         Returns:
-            bool: True wenn Index erfolgreich geladen
+            {'directories': ..., 'templates': ...} für scan_for_recurring_events
+            oder None (kein/alter/defekter Cache → vollständiger Scan)
         """
-        if not INDEX_FILE.exists():
-            return False
+        if not MANIFEST_FILE.exists():
+            return None
         
         try:
-            with open(INDEX_FILE, 'r', encoding='utf-8') as f:
-                index_data = json.load(f)
-            
-            for event in index_data.get('recurring_events', []):
-                self.recurring_events[event['id']] = event
-            
-            print(f"📋 Index geladen: {len(self.recurring_events)} wiederkehrende Events")
-            return True
+            with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+            index_data = {}
+            if INDEX_FILE.exists():
+                with open(INDEX_FILE, 'r', encoding='utf-8') as f:
+                    index_data = json.load(f)
         except Exception as e:
             print(f"⚠️  Fehler beim Laden des Index: {e}")
-            return False
+            return None
+        
+        if manifest.get('version') != MANIFEST_VERSION:
+            print("ℹ️  Scan-Manifest veraltet - vollständiger Scan")
+            return None
+        
+        # Einträge wieder den Vorlagen zuordnen
+        events_by_file = {e['template_file']: e for e in index_data.get('recurring_events', [])}
+        templates = {}
+        for path, record in manifest.get('templates', {}).items():
+            if record.get('recurring') and path not in events_by_file:
+                continue  # Vorlage fehlt im Index (doppelte ID, archiviert) → neu parsen
+            templates[path] = {**record, 'event': events_by_file.get(path)}
+        
+        print(f"📋 Index geladen: {len(events_by_file)} wiederkehrende Events, "
+              f"{len(templates)} Dateien im Manifest")
+        return {'directories': manifest.get('directories', {}), 'templates': templates}
     
-    def run(self, use_index: bool = True):
+    @staticmethod
+    def _manifest_record(record: Dict) -> Dict:
+        """Manifest-Eintrag ohne Event-Daten (die stehen in recurring_events)"""
+        return {
+            'mtime_ns': record['mtime_ns'],
+            'size': record['size'],
+            'hash': record['hash'],
+            'recurring': bool(record.get('event'))
+        }
+    
+    def _index_changed(self, previous: Dict) -> bool:
+        """True, wenn der Scan etwas am Index/Manifest geändert hat"""
+        if self.stats['parsed_files'] or previous['directories'] != self.directories:
+            return True
+        if previous['templates'].keys() != self.templates.keys():
+            return True
+        return any(self._manifest_record(previous['templates'][path]) != self._manifest_record(record)
+                   for path, record in self.templates.items())
+    
+    def run(self, use_index: bool = True, plan_only: bool = False):
         """
         Hauptfunktion: Expandiert wiederkehrende Events
         
         Args:
             use_index: Wenn True, versuche Index zu laden (schneller)
+            plan_only: Nur den Plan ausgeben, nichts schreiben (auch keinen Index)
         """
         print("\n" + "="*60)
         print("🔄 RECURRING EVENTS EXPANDER")
@@ -423,26 +823,38 @@ class RecurringExpander:
         self.load_existing_hashes()
         print(f"   {len(self.existing_hashes)} Events gefunden")
         
-        # Versuche Index zu laden (optional)
-        if use_index and self.load_index():
-            print("   ✓ Index verwendet (schneller)")
-        else:
-            # Vollständiger Scan
-            self.scan_for_recurring_events()
-            # Index speichern für nächstes Mal
+        # Scan-Manifest nutzen: nur neue/geänderte Dateien parsen
+        previous = self.load_index() if use_index else None
+        self.scan_for_recurring_events(previous)
+        if previous:
+            print("   ✓ Index verwendet (inkrementeller Scan)")
+        
+        if plan_only:
+            self.print_plan(self.plan_instances())
+            return
+        
+        # Index speichern für nächstes Mal (nur bei Änderungen)
+        if not previous or self._index_changed(previous):
             self.save_index()
         
         # Generiere fehlende Instanzen
-        self.expand_recurring_events()
+        if self.virtual:
+            self.write_virtual_instances()
+        else:
+            self.expand_recurring_events()
+        
+        self.occurrences.save()
         
         # Statistik
         print("\n" + "="*60)
         print("✅ RECURRING EXPANSION ABGESCHLOSSEN")
         print("="*60)
-        print(f"Gescannte Dateien: {self.stats['scanned_files']}")
+        print(f"Gescannte Dateien: {self.stats['scanned_files']} ({self.stats['parsed_files']} geparst)")
         print(f"Wiederkehrende Events: {self.stats['recurring_found']}")
         print(f"Instanzen generiert: {self.stats['instances_generated']}")
         print(f"Instanzen übersprungen: {self.stats['instances_skipped']}")
+        if self.virtual:
+            print(f"Virtuelle Instanzen: {self.stats['instances_virtual']}")
         print(f"Fehler: {self.stats['errors']}")
 
 
@@ -462,7 +874,28 @@ def main():
     parser.add_argument(
         '--no-index',
         action='store_true',
-        help='Ignoriere Index, führe vollständigen Scan durch'
+        help='Ignoriere Index-Manifest, parse alle Dateien neu'
+    )
+    parser.add_argument(
+        '--scalar',
+        action='store_true',
+        help='Serien einzeln expandieren (Referenz statt numpy-Batch)'
+    )
+    parser.add_argument(
+        '--virtual',
+        action='store_true',
+        help='Termine nach _data/recurring_instances.json schreiben statt als Dateien'
+    )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Nur anzeigen, welche Instanzen angelegt würden'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        default=8,
+        help='Threads zum Schreiben der Instanzen (default: 8)'
     )
     parser.add_argument(
         '--rebuild-index',
@@ -472,7 +905,10 @@ def main():
     
     args = parser.parse_args()
     
-    expander = RecurringExpander(lookahead_months=args.months)
+    expander = RecurringExpander(
+        lookahead_months=args.months, batch=not args.scalar, virtual=args.virtual,
+        workers=args.workers
+    )
     
     if args.rebuild_index:
         print("\n🔨 Baue Index neu auf...")
@@ -480,7 +916,7 @@ def main():
         expander.scan_for_recurring_events()
         expander.save_index()
     else:
-        expander.run(use_index=not args.no_index)
+        expander.run(use_index=not args.no_index, plan_only=args.plan)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,7 @@ Sammelt Events von verschiedenen Quellen und erstellt YAML-Dateien
 
 import os
 import re
+import sys
 import json
 import csv
 import hashlib
@@ -18,6 +19,11 @@ import yaml
 # Venue Manager importieren
 from venue_manager import VenueManager
 
+# Gemeinsamer Dedup-Index (scripts/lib)
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from dedup_index import DedupIndex
+from geocoder import get_geocoder
+
 # Konfiguration
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 EVENTS_DIR = PROJECT_ROOT / "_events"
@@ -99,17 +105,15 @@ class ScrapingLogger:
         self.log(f"✅ Event-Datei erstellt: {filename}")
         self.log(f"   📝 Titel: '{title}'")
     
-    def log_venue_enrichment(self, location, venue_found=True, venue_data=None):
-        """Loggt Venue-Anreicherung"""
-        if venue_found and venue_data:
-            self.log(f"🏛️  Venue gefunden für '{location}':")
-            self.log(f"   ✓ Kanonischer Name: {venue_data.get('venue_name', 'N/A')}")
-            self.log(f"   ✓ Adresse: {venue_data.get('address', 'N/A')}")
-            self.log(f"   ✓ Koordinaten: {venue_data.get('latitude', 'N/A')}, {venue_data.get('longitude', 'N/A')}")
-            if venue_data.get('wheelchair_accessible'):
-                self.log(f"   ✓ Barrierefrei: Ja")
-        else:
-            self.log(f"⚠️  Keine Venue-Daten für '{location}' gefunden", "WARN")
+    def log_venue_summary(self, summary):
+        """Loggt die gesammelte Venue-Anreicherung eines Laufs"""
+        self.log(f"🏛️  Venues: {summary['matched']}/{summary['total']} Events angereichert "
+                 f"({summary['locations']} Locations, Cache {summary['cache_hits']} Treffer / "
+                 f"{summary['cache_misses']} aufgelöst)")
+        for location, venue_name in sorted(summary['matches'].items()):
+            self.log(f"   ✓ '{location}' → '{venue_name}'")
+        for location in summary['missing']:
+            self.log(f"   ⚠ Venue nicht gefunden: '{location}'", "WARN")
     
     def log_category_guess(self, title, category):
         """Loggt automatische Kategorie-Zuordnung"""
@@ -184,28 +188,28 @@ class ScrapingLogger:
 class EventScraper:
     def __init__(self):
         self.events = []
-        self.existing_hashes = self.load_existing_hashes()
+        self.dedup_index = DedupIndex.from_stores()
+        self.existing_hashes = set(self.dedup_index.by_hash.keys())
         self.venue_manager = VenueManager()
+        self.venue_summary = None
+        self.geocoder = get_geocoder()
         self.logger = ScrapingLogger()
         self.duplicates_count = 0
         
         self.logger.log(f"📍 Venue Manager geladen: {len(self.venue_manager.venues)} Venues")
     
-    def load_existing_hashes(self):
-        """Lädt bereits vorhandene Event-Hashes um Duplikate zu vermeiden"""
-        hashes = set()
-        if EVENTS_DIR.exists():
-            for file_path in EVENTS_DIR.glob("*.md"):
-                try:
-                    with open(file_path, 'r', encoding='utf-8') as f:
-                        content = f.read()
-                        if 'event_hash:' in content:
-                            hash_match = re.search(r'event_hash:\s*(\w+)', content)
-                            if hash_match:
-                                hashes.add(hash_match.group(1))
-                except Exception as e:
-                    print(f"Fehler beim Lesen von {file_path}: {e}")
-        return hashes
+    def is_known_event(self, title, date, time, location, event_hash):
+        """
+        Prüft Kandidaten gegen Markdown, Staging und Produktiv-Shards
+        (Hash oder normalisierter Schlüssel aus Datum/Titel/Ort)
+        """
+        result = self.dedup_index.query(title, date, location, time, [event_hash])
+        return result.is_duplicate
+    
+    def remember_event(self, event_data):
+        """Nimmt neu gefundenes Event in den Index auf (Duplikate im selben Lauf)"""
+        self.dedup_index.add_front_matter(event_data, ref='scrape-run')
+        self.existing_hashes.add(event_data['event_hash'])
     
     def generate_event_hash(self, title, date, time, location):
         """Generiert einen eindeutigen Hash für ein Event"""
@@ -239,7 +243,7 @@ class EventScraper:
                         self.logger.log_event_found(title, event_date, event_time, location)
                         event_hash = self.generate_event_hash(title, str(event_date), event_time, location)
                         
-                        if event_hash not in self.existing_hashes:
+                        if not self.is_known_event(title, str(event_date), event_time, location, event_hash):
                             event_data = {
                                 'title': title,
                                 'date': event_date,
@@ -283,14 +287,9 @@ class EventScraper:
                             except Exception as e:
                                 self.logger.log_error(f"Recurring-Detection fehlgeschlagen: {e}", title)
                             
-                            # Venue-Daten anreichern
-                            enriched_data = self.venue_manager.enrich_event_data(event_data)
-                            if enriched_data.get('venue_name'):
-                                self.logger.log_venue_enrichment(location, True, enriched_data)
-                            else:
-                                self.logger.log_venue_enrichment(location, False)
-                            
-                            self.events.append(enriched_data)
+                            # Venue-Daten werden gesammelt in run() angereichert
+                            self.events.append(event_data)
+                            self.remember_event(event_data)
                         else:
                             self.logger.log_event_duplicate(title, event_hash)
                             self.duplicates_count += 1
@@ -328,11 +327,9 @@ class EventScraper:
         
         return None, "20:00"
     
-    def geocode_location(self, location):
-        """Versucht, Koordinaten für einen Ort zu finden (vereinfacht)"""
-        # In einer echten Implementierung würde hier eine Geocoding-API verwendet
-        # Für Hof an der Saale verwenden wir vorläufig Standard-Koordinaten
-        return DEFAULT_COORDINATES
+    def geocode_location(self, location, address=''):
+        """Findet Koordinaten für einen Ort (Gazetteer → Cache → Nominatim)"""
+        return self.geocoder.geocode(address, location) or DEFAULT_COORDINATES
     
     def create_ai_enhanced_description(self, event_data):
         """
@@ -367,7 +364,7 @@ class EventScraper:
                 'end_time': '',
                 'location': event['location'],
                 'address': event.get('address', ''),
-                'coordinates': event.get('coordinates', self.geocode_location(event['location'])),
+                'coordinates': event.get('coordinates') or self.geocode_location(event['location'], event.get('address', '')),
                 'category': self.guess_category(event['title'], event.get('description', '')),
                 'tags': self.extract_tags(event['title'], event.get('description', '')),
                 'description': event.get('description', ''),
@@ -468,6 +465,9 @@ Dieses Event wurde automatisch erfasst und wartet auf Überprüfung durch einen
         self.logger.log("")
         self.logger.log(f"✅ {len(self.events)} neue Events gefunden")
         
+        # Venue-Anreicherung für alle Events des Laufs (jede Location einmal)
+        self.enrich_venues()
+        
         if self.events:
             self.save_events()
             self.logger.log("")
@@ -476,6 +476,14 @@ Dieses Event wurde automatisch erfasst und wartet auf Überprüfung durch einen
             self.logger.log("")
             self.logger.log("ℹ️  Keine neuen Events zum Speichern")
     
+    def enrich_venues(self):
+        """Reichert alle neuen Events in einem Durchgang mit Venue-Daten an"""
+        self.venue_summary = self.venue_manager.enrich_events(self.events)
+        if self.events:
+            self.logger.log("")
+            self.logger.log_venue_summary(self.venue_summary)
+        return self.venue_summary
+    
     def generate_sample_events(self):
         """Generiert Beispiel-Events für Testzwecke"""
         self.logger.log_source("Beispiel-Generator", "internal://sample-events")
@@ -516,7 +524,8 @@ Dieses Event wurde automatisch erfasst und wartet auf Überprüfung durch einen
                 event['location']
             )
             
-            if event_hash not in self.existing_hashes:
+            if not self.is_known_event(event['title'], str(event['date']),
+                                       event['start_time'], event['location'], event_hash):
                 event['event_hash'] = event_hash
                 event['status'] = 'Entwurf'
                 
@@ -552,6 +561,7 @@ Dieses Event wurde automatisch erfasst und wartet auf Überprüfung durch einen
                     self.logger.log_error(f"Recurring-Detection fehlgeschlagen: {e}", event['title'])
                 
                 self.events.append(event)
+                self.remember_event(event)
             else:
                 self.logger.log_event_duplicate(event['title'], event_hash)
                 self.duplicates_count += 1
@@ -590,8 +600,8 @@ def main():
     scraper = EventScraper()
     scraper.run()
     
-    # Report: Fehlende Venues
-    missing_venues = scraper.venue_manager.find_missing_venues(scraper.events)
+    # Report: Fehlende Venues (aus der Anreicherung des Laufs)
+    missing_venues = scraper.venue_summary['missing'] if scraper.venue_summary else []
     
     # Log-Zusammenfassung
     scraper.logger.log_summary(
@@ -22,6 +22,7 @@ def print_menu():
     print("3. Neuen Venue hinzufügen")
     print("4. Fehlende Venues aus Events finden")
     print("5. Venue-Details anzeigen")
+    print("6. Venues aus CSV importieren")
     print("0. Beenden")
     print("="*60)
 
@@ -233,6 +234,30 @@ def find_missing_from_events(manager):
         print("\n✅ Alle Venues sind erfasst!")
 
 
+def import_venues(manager):
+    """Importiert viele Venues aus einer CSV (gleiche Spalten wie venues.csv)"""
+    path = input("\n📂 Pfad zur CSV-Datei: ").strip()
+    if not path:
+        return
+    
+    import_file = Path(path)
+    if not import_file.exists():
+        print(f"❌ Datei nicht gefunden: {import_file}")
+        return
+    
+    with open(import_file, 'r', encoding='utf-8') as f:
+        rows = [{k: v for k, v in row.items() if v} for row in csv.DictReader(f)]
+    
+    print(f"📊 {len(rows)} Einträge gelesen")
+    result = manager.add_venues(rows)
+    
+    print(f"\n✅ {len(result['added'])} Venues hinzugefügt")
+    if result['skipped']:
+        print(f"⚠️  {len(result['skipped'])} übersprungen:")
+        for name, reason in result['skipped']:
+            print(f"  • {name or '(ohne Name)'}: {reason}")
+
+
 def main():
     """Hauptprogramm"""
     manager = VenueManager()
@@ -262,6 +287,8 @@ def main():
                     print("❌ Ungültige Nummer!")
             except ValueError:
                 print("❌ Bitte Zahl eingeben!")
+        elif choice == '6':
+            import_venues(manager)
         else:
             print("❌ Ungültige Auswahl!")
         
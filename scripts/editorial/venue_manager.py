@@ -5,7 +5,8 @@ Verwaltet Veranstaltungsorte mit zusätzlichen Metadaten
 """
 
 import csv
-import re
+import sys
+from collections import Counter, OrderedDict
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
@@ -14,64 +15,77 @@ from difflib import SequenceMatcher
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 VENUES_CSV = PROJECT_ROOT / "_data" / "venues.csv"
 
+# Spalten von venues.csv (falls die Datei noch keinen Header hat)
+VENUE_FIELDS = [
+    'name', 'aliases', 'address', 'lat', 'lng', 'wheelchair_accessible', 'wheelchair_toilet',
+    'parking', 'public_transport', 'website', 'phone', 'capacity', 'notes', 'last_updated',
+    'icon', 'color', 'location_type'
+]
+
+# Fuzzy-Matching: Mindest-Ähnlichkeit und Anzahl Trigramm-Kandidaten,
+# die exakt mit SequenceMatcher bewertet werden
+FUZZY_THRESHOLD = 0.8
+FUZZY_CANDIDATES = 8
+
+# Maximale Anzahl gemerkter Auflösungen (Location → Venue oder "nicht gefunden")
+RESOLUTION_CACHE_SIZE = 1024
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from spatial_index import coords_of
+from venue_registry import (
+    build_name_index, get_venue_registry, normalize_name, parse_venue_row, trigrams
+)
+
 
 class VenueManager:
     """Verwaltet Veranstaltungsorte und deren Metadaten"""
     
     def __init__(self):
-        self.venues = self.load_venues()
-        self.name_index = self._build_name_index()
+        self._load_registry()
+        # LRU der Auflösungen (normalisierter Name → Venue oder None)
+        self._resolution_cache: "OrderedDict[str, Optional[Dict]]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+    
+    def _load_registry(self, refresh: bool = False):
+        """Übernimmt Venues und Indizes aus der kompilierten Venue-Registry"""
+        registry = get_venue_registry(refresh=refresh)
+        self.venues = registry.venues
+        self.name_index = registry.name_index
+        self.name_order = registry.name_order
+        self.trigram_index = registry.trigram_index
+        self.spatial = registry.spatial
     
     def load_venues(self) -> List[Dict]:
-        """Lädt alle Venues aus CSV"""
-        venues = []
-        if VENUES_CSV.exists():
-            with open(VENUES_CSV, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    # Boolean-Werte konvertieren
-                    for bool_field in ['wheelchair_accessible', 'wheelchair_toilet', 'parking', 'public_transport']:
-                        if row.get(bool_field):
-                            row[bool_field] = row[bool_field].lower() == 'true'
-                    
-                    # Aliases als Liste
-                    if row.get('aliases'):
-                        row['aliases'] = [a.strip() for a in row['aliases'].split(',')]
-                    else:
-                        row['aliases'] = []
-                    
-                    venues.append(row)
-        return venues
+        """Lädt alle Venues (venues.csv + _data/places) aus der Registry"""
+        return get_venue_registry().venues
     
     def _build_name_index(self) -> Dict[str, Dict]:
-        """Erstellt Index für schnelle Name-Lookups (inkl. Aliases)"""
-        index = {}
-        for venue in self.venues:
-            # Hauptname
-            normalized_name = self._normalize_name(venue['name'])
-            index[normalized_name] = venue
-            
-            # Aliases
-            for alias in venue['aliases']:
-                normalized_alias = self._normalize_name(alias)
-                index[normalized_alias] = venue
+        """
+        Erstellt Index für schnelle Name-Lookups (inkl. Aliases)
+        
+        Baut zusätzlich einen Trigramm-Index (Trigramm → Namen) für das
+        Fuzzy-Matching in find_venue. Normalerweise kommen beide fertig aus
+        der Registry; das hier ist für geänderte self.venues.
+        """
+        positions, self.trigram_index = build_name_index(self.venues)
         
-        return index
+        # Reihenfolge der Namen merken, damit Gleichstände wie bei der
+        # linearen Suche zugunsten des früheren Eintrags ausgehen
+        self.name_order = {name: order for order, name in enumerate(positions)}
+        return {name: self.venues[position] for name, position in positions.items()}
     
     def _normalize_name(self, name: str) -> str:
         """Normalisiert Namen für Vergleiche"""
-        if not name:
-            return ""
-        # Kleinschreibung, Leerzeichen entfernen, Sonderzeichen normalisieren
-        name = name.lower().strip()
-        name = re.sub(r'\s+', ' ', name)
-        name = re.sub(r'[^\w\s]', '', name)
-        return name
+        return normalize_name(name)
     
     def find_venue(self, location_name: str) -> Optional[Dict]:
         """
         Findet Venue anhand des Namens (exakt oder fuzzy)
         
+        Ergebnisse (auch "nicht gefunden") werden in einem begrenzten LRU-Cache
+        gemerkt, der bei Änderungen am Index geleert wird.
+        
         Args:
             location_name: Name des Veranstaltungsortes aus Event-Daten
             
@@ -83,22 +97,62 @@ class VenueManager:
         
         normalized = self._normalize_name(location_name)
         
+        if normalized in self._resolution_cache:
+            self._resolution_cache.move_to_end(normalized)
+            self.cache_hits += 1
+            return self._resolution_cache[normalized]
+        
+        self.cache_misses += 1
+        venue = self._resolve(normalized)
+        self._resolution_cache[normalized] = venue
+        if len(self._resolution_cache) > RESOLUTION_CACHE_SIZE:
+            self._resolution_cache.popitem(last=False)
+        return venue
+    
+    def _resolve(self, normalized: str) -> Optional[Dict]:
+        """Löst einen normalisierten Namen ohne Cache auf"""
         # 1. Exakter Match (inkl. Aliases)
         if normalized in self.name_index:
             return self.name_index[normalized]
         
-        # 2. Fuzzy-Matching (Ähnlichkeit > 0.8)
+        # 2. Fuzzy-Matching (Ähnlichkeit > 0.8) auf Trigramm-Kandidaten
         best_match = None
         best_score = 0.0
         
-        for indexed_name, venue in self.name_index.items():
+        for indexed_name in self._fuzzy_candidates(normalized):
             score = SequenceMatcher(None, normalized, indexed_name).ratio()
-            if score > best_score and score > 0.8:
+            if score > best_score and score > FUZZY_THRESHOLD:
                 best_score = score
-                best_match = venue
+                best_match = self.name_index[indexed_name]
         
         return best_match
     
+    def clear_cache(self):
+        """Leert den Auflösungs-Cache (nach Änderungen an den Venues)"""
+        self._resolution_cache.clear()
+    
+    def _fuzzy_candidates(self, normalized: str) -> List[str]:
+        """
+        Shortlist für das Fuzzy-Matching über den Trigramm-Index
+        
+        Verworfen werden Namen ohne gemeinsames Trigramm und Namen, deren Länge
+        keine Ähnlichkeit > FUZZY_THRESHOLD zulässt (ratio ≤ 2·min/(a+b)).
+        Von den übrigen werden die FUZZY_CANDIDATES mit den meisten gemeinsamen
+        Trigrammen exakt bewertet, in Index-Reihenfolge.
+        """
+        shared = Counter()
+        for trigram in trigrams(normalized):
+            for name in self.trigram_index.get(trigram, ()):
+                shared[name] += 1
+        
+        length = len(normalized)
+        candidates = [
+            name for name in shared
+            if 2 * min(length, len(name)) > FUZZY_THRESHOLD * (length + len(name))
+        ]
+        candidates.sort(key=lambda name: (-shared[name], self.name_order[name]))
+        return sorted(candidates[:FUZZY_CANDIDATES], key=self.name_order.get)
+    
     def enrich_event_data(self, event_data: Dict) -> Dict:
         """
         Reichert Event-Daten mit Venue-Metadaten an
@@ -113,35 +167,73 @@ class VenueManager:
         venue = self.find_venue(location_name)
         
         if venue:
-            # Koordinaten überschreiben (wenn Venue bessere hat)
-            if venue.get('lat') and venue.get('lng'):
-                event_data['coordinates'] = {
-                    'lat': float(venue['lat']),
-                    'lng': float(venue['lng'])
-                }
-            
-            # Adresse hinzufügen
-            if venue.get('address') and not event_data.get('address'):
-                event_data['address'] = venue['address']
-            
-            # Venue-Metadaten hinzufügen
-            event_data['venue'] = {
-                'name': venue['name'],
-                'wheelchair_accessible': venue.get('wheelchair_accessible', False),
-                'wheelchair_toilet': venue.get('wheelchair_toilet', False),
-                'parking': venue.get('parking', False),
-                'public_transport': venue.get('public_transport', False),
-                'website': venue.get('website', ''),
-                'phone': venue.get('phone', ''),
-                'capacity': venue.get('capacity', '')
-            }
-            
+            self._apply_venue(event_data, venue)
             print(f"  ✓ Venue Match: '{location_name}' → '{venue['name']}'")
         else:
             print(f"  ⚠ Venue nicht gefunden: '{location_name}'")
         
         return event_data
     
+    def enrich_events(self, events: List[Dict]) -> Dict:
+        """
+        Reichert viele Events an (jede Location wird nur einmal aufgelöst)
+        
+        Args:
+            events: Liste von Event-Dicts mit 'location' field (wird in-place angereichert)
+            
+        Returns:
+            Zusammenfassung: Anzahl Events/Treffer, Location → Venue-Name,
+            fehlende Locations und Cache-Statistik
+        """
+        resolved: Dict[str, Optional[Dict]] = {}
+        matched = 0
+        
+        for event_data in events:
+            location = (event_data.get('location') or '').strip()
+            if location not in resolved:
+                resolved[location] = self.find_venue(location)
+            venue = resolved[location]
+            if venue:
+                self._apply_venue(event_data, venue)
+                matched += 1
+        
+        return {
+            'total': len(events),
+            'matched': matched,
+            'unmatched': len(events) - matched,
+            'locations': len(resolved),
+            'matches': {loc: venue['name'] for loc, venue in resolved.items() if venue},
+            'missing': sorted(loc for loc, venue in resolved.items() if loc and not venue),
+            'cache_hits': self.cache_hits,
+            'cache_misses': self.cache_misses
+        }
+    
+    @staticmethod
+    def _apply_venue(event_data: Dict, venue: Dict):
+        """Überträgt Koordinaten, Adresse und Venue-Metadaten auf ein Event"""
+        # Koordinaten überschreiben (wenn Venue bessere hat)
+        if venue.get('lat') and venue.get('lng'):
+            event_data['coordinates'] = {
+                'lat': float(venue['lat']),
+                'lng': float(venue['lng'])
+            }
+        
+        # Adresse hinzufügen
+        if venue.get('address') and not event_data.get('address'):
+            event_data['address'] = venue['address']
+        
+        # Venue-Metadaten hinzufügen
+        event_data['venue'] = {
+            'name': venue['name'],
+            'wheelchair_accessible': venue.get('wheelchair_accessible', False),
+            'wheelchair_toilet': venue.get('wheelchair_toilet', False),
+            'parking': venue.get('parking', False),
+            'public_transport': venue.get('public_transport', False),
+            'website': venue.get('website', ''),
+            'phone': venue.get('phone', ''),
+            'capacity': venue.get('capacity', '')
+        }
+    
     def add_venue(self, venue_data: Dict) -> bool:
         """
         Fügt neuen Venue zur CSV hinzu
@@ -152,43 +244,136 @@ class VenueManager:
         Returns:
             True bei Erfolg
         """
-        # Prüfen ob Venue bereits existiert
-        if self.find_venue(venue_data['name']):
-            print(f"Venue '{venue_data['name']}' existiert bereits")
-            return False
-        
-        # Defaults setzen
-        defaults = {
-            'aliases': '',
-            'address': '',
-            'lat': '',
-            'lng': '',
-            'wheelchair_accessible': 'false',
-            'wheelchair_toilet': 'false',
-            'parking': 'false',
-            'public_transport': 'false',
-            'website': '',
-            'phone': '',
-            'capacity': '',
-            'notes': '',
-            'last_updated': datetime.now().strftime('%Y-%m-%d')
-        }
+        result = self.add_venues([venue_data])
+        for name, reason in result['skipped']:
+            print(f"Venue '{name}': {reason}")
+        if result['added']:
+            print(f"✓ Venue '{venue_data['name']}' hinzugefügt")
+        return bool(result['added'])
+    
+    def add_venues(self, venues_data: List[Dict]) -> Dict:
+        """
+        Fügt viele Venues in einem Schreibvorgang hinzu
+        
+        Jeder Eintrag wird gegen den bestehenden Index und den Rest des
+        Batches geprüft; gültige Einträge werden mit der Spaltenreihenfolge
+        von venues.csv angehängt und inkrementell in die Indizes übernommen.
         
-        for key, default in defaults.items():
-            if key not in venue_data:
-                venue_data[key] = default
+        Args:
+            venues_data: Liste von Dicts mit Venue-Feldern (aliases als
+                         kommaseparierter String oder Liste)
+            
+        Returns:
+            {'added': [Namen], 'skipped': [(Name, Grund)]}
+        """
+        fieldnames = self._csv_fieldnames()
+        today = datetime.now().strftime('%Y-%m-%d')
+        rows: List[Dict] = []
+        skipped: List[Tuple[str, str]] = []
+        batch_names = set()
         
-        # CSV aktualisieren
-        with open(VENUES_CSV, 'a', encoding='utf-8', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=venue_data.keys())
-            writer.writerow(venue_data)
+        for venue_data in venues_data:
+            name = (venue_data.get('name') or '').strip()
+            row = {field: '' for field in fieldnames}
+            row.update({
+                'wheelchair_accessible': 'false',
+                'wheelchair_toilet': 'false',
+                'parking': 'false',
+                'public_transport': 'false',
+                'last_updated': today
+            })
+            
+            aliases = venue_data.get('aliases') or []
+            if isinstance(aliases, str):
+                aliases = [a.strip() for a in aliases.split(',')]
+            aliases = [a for a in aliases if a]
+            keys = [self._normalize_name(n) for n in [name] + aliases]
+            
+            unknown = sorted(set(venue_data) - set(fieldnames))
+            if not name:
+                skipped.append((name, "Name fehlt"))
+                continue
+            if unknown:
+                skipped.append((name, f"Unbekannte Felder: {', '.join(unknown)}"))
+                continue
+            if self.find_venue(name):
+                skipped.append((name, "existiert bereits"))
+                continue
+            if any(key in self.name_index for key in keys[1:]):
+                skipped.append((name, "Alias ist bereits vergeben"))
+                continue
+            if any(key in batch_names for key in keys):
+                skipped.append((name, "doppelt im Import"))
+                continue
+            
+            for key, value in venue_data.items():
+                if value is None:
+                    continue
+                if isinstance(value, bool):
+                    value = 'true' if value else 'false'
+                row[key] = str(value)
+            row['name'] = name
+            row['aliases'] = ','.join(aliases)
+            
+            lat, lng = row.get('lat', ''), row.get('lng', '')
+            if bool(lat) != bool(lng):
+                skipped.append((name, "Koordinaten unvollständig"))
+                continue
+            try:
+                if lat:
+                    float(lat), float(lng)
+            except ValueError:
+                skipped.append((name, "Ungültige Koordinaten"))
+                continue
+            
+            batch_names.update(keys)
+            rows.append(row)
         
-        # Index neu laden
-        self.venues = self.load_venues()
-        self.name_index = self._build_name_index()
+        if rows:
+            # Ein Schreibvorgang, Spalten in der Reihenfolge des CSV-Headers
+            needs_newline = False
+            if VENUES_CSV.exists() and VENUES_CSV.stat().st_size:
+                with open(VENUES_CSV, 'rb') as f:
+                    f.seek(-1, 2)
+                    needs_newline = f.read(1) != b'\n'
+            write_header = not VENUES_CSV.exists() or not VENUES_CSV.stat().st_size
+            with open(VENUES_CSV, 'a', encoding='utf-8', newline='') as f:
+                if needs_newline:
+                    f.write('\n')
+                writer = csv.DictWriter(f, fieldnames=fieldnames, lineterminator='\n')
+                if write_header:
+                    writer.writeheader()
+                writer.writerows(rows)
+            
+            for row in rows:
+                self._index_venue(parse_venue_row(dict(row)))
+            # Negativ-Einträge könnten jetzt auflösbar sein
+            self.clear_cache()
         
-        print(f"✓ Venue '{venue_data['name']}' hinzugefügt")
-        return True
+        return {'added': [row['name'] for row in rows], 'skipped': skipped}
+    
+    def _csv_fieldnames(self) -> List[str]:
+        """Spaltenreihenfolge aus dem Header von venues.csv"""
+        if VENUES_CSV.exists():
+            with open(VENUES_CSV, 'r', encoding='utf-8', newline='') as f:
+                header = next(csv.reader(f), None)
+            if header:
+                return header
+        return list(VENUE_FIELDS)
+    
+    def _index_venue(self, venue: Dict):
+        """Nimmt einen neuen Venue in Namens-, Trigramm- und Spatial-Index auf"""
+        self.venues.append(venue)
+        for name in [venue['name']] + venue['aliases']:
+            normalized = self._normalize_name(name)
+            if normalized not in self.name_order:
+                self.name_order[normalized] = len(self.name_order)
+                for trigram in trigrams(normalized):
+                    self.trigram_index.setdefault(trigram, []).append(normalized)
+            self.name_index[normalized] = venue
+        coords = coords_of(venue)
+        if coords:
+            self.spatial.add(coords[0], coords[1], venue)
     
     def find_missing_venues(self, events: List[Dict]) -> List[str]:
         """
@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """
 Merger - Applies review decisions and merges approved events
-Reads review decision JSON files and updates _data/events.json
+Reads review decision JSON files and updates the month shards in _data/events/
 """
 
 import sys
@@ -9,16 +9,19 @@ import json
 import shutil
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Set
+from typing import Iterable, List, Dict, Set
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from lib.schemas import Event, EventCollection
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from schemas import Event
+from dedup_index import DedupIndex, STORE_MARKDOWN, STORE_PRODUCTION
+from event_store import EVENTS_DATA_DIR, EventStore, shard_key
+from json_stream import find_by_hash
 
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 STAGING_DIR = PROJECT_ROOT / "_data" / "staging"
-EVENTS_JSON = PROJECT_ROOT / "_data" / "events.json"
 ARCHIVE_DIR = PROJECT_ROOT / "_data" / "archive"
 
 # Ensure directories exist
@@ -26,28 +29,24 @@ ARCHIVE_DIR.mkdir(parents=True, exist_ok=True)
 
 
 class EventMerger:
-    """Merges approved events into production events.json"""
+    """Merges approved events into the production month shards"""
     
     def __init__(self):
-        self.production_events: EventCollection = self._load_production()
+        self.store = EventStore()
+        self.dedup_index = DedupIndex()
+        self.dedup_index.load_markdown()
+        self.indexed_months: Set[str] = set()
         self.approved_count = 0
         self.rejected_count = 0
         self.merged_count = 0
         self.skipped_count = 0
         
-    def _load_production(self) -> EventCollection:
-        """Load production events from events.json"""
-        if EVENTS_JSON.exists():
-            try:
-                with open(EVENTS_JSON, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    return EventCollection.from_dict(data)
-            except Exception as e:
-                print(f"⚠️  Error loading events.json: {e}")
-                print("   Creating new EventCollection")
-        
-        # Create new collection if file doesn't exist or is invalid
-        return EventCollection(version="2.0", events=[])
+    def _load_production(self, events: Iterable[Event]):
+        """Load the production shards for the months of the given events into the dedup index"""
+        months = {shard_key(event.date) for event in events} - self.indexed_months
+        for month in sorted(months):
+            self.dedup_index.load_production(self.store.shard(month).events)
+        self.indexed_months |= months
     
     def process_review_decisions(self, review_file: Path):
         """Process a single review decision file"""
@@ -66,15 +65,19 @@ class EventMerger:
                 print(f"❌ Staging file not found: {staging_file.name}")
                 return
             
-            # Load staged events
-            with open(staging_file, 'r', encoding='utf-8') as f:
-                staging_data = json.load(f)
-            
+            # Load only the staged events that have a decision (streamed, one pass)
+            found = find_by_hash(
+                staging_file,
+                (d['event_hash'] for d in decisions['decisions']),
+                key=lambda event: (event.get('meta') or {}).get('hash')
+            )
             staged_events = {
-                event['meta']['hash']: Event.from_dict(event)
-                for event in staging_data['events']
+                event_hash: Event.from_dict(event)
+                for event_hash, event in found.items()
             }
             
+            self._load_production(staged_events.values())
+            
             print(f"📋 Decisions: {len(decisions['decisions'])}")
             print(f"📦 Staged events: {len(staged_events)}")
             print()
@@ -116,21 +119,30 @@ class EventMerger:
     
     def _merge_event(self, event: Event):
         """Add event to production collection"""
-        # Check if event already exists by ID
-        existing_ids = {e.generate_id() for e in self.production_events.events}
+        # Check if event already exists (Produktiv-Shards + Markdown-Events)
         event_id = event.generate_id()
+        result = self.dedup_index.query(
+            event.title, event.date,
+            event.place.get('name', '') if event.place else '',
+            event.start_time, [event_id],
+            stores=(STORE_PRODUCTION, STORE_MARKDOWN)
+        )
         
-        if event_id in existing_ids:
-            print(f"   ⚠️  Event already exists (ID: {event_id[:12]})")
+        if result.is_duplicate:
+            existing = result.exact[0]
+            print(f"   ⚠️  Event already exists (ID: {event_id[:12]}, {existing.store})")
             return
         
         # Update meta
-        event.meta.needs_review = False
-        event.meta.reviewed_at = datetime.now().isoformat()
-        event.meta.reviewed_by = "merger.py"
+        event.meta['needs_review'] = False
+        event.meta['reviewed_at'] = datetime.now().isoformat()
+        event.meta['reviewed_by'] = "merger.py"
         
-        # Add to collection
-        self.production_events.events.append(event)
+        # Add to its month shard (ID-Map statt Scan über alle Events)
+        if not self.store.add_event(event):
+            print(f"   ⚠️  Event already exists (ID: {event.id[:12]}, production)")
+            return
+        self.dedup_index.add_schema_event(event, STORE_PRODUCTION)
     
     def _archive_files(self, review_file: Path, staging_file: Path):
         """Move processed files to archive"""
@@ -147,37 +159,13 @@ class EventMerger:
         print(f"📦 Archived: {archive_staging.name}")
     
     def save_production(self):
-        """Save updated production events to events.json"""
-        # Sort events by date (most recent first)
-        self.production_events.events.sort(
-            key=lambda e: (e.start_date, e.start_time or "00:00"),
-            reverse=False
-        )
-        
-        # Update metadata
-        self.production_events.meta = {
-            "last_updated": datetime.now().isoformat(),
-            "total_events": len(self.production_events.events),
-            "version": "2.0"
-        }
-        
-        # Create backup
-        if EVENTS_JSON.exists():
-            backup = EVENTS_JSON.with_suffix('.json.bak')
-            shutil.copy2(EVENTS_JSON, backup)
-            print(f"\n💾 Backup created: {backup.name}")
-        
-        # Save to file
-        with open(EVENTS_JSON, 'w', encoding='utf-8') as f:
-            json.dump(
-                self.production_events.to_dict(),
-                f,
-                ensure_ascii=False,
-                indent=2
-            )
+        """Save touched month shards and the manifest"""
+        written = self.store.save()
         
-        print(f"✅ Saved: {EVENTS_JSON.name}")
-        print(f"   Total events: {len(self.production_events.events)}")
+        print(f"\n✅ Saved: {len(written)} shard(s) in {EVENTS_DATA_DIR.relative_to(PROJECT_ROOT)}/")
+        for month in written:
+            print(f"   {month}.json")
+        print(f"   Total events: {self.store.total()}")
     
     def print_summary(self):
         """Print merge summary"""
@@ -188,7 +176,7 @@ class EventMerger:
         print(f"❌ Rejected:  {self.rejected_count}")
         print(f"🔀 Merged:    {self.merged_count}")
         print(f"⏭️  Skipped:   {self.skipped_count}")
-        print(f"📚 Total in production: {len(self.production_events.events)}")
+        print(f"📚 Total in production: {self.store.total()}")
         print("=" * 80)
 
 
@@ -218,14 +206,14 @@ def main():
     if merger.approved_count > 0:
         merger.save_production()
     else:
-        print("\n⚠️  No events approved, events.json unchanged")
+        print("\n⚠️  No events approved, production shards unchanged")
     
     # Print summary
     merger.print_summary()
     
     print("\nNext steps:")
-    print("  1. Commit changes: git add _data/events.json")
-    print("  2. Review diff: git diff _data/events.json")
+    print("  1. Commit changes: git add _data/events/")
+    print("  2. Review diff: git diff _data/events/")
     print("  3. Push changes: git commit -m 'Add reviewed events' && git push")
 
 
@@ -25,11 +25,14 @@ import shutil
 # Add lib to path
 sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
 from schemas import Event, EventCollection, slugify
+from dedup_index import DedupIndex, STORE_MARKDOWN, STORE_PRODUCTION
+from event_store import EventStore
+from json_stream import iter_array, read_headers
+from organizer_registry import get_registry
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 DATA_DIR = PROJECT_ROOT / "_data"
 STAGING_DIR = DATA_DIR / "staging"
-EVENTS_JSON = DATA_DIR / "events.json"
 
 
 # ============================================================
@@ -152,6 +155,27 @@ def find_duplicates(new_event: Event, existing_events: List[Event], threshold: f
     return duplicates
 
 
+def _record_to_event(record) -> Event:
+    """Wandelt einen Dedup-Index-Eintrag in ein Event (für Diff-View)"""
+    if isinstance(record.payload, Event):
+        return record.payload
+    if record.store != STORE_MARKDOWN:
+        return Event.from_dict(dict(record.payload))
+    
+    data = record.payload
+    return Event(
+        id=data.get('event_hash') or '',
+        status="published",
+        title=record.title,
+        date=record.date,
+        start_time=record.start_time,
+        place={'name': record.location},
+        category=data.get('category') or "Sonstiges",
+        description=data.get('description') or "",
+        urls={'source': data.get('url') or None}
+    )
+
+
 def show_diff_view(new_event: Event, existing_event: Event, similarity: float):
     """Show side-by-side diff of two events"""
     clear_screen()
@@ -236,23 +260,52 @@ class ReviewSession:
         self.staging_file = staging_file
         self.staging_data = self._load_staging()
         self.production_data = self._load_production()
+        self.dedup_index = self._build_dedup_index()
         self.decisions: List[ReviewDecision] = []
         self.current_index = 0
     
     def _load_staging(self) -> EventCollection:
-        """Load staging events"""
-        with open(self.staging_file, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return EventCollection.from_dict(data)
+        """Load staging events (gestreamt; Roh-HTML aus meta.raw_data bleibt in der Datei)"""
+        events = []
+        for data in iter_array(self.staging_file):
+            if isinstance(data.get('meta'), dict):
+                data['meta'].pop('raw_data', None)
+            events.append(Event.from_dict(data))
+        return EventCollection(events=events)
     
     def _load_production(self) -> EventCollection:
-        """Load production events"""
-        if not EVENTS_JSON.exists():
+        """Load production events (nur die Monats-Shards der Staging-Events)"""
+        dates = sorted(e.date for e in self.staging_data.events if e.date)
+        if not dates:
             return EventCollection(events=[])
-        
-        with open(EVENTS_JSON, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-        return EventCollection.from_dict(data)
+        return EventStore().load(dates[0], dates[-1])
+    
+    def _build_dedup_index(self) -> DedupIndex:
+        """Index über Produktiv-Shards und Markdown-Events (einmal pro Session)"""
+        index = DedupIndex()
+        index.load_production(self.production_data.events)
+        index.load_markdown()
+        return index
+    
+    def find_duplicates(self, event: Event, threshold: float = 0.75) -> List[Tuple[Event, float]]:
+        """
+        Duplikate über alle bestehenden Stores (exakt + fuzzy)
+        Returns: [(event, similarity_score), ...]
+        """
+        result = self.dedup_index.query_event(
+            event, threshold=threshold, stores=(STORE_PRODUCTION, STORE_MARKDOWN)
+        )
+        matches = [(record, 1.0) for record in result.exact] + result.fuzzy
+        return [(_record_to_event(record), score) for record, score in matches]
+    
+    def find_organizer(self, event: Event) -> Optional[Dict]:
+        """Veranstalter aus der gemeinsamen Registry (Slug → Name/Alias → Venue)"""
+        registry = get_registry()
+        organizer = event.organizer or {}
+        if organizer.get('slug') and registry.get(organizer['slug']):
+            return registry.get(organizer['slug'])
+        place_name = event.place.get('name', '') if event.place else ''
+        return registry.resolve(organizer.get('name', ''), place_name)
     
     def get_current_event(self) -> Optional[Event]:
         """Get current event to review"""
@@ -333,9 +386,11 @@ def review_event_interactive(session: ReviewSession, event: Event) -> ReviewDeci
     print_header(f"🔍 Event Review ({session.current_index + 1}/{summary['total']})")
     
     # Event details
+    organizer = session.find_organizer(event)
     event_info = f"""Title:       {event.title}
 Date:        {event.date} {event.start_time}
 Place:       {event.place.get('name', 'N/A') if event.place else 'N/A'}
+Organizer:   {organizer['name'] if organizer else 'N/A'}{' (Venue-basiert)' if organizer and organizer.get('match_type') else ''}
 Category:    {event.category}
 Description: {event.description[:150]}{'...' if len(event.description) > 150 else ''}
 Status:      {event.status}
@@ -343,7 +398,7 @@ Status:      {event.status}
     print_box("Event Details", event_info, Colors.CYAN)
     
     # Check for duplicates
-    duplicates = find_duplicates(event, session.production_data.events)
+    duplicates = session.find_duplicates(event)
     
     if duplicates:
         dup_event, similarity = duplicates[0]
@@ -488,14 +543,14 @@ def list_staging_files():
     
     print_header("📋 Staging Files")
     
+    # Header + Anzahl ohne die Events zu laden (gecacht nach mtime/Größe)
+    headers = read_headers(files)
+    
     for i, file in enumerate(sorted(files, reverse=True), 1):
-        # Parse file to get event count
-        try:
-            with open(file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            event_count = len(data.get('events', []))
-            scraped_at = data.get('scraped_at', 'unknown')
-        except:
+        if file in headers:
+            header, event_count = headers[file]
+            scraped_at = header.get('scraped_at', 'unknown')
+        else:
             event_count = '?'
             scraped_at = 'error'
         
@@ -517,7 +572,7 @@ def auto_approve_all(staging_file: Path):
     skipped = 0
     
     for event in session.staging_data.events:
-        duplicates = find_duplicates(event, session.production_data.events)
+        duplicates = session.find_duplicates(event)
         
         if duplicates:
             print(f"{Colors.YELLOW}Skip:{Colors.RESET} {event.title} (Duplikat gefunden)")
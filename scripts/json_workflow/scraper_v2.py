@@ -15,7 +15,10 @@ from bs4 import BeautifulSoup
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
 from lib.schemas import Event, EventMeta, Place, Organizer, Coordinates
+from organizer_registry import get_registry, OrganizerRegistry
+from venue_registry import get_venue_registry
 
 # Configuration
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -37,31 +40,24 @@ class ScraperV2:
         self.session_id = datetime.now().strftime('%Y%m%d_%H%M%S')
         
     def _load_places(self) -> Dict[str, Place]:
-        """Load all places from _data/places/"""
+        """Load all places from the compiled venue registry (_data/places/)"""
         places = {}
-        if PLACES_DIR.exists():
-            for json_file in PLACES_DIR.glob("*.json"):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        place = Place.from_dict(data)
-                        places[place.slug] = place
-                except Exception as e:
-                    print(f"⚠️  Error loading place {json_file}: {e}")
+        for slug, data in get_venue_registry().places.items():
+            try:
+                place = Place.from_dict(dict(data))
+                places[place.slug] = place
+            except Exception as e:
+                print(f"⚠️  Error loading place {slug}: {e}")
         return places
     
     def _load_organizers(self) -> Dict[str, Organizer]:
-        """Load all organizers from _data/organizers/"""
+        """Load all organizers from the shared organizer registry"""
         organizers = {}
-        if ORGANIZERS_DIR.exists():
-            for json_file in ORGANIZERS_DIR.glob("*.json"):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-                        organizer = Organizer.from_dict(data)
-                        organizers[organizer.slug] = organizer
-                except Exception as e:
-                    print(f"⚠️  Error loading organizer {json_file}: {e}")
+        for slug, record in get_registry().organizers.items():
+            try:
+                organizers[slug] = Organizer.from_dict(OrganizerRegistry.to_schema_dict(record))
+            except Exception as e:
+                print(f"⚠️  Error loading organizer {slug}: {e}")
         return organizers
     
     def scrape_all_sources(self):
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Archive Index für krawl.ist
+Zusammenfassung je Archiv-Monat für Zeitraum-Abfragen über _events/_history/,
+ohne jede Datei jedes Monats zu parsen.
+
+    .cache/archive_index/YYYYMM.json
+
+Je Event: Dateiname, Datum, Titel, Location, Kategorie, event_hash,
+recurring-Flag und - bei gepackten Monaten (archive_pack) - Block und Zeile
+im Pack. Eine Signatur (je Datei mtime/Größe, dazu der Pack) erkennt
+veraltete Monate; diese werden bei der nächsten Abfrage neu aufgebaut.
+EventArchiver aktualisiert die Monate, in die er archiviert, direkt.
+
+Abfrage (query_archive):
+1. Monate nach Zeitraum eingrenzen (nur Ordner-/Pack-Namen)
+2. Zusammenfassungen filtern (Location inkl. Venue-Aliases, Kategorie, Titel)
+3. Vollständige Events nur für Treffer laden (load_event)
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from archive_pack import INDEX_SUFFIX, PACK_SUFFIX, ArchivePack, iter_pack, pack_files
+from compiled_cache import CACHE_DIR
+from dedup_index import normalize_text
+from event_corpus import parse_content
+from rrule import parse_date
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+HISTORY_DIR = PROJECT_ROOT / "_events" / "_history"
+INDEX_DIR = CACHE_DIR / "archive_index"
+INDEX_VERSION = 1
+
+SUMMARY_FIELDS = ['date', 'title', 'location', 'category', 'event_hash']
+
+
+def archive_months(history_dir: Path = HISTORY_DIR) -> List[str]:
+    """Alle Archiv-Monate (Ordner und Packs, sortiert)"""
+    if not history_dir.exists():
+        return []
+    months = {d.name for d in history_dir.iterdir()
+              if d.is_dir() and d.name.isdigit() and len(d.name) == 6}
+    months.update(p.name[:-len(INDEX_SUFFIX)] for p in history_dir.glob(f"*{INDEX_SUFFIX}"))
+    return sorted(months)
+
+
+def months_in_range(months: List[str], start=None, end=None) -> List[str]:
+    """Monate, die das Fenster [start, end] berühren"""
+    first = parse_date(start).strftime('%Y%m') if start else '000000'
+    last = parse_date(end).strftime('%Y%m') if end else '999999'
+    return [m for m in months if first <= m <= last]
+
+
+def month_signature(month: str, history_dir: Path = HISTORY_DIR) -> Dict:
+    """Dateien (mtime/Größe) und Pack eines Monats - ändert sich bei jeder Änderung"""
+    month_dir = history_dir / month
+    files = {}
+    if month_dir.exists():
+        for filepath in month_dir.glob("*.md"):
+            stat = filepath.stat()
+            files[filepath.name] = [stat.st_mtime_ns, stat.st_size]
+    pack_file, _ = pack_files(month, history_dir)
+    pack = None
+    if pack_file.exists():
+        stat = pack_file.stat()
+        pack = [stat.st_mtime_ns, stat.st_size]
+    return {'files': files, 'pack': pack}
+
+
+def _summary(name: str, record: Optional[Dict]) -> Optional[Dict]:
+    if not record or not record.get('date'):
+        return None
+    entry = {'name': name}
+    for key in SUMMARY_FIELDS:
+        entry[key] = record.get(key) or ''
+    entry['recurring'] = record['recurring']
+    return entry
+
+
+def build_month_index(month: str, history_dir: Path = HISTORY_DIR,
+                      index_dir: Optional[Path] = INDEX_DIR) -> Dict:
+    """
+    Baut die Zusammenfassung eines Monats (lose Dateien haben Vorrang vor dem Pack)
+
+    Returns:
+        {'version', 'month', 'signature', 'events': [...]}
+    """
+    signature = month_signature(month, history_dir)
+    events: Dict[str, Dict] = {}
+
+    if signature['pack']:
+        pack = ArchivePack(month, history_dir)
+        for name, content in iter_pack(pack.pack_file):
+            try:
+                entry = _summary(name, parse_content(content))
+            except yaml.YAMLError as e:
+                print(f"⚠️  Fehler beim Lesen von {month}{PACK_SUFFIX}:{name}: {e}")
+                continue
+            location = pack.by_name.get(name)
+            if entry and location:
+                entry.update(block=location['block'], line=location['line'])
+                events[name] = entry
+
+    for name in sorted(signature['files']):
+        filepath = history_dir / month / name
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                entry = _summary(name, parse_content(f.read()))
+        except Exception as e:
+            print(f"⚠️  Fehler beim Lesen von {filepath.name}: {e}")
+            continue
+        if entry:
+            events[name] = entry
+
+    index = {
+        'version': INDEX_VERSION,
+        'month': month,
+        'signature': signature,
+        'events': sorted(events.values(), key=lambda e: (str(e['date']), e['name']))
+    }
+    if index_dir:
+        try:
+            index_dir.mkdir(parents=True, exist_ok=True)
+            index_file = index_dir / f"{month}.json"
+            tmp_file = index_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(index, f, ensure_ascii=False, separators=(',', ':'))
+            tmp_file.replace(index_file)
+        except OSError as e:
+            print(f"⚠️  Archiv-Index {month} konnte nicht geschrieben werden: {e}")
+    return index
+
+
+def load_month_index(month: str, history_dir: Path = HISTORY_DIR,
+                     index_dir: Optional[Path] = INDEX_DIR) -> Dict:
+    """Zusammenfassung eines Monats; veraltete oder fehlende werden neu aufgebaut"""
+    index_file = index_dir / f"{month}.json" if index_dir else None
+    if index_file and index_file.exists():
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if (index.get('version') == INDEX_VERSION
+                    and index.get('signature') == month_signature(month, history_dir)):
+                return index
+        except Exception as e:
+            print(f"⚠️  Archiv-Index {month} unlesbar, baue neu: {e}")
+    return build_month_index(month, history_dir, index_dir)
+
+
+def update_months(months, history_dir: Path = HISTORY_DIR, index_dir: Path = INDEX_DIR) -> int:
+    """Baut die Zusammenfassungen der angegebenen Monate neu (nach dem Archivieren)"""
+    count = 0
+    for month in sorted(set(months)):
+        count += len(build_month_index(month, history_dir, index_dir)['events'])
+    return count
+
+
+def _location_matcher(location: str, registry=None):
+    """Location-Filter: Teilstring (normalisiert) oder gleiche Venue laut Registry"""
+    needle = normalize_text(location)
+    venue = registry.get(location) if registry is not None else None
+    canonical = normalize_text(venue['name']) if venue else None
+
+    def matches(value: str) -> bool:
+        if needle and needle in normalize_text(value):
+            return True
+        if canonical and registry is not None:
+            other = registry.get(value) if value else None
+            return bool(other) and normalize_text(other['name']) == canonical
+        return False
+
+    return matches
+
+
+def query_archive(start=None, end=None, location: Optional[str] = None,
+                  category: Optional[str] = None, text: Optional[str] = None,
+                  recurring: Optional[bool] = None, history_dir: Path = HISTORY_DIR,
+                  index_dir: Optional[Path] = INDEX_DIR, registry=None) -> List[Dict]:
+    """
+    Archivierte Events im Zeitraum, gefiltert über die Monats-Zusammenfassungen
+
+    Args:
+        start, end: Zeitraum (inklusive, YYYY-MM-DD oder date); None = offen
+        location: Teilstring oder Venue-Name/Alias (mit registry)
+        category: Kategorie (ohne Groß-/Kleinschreibung)
+        text: Teilstring im Titel
+        recurring: Nur Templates (True) bzw. nur einfache Events (False)
+
+    Returns:
+        Zusammenfassungen mit 'month' (nach Datum sortiert); volle Events über load_event()
+    """
+    start_day = parse_date(start) if start else None
+    end_day = parse_date(end) if end else None
+    match_location = _location_matcher(location, registry) if location else None
+    category_key = normalize_text(category) if category else None
+    text_key = normalize_text(text) if text else None
+
+    results = []
+    for month in months_in_range(archive_months(history_dir), start_day, end_day):
+        for entry in load_month_index(month, history_dir, index_dir)['events']:
+            try:
+                day = parse_date(entry['date'])
+            except ValueError:
+                continue
+            if (start_day and day < start_day) or (end_day and day > end_day):
+                continue
+            if category_key and normalize_text(entry['category']) != category_key:
+                continue
+            if text_key and text_key not in normalize_text(entry['title']):
+                continue
+            if recurring is not None and entry['recurring'] != recurring:
+                continue
+            if match_location and not match_location(entry['location']):
+                continue
+            results.append({**entry, 'month': month})
+    return results
+
+
+def load_event(entry: Dict, history_dir: Path = HISTORY_DIR) -> Optional[Dict]:
+    """
+    Volles Event zu einem Abfrage-Treffer (Front Matter + '_content', '_path')
+
+    '_path' ist die Datei im Monatsordner; bei gepackten Events existiert sie
+    nicht ('_packed' = True).
+    """
+    filepath = history_dir / entry['month'] / entry['name']
+    packed = not filepath.exists()
+    if packed:
+        if 'block' not in entry:
+            return None
+        content = ArchivePack(entry['month'], history_dir).read(entry)
+    else:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+    parts = content.split('---', 2)
+    if not content.startswith('---') or len(parts) < 3:
+        return None
+    data = yaml.safe_load(parts[1])
+    if not isinstance(data, dict):
+        return None
+    data['_content'] = parts[2].strip()
+    data['_path'] = filepath
+    data['_packed'] = packed
+    return data
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Archivierte Events nach Zeitraum abfragen')
+    parser.add_argument('--from', dest='start', metavar='YYYY-MM-DD', help='Ab Datum')
+    parser.add_argument('--to', dest='end', metavar='YYYY-MM-DD', help='Bis Datum')
+    parser.add_argument('--location', help='Location (Teilstring, Venue-Name oder Alias)')
+    parser.add_argument('--category', help='Kategorie, z.B. Musik')
+    parser.add_argument('--title', help='Teilstring im Titel')
+    parser.add_argument('--recurring', action='store_true', help='Nur Recurring-Templates')
+    parser.add_argument('--full', action='store_true', help='Treffer vollständig laden')
+    parser.add_argument('--rebuild', action='store_true', help='Alle Monats-Zusammenfassungen neu bauen')
+    args = parser.parse_args()
+
+    if args.rebuild:
+        months = archive_months()
+        print(f"🗂️  {update_months(months)} Events in {len(months)} Monaten indiziert")
+
+    registry = None
+    if args.location:
+        from venue_registry import get_venue_registry
+        registry = get_venue_registry()
+
+    matches = query_archive(args.start, args.end, location=args.location, category=args.category,
+                            text=args.title, recurring=True if args.recurring else None,
+                            registry=registry)
+    print(f"🔎 {len(matches)} archivierte Events")
+    for entry in matches:
+        print(f"  {entry['date']}  {entry['title']} @ {entry['location'] or '-'}"
+              f" [{entry['category'] or '-'}]")
+        if args.full:
+            event = load_event(entry)
+            if event:
+                source = 'Pack' if event['_packed'] else 'Datei'
+                print(f"      {source}: {entry['month']}/{entry['name']}, url: {event.get('url') or '-'}")
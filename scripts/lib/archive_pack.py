@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Archive Packs für krawl.ist
+Optionales Pack-Format für abgeschlossene Archiv-Monate: statt vieler
+kleiner .md-Dateien in _events/_history/YYYYMM/ liegen die Events in
+
+    _events/_history/YYYYMM.pack.jsonl.gz   Blöcke aus je 64 JSONL-Zeilen,
+                                            jeder Block ein eigenes gzip-Member
+    _events/_history/YYYYMM.pack.idx.json   Index: Block-Offsets + je Event
+                                            Name, event_hash, Datum, Titel,
+                                            Block und Zeile
+
+Jede JSONL-Zeile ist {"name": "<datei>.md", "content": "<Markdown>"}; das
+Entpacken stellt die Dateien byte-genau wieder her. Sequentiell lässt sich
+ein Pack als ein gzip-Stream lesen (iter_pack), einzelne Events über den
+Index (ArchivePack.get / by_hash) mit einem Seek und einem Block.
+
+Recurring-Templates (recurring.enabled) bleiben als .md-Datei liegen, damit
+der Expander sie weiter findet. Später archivierte Dateien eines gepackten
+Monats landen wieder als .md im Monatsordner; pack_month() führt sie beim
+nächsten Lauf mit dem Pack zusammen.
+
+Gelesen werden Packs transparent über event_corpus.load_event_corpus().
+Gepackte Events rendert Jekyll nicht mehr als eigene Seiten.
+"""
+
+import gzip
+import json
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+HISTORY_DIR = PROJECT_ROOT / "_events" / "_history"
+
+PACK_SUFFIX = ".pack.jsonl.gz"
+INDEX_SUFFIX = ".pack.idx.json"
+PACK_VERSION = 1
+BLOCK_RECORDS = 64
+
+
+def pack_files(month: str, history_dir: Path = HISTORY_DIR) -> Tuple[Path, Path]:
+    """(Pack, Index) eines Monats (YYYYMM)"""
+    return history_dir / f"{month}{PACK_SUFFIX}", history_dir / f"{month}{INDEX_SUFFIX}"
+
+
+def packed_months(history_dir: Path = HISTORY_DIR) -> List[str]:
+    """Monate mit Pack (sortiert)"""
+    if not history_dir.exists():
+        return []
+    return sorted(p.name[:-len(INDEX_SUFFIX)] for p in history_dir.glob(f"*{INDEX_SUFFIX}"))
+
+
+def _front_matter(content: str) -> Dict:
+    if not content.startswith('---'):
+        return {}
+    parts = content.split('---', 2)
+    if len(parts) < 3:
+        return {}
+    try:
+        data = yaml.safe_load(parts[1])
+    except yaml.YAMLError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_pack(month: str, entries: List[Tuple[str, str]], history_dir: Path = HISTORY_DIR) -> Dict:
+    """
+    Schreibt Pack + Index für einen Monat (atomar über .tmp-Dateien)
+
+    Args:
+        entries: [(dateiname, markdown), ...]
+
+    Returns:
+        Index-Dict
+    """
+    pack_file, index_file = pack_files(month, history_dir)
+    entries = sorted(entries)
+    blocks, events = [], []
+
+    tmp_pack = pack_file.with_name(pack_file.name + '.tmp')
+    with open(tmp_pack, 'wb') as f:
+        for block_start in range(0, len(entries), BLOCK_RECORDS):
+            block = entries[block_start:block_start + BLOCK_RECORDS]
+            lines = []
+            for line, (name, content) in enumerate(block):
+                lines.append(json.dumps({'name': name, 'content': content}, ensure_ascii=False))
+                data = _front_matter(content)
+                events.append({
+                    'name': name,
+                    'event_hash': data.get('event_hash') or '',
+                    'date': str(data.get('date') or ''),
+                    'title': data.get('title') or '',
+                    'block': len(blocks),
+                    'line': line
+                })
+            payload = gzip.compress(('\n'.join(lines) + '\n').encode('utf-8'), mtime=0)
+            blocks.append({'offset': f.tell(), 'length': len(payload)})
+            f.write(payload)
+
+    index = {'version': PACK_VERSION, 'month': month, 'blocks': blocks, 'events': events}
+    tmp_index = index_file.with_name(index_file.name + '.tmp')
+    with open(tmp_index, 'w', encoding='utf-8') as f:
+        json.dump(index, f, ensure_ascii=False, indent=1)
+    tmp_pack.replace(pack_file)
+    tmp_index.replace(index_file)
+    return index
+
+
+def iter_pack(pack_file: Path) -> Iterator[Tuple[str, str]]:
+    """Alle Events eines Packs sequentiell als (dateiname, markdown)"""
+    with gzip.open(pack_file, 'rt', encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record['name'], record['content']
+
+
+class ArchivePack:
+    """Wahlfreier Zugriff auf einen Monats-Pack über den Index"""
+
+    def __init__(self, month: str, history_dir: Path = HISTORY_DIR):
+        self.month = month
+        self.pack_file, self.index_file = pack_files(month, history_dir)
+        with open(self.index_file, 'r', encoding='utf-8') as f:
+            self.index = json.load(f)
+        self.by_name = {e['name']: e for e in self.index['events']}
+        self.hashes = {e['event_hash']: e for e in self.index['events'] if e['event_hash']}
+        self._block: Optional[Tuple[int, List[str]]] = None
+
+    def __len__(self) -> int:
+        return len(self.index['events'])
+
+    def _read_block(self, block: int) -> List[str]:
+        if self._block is None or self._block[0] != block:
+            location = self.index['blocks'][block]
+            with open(self.pack_file, 'rb') as f:
+                f.seek(location['offset'])
+                payload = gzip.decompress(f.read(location['length']))
+            # Nur an '\n' trennen: splitlines() bricht auch an U+2028/U+2029/U+0085,
+            # die json.dumps(ensure_ascii=False) unescaped im Inhalt stehen lässt
+            self._block = (block, payload.decode('utf-8').split('\n'))
+        return self._block[1]
+
+    def read(self, entry: Dict) -> str:
+        """Markdown eines Index-Eintrags"""
+        return json.loads(self._read_block(entry['block'])[entry['line']])['content']
+
+    def get(self, name: str) -> Optional[str]:
+        entry = self.by_name.get(name)
+        return self.read(entry) if entry else None
+
+    def by_hash(self, event_hash: str) -> Optional[str]:
+        entry = self.hashes.get(event_hash)
+        return self.read(entry) if entry else None
+
+
+def find_by_hash(event_hash: str, history_dir: Path = HISTORY_DIR) -> Optional[Tuple[str, str, str]]:
+    """Sucht ein Event in allen Packs → (Monat, Dateiname, Markdown)"""
+    for month in packed_months(history_dir):
+        pack = ArchivePack(month, history_dir)
+        entry = pack.hashes.get(event_hash)
+        if entry:
+            return month, entry['name'], pack.read(entry)
+    return None
+
+
+def closed_months(history_dir: Path = HISTORY_DIR, today: Optional[date] = None) -> List[str]:
+    """Monatsordner vor dem aktuellen Monat (dort wird regulär nichts mehr archiviert)"""
+    current = (today or date.today()).strftime('%Y%m')
+    if not history_dir.exists():
+        return []
+    return sorted(d.name for d in history_dir.iterdir()
+                  if d.is_dir() and d.name.isdigit() and len(d.name) == 6 and d.name < current)
+
+
+def pack_month(month: str, history_dir: Path = HISTORY_DIR, dry_run: bool = False) -> Dict[str, int]:
+    """
+    Packt einen Monatsordner (bestehender Pack + lose .md-Dateien)
+
+    Recurring-Templates bleiben als Datei liegen; lose Dateien ersetzen
+    gleichnamige Einträge im Pack. Danach werden die gepackten Dateien
+    gelöscht (leerer Ordner ebenfalls).
+    """
+    month_dir = history_dir / month
+    pack_file, index_file = pack_files(month, history_dir)
+
+    entries: Dict[str, str] = {}
+    if index_file.exists():
+        entries.update(iter_pack(pack_file))
+
+    loose = []
+    templates = 0
+    for filepath in sorted(month_dir.glob("*.md")) if month_dir.exists() else []:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+        recurring = _front_matter(content).get('recurring')
+        if isinstance(recurring, dict) and recurring.get('enabled'):
+            templates += 1
+            continue
+        entries[filepath.name] = content
+        loose.append(filepath)
+
+    stats = {'packed': len(entries), 'added': len(loose), 'templates': templates}
+    if dry_run or not loose:
+        return stats
+
+    write_pack(month, list(entries.items()), history_dir)
+    for filepath in loose:
+        filepath.unlink()
+    if month_dir.exists() and not any(month_dir.iterdir()):
+        month_dir.rmdir()
+    return stats
+
+
+def unpack_month(month: str, history_dir: Path = HISTORY_DIR) -> int:
+    """Stellt die .md-Dateien eines Packs wieder her und löscht den Pack"""
+    pack_file, index_file = pack_files(month, history_dir)
+    month_dir = history_dir / month
+    month_dir.mkdir(parents=True, exist_ok=True)
+    count = 0
+    for name, content in iter_pack(pack_file):
+        target = month_dir / name
+        if not target.exists():  # lose Dateien sind neuer als der Pack
+            with open(target, 'w', encoding='utf-8') as f:
+                f.write(content)
+        count += 1
+    pack_file.unlink()
+    index_file.unlink()
+    return count
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Archiv-Monate packen/entpacken')
+    parser.add_argument('--pack', nargs='*', metavar='YYYYMM',
+                        help='Monate packen (ohne Angabe: alle abgeschlossenen Monate)')
+    parser.add_argument('--unpack', nargs='+', metavar='YYYYMM', help='Monate entpacken')
+    parser.add_argument('--get', metavar='EVENT_HASH', help='Event per event_hash aus den Packs lesen')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args()
+
+    if args.pack is not None:
+        for month in args.pack or closed_months():
+            stats = pack_month(month, dry_run=args.dry_run)
+            print(f"📦 {month}: {stats['added']} Dateien → Pack ({stats['packed']} Events), "
+                  f"{stats['templates']} Templates bleiben als Datei")
+    elif args.unpack:
+        for month in args.unpack:
+            print(f"📂 {month}: {unpack_month(month)} Dateien wiederhergestellt")
+    elif args.get:
+        found = find_by_hash(args.get)
+        if found:
+            print(f"# {found[0]}/{found[1]}\n{found[2]}")
+        else:
+            print(f"❌ {args.get} in keinem Pack gefunden")
+    else:
+        for month in packed_months():
+            pack = ArchivePack(month)
+            size = pack.pack_file.stat().st_size
+            print(f"📦 {month}: {len(pack)} Events, {size / 1024:.1f} KB in {len(pack.index['blocks'])} Blöcken")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Compiled Cache für krawl.ist
+Speichert aus Quelldateien (CSV/JSON) abgeleitete Daten als ein JSON-Artefakt
+unter .cache/ und baut es automatisch neu, sobald sich eine Quelle ändert.
+"""
+
+import json
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Iterable, List, Tuple, Union
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+CACHE_DIR = PROJECT_ROOT / ".cache"
+
+
+def expand_sources(sources: Iterable[Union[Path, Tuple[Path, str]]]) -> List[Path]:
+    """
+    Löst Verzeichnisse in ihre Dateien auf (sortiert)
+
+    Ein Verzeichnis steht für seine *.json-Dateien; (Verzeichnis, Muster)
+    wählt andere Dateien, z.B. (EVENTS_DIR, "*.md").
+    """
+    files = []
+    for source in sources:
+        pattern = "*.json"
+        if isinstance(source, tuple):
+            source, pattern = source
+        source = Path(source)
+        if source.is_dir():
+            files.extend(sorted(source.glob(pattern)))
+        else:
+            files.append(source)
+    return files
+
+
+def source_fingerprint(sources: Iterable[Path]) -> str:
+    """
+    Fingerprint über Pfad, Größe und mtime aller Quellen
+
+    Neue, gelöschte oder geänderte Dateien ändern den Fingerprint.
+    """
+    digest = hashlib.sha256()
+    for path in expand_sources(sources):
+        try:
+            stat = path.stat()
+            digest.update(f"{path}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+        except FileNotFoundError:
+            digest.update(f"{path}:missing\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def load_compiled(name: str, sources: Iterable[Path], builder: Callable[[], Any],
+                  version: int = 1, cache_dir: Path = CACHE_DIR) -> Any:
+    """
+    Lädt ein kompiliertes Artefakt oder baut es neu
+
+    Args:
+        name: Artefakt-Name (→ .cache/<name>.json)
+        sources: Quelldateien/-verzeichnisse, aus denen gebaut wird
+        builder: Funktion, die das JSON-serialisierbare Artefakt erzeugt
+        version: Format-Version (Erhöhen erzwingt Neubau)
+
+    Returns:
+        Das (ggf. neu gebaute) Artefakt
+    """
+    sources = list(sources)
+    cache_file = cache_dir / f"{name}.json"
+    fingerprint = source_fingerprint(sources)
+
+    if cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == version and cached.get('fingerprint') == fingerprint:
+                return cached['payload']
+        except Exception as e:
+            print(f"⚠️  Cache {cache_file.name} unlesbar, baue neu: {e}")
+
+    payload = builder()
+
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix('.json.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({
+                'name': name,
+                'version': version,
+                'fingerprint': fingerprint,
+                'built_at': datetime.now().isoformat(),
+                'payload': payload
+            }, f, ensure_ascii=False)
+        tmp_file.replace(cache_file)
+    except OSError as e:
+        print(f"⚠️  Cache {cache_file.name} konnte nicht geschrieben werden: {e}")
+
+    return payload
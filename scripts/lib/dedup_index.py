@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Cross-Store Dedup Index für krawl.ist
+Indexiert Markdown-Events (_events/), Staging-JSON (_data/staging/) und
+Produktiv-Daten (_data/events/, Monats-Shards) unter einem gemeinsamen Schlüssel.
+
+Eine Abfrage liefert exakte Treffer (Schlüssel oder Hash) und
+Fuzzy-Treffer (gleiches Datum, ähnlicher Titel/Ort) über alle Stores.
+"""
+
+import re
+from collections import defaultdict
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import yaml
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+EVENTS_DIR = PROJECT_ROOT / "_events"
+STAGING_DIR = PROJECT_ROOT / "_data" / "staging"
+
+STORE_MARKDOWN = "markdown"
+STORE_STAGING = "staging"
+STORE_PRODUCTION = "production"
+ALL_STORES = (STORE_MARKDOWN, STORE_STAGING, STORE_PRODUCTION)
+
+
+def normalize_text(text: Any) -> str:
+    """Normalisiert Text für Vergleiche (Kleinschreibung, ohne Sonderzeichen)"""
+    if not text:
+        return ""
+    text = str(text).lower()
+    text = re.sub(r'[^\w\s]', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def normalize_time(time: Any) -> str:
+    """Uhrzeit als HH:MM ("20:00:00" → "20:00", leer bleibt leer)"""
+    return str(time or '').strip()[:5]
+
+
+def dedup_key(date: Any, title: Any, location: Any, start_time: Any = "") -> str:
+    """
+    Gemeinsamer Dedup-Schlüssel für alle Stores
+
+    Die Uhrzeit gehört dazu (wie im event_hash des Scrapers): Nachmittags-
+    und Abendvorstellung am selben Tag und Ort sind verschiedene Events.
+
+    Beispiel:
+        ("2025-11-25", "Jazz-Night", "Freiheitshalle Hof", "20:00")
+        → "2025-11-25|20:00|jazznight|freiheitshalle hof"
+    """
+    return f"{date or ''}|{normalize_time(start_time)}|{normalize_text(title)}|{normalize_text(location)}"
+
+
+@dataclass
+class IndexedEvent:
+    """Ein Event-Eintrag im Index (Store-unabhängig)"""
+    store: str
+    ref: str  # Dateipfad oder Event-ID
+    title: str
+    date: str
+    start_time: str = ""
+    location: str = ""
+    hashes: Set[str] = field(default_factory=set)
+    payload: Any = None  # Original-Objekt (Front-Matter-Dict oder Event)
+    title_norm: str = ""
+    location_norm: str = ""
+
+    def __post_init__(self):
+        self.title_norm = normalize_text(self.title)
+        self.location_norm = normalize_text(self.location)
+
+    @property
+    def key(self) -> str:
+        return dedup_key(self.date, self.title, self.location, self.start_time)
+
+
+@dataclass
+class DedupResult:
+    """Ergebnis einer Index-Abfrage"""
+    exact: List[IndexedEvent] = field(default_factory=list)
+    fuzzy: List[Tuple[IndexedEvent, float]] = field(default_factory=list)
+
+    @property
+    def is_duplicate(self) -> bool:
+        return bool(self.exact)
+
+    def best(self) -> Optional[Tuple[IndexedEvent, float]]:
+        """Bester Treffer (exakt vor fuzzy)"""
+        if self.exact:
+            return self.exact[0], 1.0
+        if self.fuzzy:
+            return self.fuzzy[0]
+        return None
+
+
+class DedupIndex:
+    """
+    Gemeinsamer Duplikat-Index über Markdown, Staging und Produktiv-Shards
+
+    Exakte Treffer laufen über Dicts (O(1)), Fuzzy-Treffer werden nur
+    innerhalb des Datums-Buckets bewertet (gleiches Datum ist Pflicht).
+    """
+
+    def __init__(self):
+        self.records: List[IndexedEvent] = []
+        self.by_key: Dict[str, List[IndexedEvent]] = defaultdict(list)
+        self.by_hash: Dict[str, List[IndexedEvent]] = defaultdict(list)
+        self.by_date: Dict[str, List[IndexedEvent]] = defaultdict(list)
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    # ============================================================
+    # Aufbau
+    # ============================================================
+
+    def add(self, record: IndexedEvent) -> IndexedEvent:
+        """Fügt einen Eintrag hinzu und pflegt alle Teil-Indizes"""
+        self.records.append(record)
+        self.by_key[record.key].append(record)
+        self.by_date[record.date].append(record)
+        for h in record.hashes:
+            self.by_hash[h].append(record)
+        return record
+
+    def add_front_matter(self, data: Dict, store: str = STORE_MARKDOWN,
+                         ref: str = "") -> IndexedEvent:
+        """Indexiert ein Event im Markdown-/Scraper-Format (location, event_hash)"""
+        hashes = {data['event_hash']} if data.get('event_hash') else set()
+        return self.add(IndexedEvent(
+            store=store,
+            ref=ref,
+            title=data.get('title', '') or '',
+            date=str(data.get('date', '') or ''),
+            start_time=str(data.get('start_time', '') or ''),
+            location=data.get('location', '') or '',
+            hashes=hashes,
+            payload=data
+        ))
+
+    def add_schema_event(self, event: Any, store: str = STORE_PRODUCTION) -> IndexedEvent:
+        """Indexiert ein Event im JSON-Schema-Format (schemas.Event oder dict)"""
+        data = event if isinstance(event, dict) else event.to_dict()
+        place = data.get('place') or {}
+        meta = data.get('meta') or {}
+        hashes = {h for h in (data.get('id'), meta.get('hash')) if h}
+        return self.add(IndexedEvent(
+            store=store,
+            ref=data.get('id') or '',
+            title=data.get('title', '') or '',
+            date=str(data.get('date', '') or ''),
+            start_time=data.get('start_time', '') or '',
+            location=place.get('name', '') if isinstance(place, dict) else str(place),
+            hashes=hashes,
+            payload=event
+        ))
+
+    def load_markdown(self, events_dir: Path = EVENTS_DIR) -> int:
+        """Indexiert alle Markdown-Events (Front Matter)"""
+        count = 0
+        if not events_dir.exists():
+            return count
+        for filepath in events_dir.glob("*.md"):
+            try:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    content = f.read()
+                if not content.startswith('---'):
+                    continue
+                parts = content.split('---', 2)
+                if len(parts) < 3:
+                    continue
+                data = yaml.safe_load(parts[1])
+                if isinstance(data, dict):
+                    self.add_front_matter(data, STORE_MARKDOWN, str(filepath))
+                    count += 1
+            except Exception as e:
+                print(f"⚠️  Fehler beim Indexieren von {filepath.name}: {e}")
+        return count
+
+    def load_staging(self, staging_dir: Path = STAGING_DIR) -> int:
+        """Indexiert alle Staging-Files (events-*.json)"""
+        count = 0
+        if not staging_dir.exists():
+            return count
+        from json_stream import iter_array
+        for filepath in sorted(staging_dir.glob("events-*.json")):
+            try:
+                for event in iter_array(filepath):
+                    self.add_schema_event(event, STORE_STAGING)
+                    count += 1
+            except Exception as e:
+                print(f"⚠️  Fehler beim Indexieren von {filepath.name}: {e}")
+        return count
+
+    def load_production(self, events: Optional[Iterable[Any]] = None,
+                        start=None, end=None) -> int:
+        """Indexiert Produktiv-Events (aus Liste oder den Shards in _data/events/, optional nur start–end)"""
+        if events is None:
+            try:
+                from event_store import EventStore
+                events = list(EventStore().iter_raw(start, end))
+            except Exception as e:
+                print(f"⚠️  Fehler beim Indexieren der Produktiv-Events: {e}")
+                events = []
+        count = 0
+        for event in events:
+            self.add_schema_event(event, STORE_PRODUCTION)
+            count += 1
+        return count
+
+    @classmethod
+    def from_stores(cls, stores: Iterable[str] = ALL_STORES) -> 'DedupIndex':
+        """Baut den Index aus den angegebenen Stores auf"""
+        index = cls()
+        stores = set(stores)
+        if STORE_MARKDOWN in stores:
+            index.load_markdown()
+        if STORE_STAGING in stores:
+            index.load_staging()
+        if STORE_PRODUCTION in stores:
+            index.load_production()
+        return index
+
+    # ============================================================
+    # Abfragen
+    # ============================================================
+
+    def query(self, title: str, date: Any, location: str = "",
+              start_time: str = "", event_hashes: Iterable[str] = (),
+              threshold: float = 0.75,
+              stores: Optional[Iterable[str]] = None) -> DedupResult:
+        """
+        Sucht exakte und Fuzzy-Duplikate in einem Durchlauf
+
+        Args:
+            title, date, location, start_time: Event-Daten des Kandidaten
+            event_hashes: Bekannte Hashes/IDs des Kandidaten
+            threshold: Mindest-Ähnlichkeit für Fuzzy-Treffer
+            stores: Nur diese Stores berücksichtigen (default: alle)
+
+        Returns:
+            DedupResult mit exakten Treffern und (Eintrag, Score)-Paaren
+        """
+        allowed = set(stores) if stores is not None else None
+        date = str(date or '')
+        title_norm = normalize_text(title)
+        location_norm = normalize_text(location)
+
+        exact: List[IndexedEvent] = []
+        seen: Set[int] = set()
+
+        def take(record: IndexedEvent):
+            if allowed is not None and record.store not in allowed:
+                return
+            if id(record) not in seen:
+                seen.add(id(record))
+                exact.append(record)
+
+        for h in event_hashes:
+            if h:
+                for record in self.by_hash.get(h, ()):
+                    take(record)
+        for record in self.by_key.get(dedup_key(date, title, location, start_time), ()):
+            take(record)
+
+        fuzzy: List[Tuple[IndexedEvent, float]] = []
+        for record in self.by_date.get(date, ()):
+            if id(record) in seen:
+                continue
+            if allowed is not None and record.store not in allowed:
+                continue
+            score = self.score(title_norm, location_norm, record)
+            if score >= threshold:
+                fuzzy.append((record, score))
+
+        fuzzy.sort(key=lambda x: x[1], reverse=True)
+        return DedupResult(exact=exact, fuzzy=fuzzy)
+
+    def query_event(self, event: Any, threshold: float = 0.75,
+                    stores: Optional[Iterable[str]] = None) -> DedupResult:
+        """Wie query(), akzeptiert aber schemas.Event oder Front-Matter-Dicts"""
+        if isinstance(event, dict) and 'location' in event:
+            return self.query(
+                event.get('title', ''), event.get('date', ''),
+                event.get('location', ''), event.get('start_time', ''),
+                [event.get('event_hash')], threshold, stores
+            )
+        data = event if isinstance(event, dict) else event.to_dict()
+        place = data.get('place') or {}
+        meta = data.get('meta') or {}
+        return self.query(
+            data.get('title', ''), data.get('date', ''),
+            place.get('name', '') if isinstance(place, dict) else str(place),
+            data.get('start_time', ''),
+            [data.get('id'), meta.get('hash')], threshold, stores
+        )
+
+    @staticmethod
+    def score(title_norm: str, location_norm: str, record: IndexedEvent) -> float:
+        """Gewichtete Ähnlichkeit (Titel 70%, Ort 30%) wie im Reviewer"""
+        title_sim = SequenceMatcher(None, title_norm, record.title_norm).ratio()
+        place_sim = 0.0
+        if location_norm and record.location_norm:
+            place_sim = SequenceMatcher(None, location_norm, record.location_norm).ratio()
+        return (title_sim * 0.7) + (place_sim * 0.3)
+
+    def stats(self) -> Dict[str, int]:
+        """Anzahl indexierter Events pro Store"""
+        counts = {store: 0 for store in ALL_STORES}
+        for record in self.records:
+            counts[record.store] = counts.get(record.store, 0) + 1
+        return counts
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    index = DedupIndex.from_stores()
+    print("📚 Dedup-Index aufgebaut:")
+    for store, count in index.stats().items():
+        print(f"  {store}: {count} Events")
+
+    result = index.query("Jazz-Night in der Freiheitshalle", "2025-11-25", "Freiheitshalle Hof")
+    print(f"\nExakte Treffer: {len(result.exact)}")
+    print(f"Fuzzy-Treffer: {len(result.fuzzy)}")
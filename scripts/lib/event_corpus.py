@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Event Corpus für krawl.ist
+Front Matter aller Events aus _events/ und dem gesamten Archiv
+(_events/_history/YYYYMM/) als ein gemeinsames, geparstes Korpus.
+
+Das Korpus liegt unter .cache/event_corpus.json und wird inkrementell
+gepflegt: je Datei Pfad, mtime und Größe - geparst werden nur neue oder
+geänderte Dateien, gelöschte fallen heraus. Analysen über die komplette
+Historie (z.B. recurring_discovery) lesen damit nicht jedes Mal tausende
+Markdown-Dateien.
+
+Gepackte Monate (archive_pack, _history/YYYYMM.pack.jsonl.gz) werden
+transparent mitgelesen: ihre Events erscheinen unter demselben Pfad wie vor
+dem Packen (_events/_history/YYYYMM/<datei>.md), neu geparst wird ein Pack
+nur, wenn er sich geändert hat - und dann sequentiell in einem Stream.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+import yaml
+
+from archive_pack import PACK_SUFFIX, iter_pack
+from compiled_cache import CACHE_DIR
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+EVENTS_DIR = PROJECT_ROOT / "_events"
+HISTORY_DIR = EVENTS_DIR / "_history"
+CORPUS_FILE = CACHE_DIR / "event_corpus.json"
+
+CORPUS_VERSION = 3
+
+# Felder, die ins Korpus übernommen werden (Beschreibungen etc. bleiben draußen)
+CORPUS_FIELDS = ['title', 'date', 'start_time', 'end_time', 'location', 'address',
+                 'coordinates', 'category', 'status', 'event_hash', 'recurring_parent', 'source']
+
+
+def corpus_files(events_dir: Path = EVENTS_DIR, history_dir: Path = HISTORY_DIR) -> List[Path]:
+    """Alle Event-Dateien: _events/*.md, dann _history/*/*.md"""
+    files = sorted(events_dir.glob("*.md")) if events_dir.exists() else []
+    if history_dir.exists():
+        files.extend(sorted(history_dir.glob("*/*.md")))
+    return files
+
+
+def pack_files(history_dir: Path = HISTORY_DIR) -> List[Path]:
+    """Monats-Packs in _history/ (sortiert)"""
+    return sorted(history_dir.glob(f"*{PACK_SUFFIX}")) if history_dir.exists() else []
+
+
+def parse_record(filepath: Path) -> Optional[Dict]:
+    """Korpus-Eintrag aus dem Front Matter einer Datei (None ohne Front Matter)"""
+    try:
+        with open(filepath, 'r', encoding='utf-8') as f:
+            return parse_content(f.read())
+    except Exception as e:
+        print(f"⚠️  Fehler beim Lesen von {filepath.name}: {e}")
+        return None
+
+
+def parse_content(content: str) -> Optional[Dict]:
+    """Korpus-Eintrag aus Markdown mit Front Matter (None ohne Front Matter)"""
+    if not content.startswith('---'):
+        return None
+    parts = content.split('---', 2)
+    if len(parts) < 3:
+        return None
+    data = yaml.safe_load(parts[1])
+    if not isinstance(data, dict):
+        return None
+
+    record = {}
+    for key in CORPUS_FIELDS:
+        value = data.get(key)
+        if value not in (None, ''):
+            record[key] = str(value) if key == 'date' else value
+    recurring = data.get('recurring')
+    record['recurring'] = bool(isinstance(recurring, dict) and recurring.get('enabled'))
+    return record
+
+
+class EventCorpus:
+    """Geparste Events (Pfad relativ zum Projekt → Eintrag)"""
+
+    def __init__(self, records: Dict[str, Dict], changed: Optional[Set[str]] = None,
+                 removed: Optional[Set[str]] = None):
+        self.records = records
+        self.changed = changed or set()
+        self.removed = removed or set()
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __iter__(self) -> Iterator[Dict]:
+        """Einträge mit '_path'"""
+        for path, record in self.records.items():
+            yield {**record, '_path': path}
+
+
+def _relative(filepath: Path) -> str:
+    try:
+        return str(filepath.relative_to(PROJECT_ROOT))
+    except ValueError:
+        return str(filepath)
+
+
+def load_event_corpus(cache_file: Path = CORPUS_FILE, events_dir: Path = EVENTS_DIR,
+                      history_dir: Path = HISTORY_DIR) -> EventCorpus:
+    """
+    Lädt das Korpus und bringt es auf den Stand der Dateien
+
+    Returns:
+        EventCorpus; changed/removed enthalten die Pfade, die sich seit dem
+        letzten Lauf geändert haben bzw. verschwunden sind
+    """
+    previous: Dict[str, Dict] = {}
+    previous_packs: Dict[str, Dict] = {}
+    if cache_file and cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                cached = json.load(f)
+            if cached.get('version') == CORPUS_VERSION:
+                previous = cached.get('files', {})
+                previous_packs = cached.get('packs', {})
+        except Exception as e:
+            print(f"⚠️  Korpus {cache_file.name} unlesbar, baue neu: {e}")
+
+    files: Dict[str, Dict] = {}
+    changed: Set[str] = set()
+    for filepath in corpus_files(events_dir, history_dir):
+        path = _relative(filepath)
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
+            continue
+        entry = previous.get(path)
+        if entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size:
+            files[path] = entry
+            continue
+        files[path] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                       'record': parse_record(filepath)}
+        changed.add(path)
+
+    # Packs: Events unter ihrem ursprünglichen Pfad, lose Dateien haben Vorrang
+    packs: Dict[str, Dict] = {}
+    packed: Dict[str, Dict] = {}
+    for pack_file in pack_files(history_dir):
+        pack_path = _relative(pack_file)
+        stat = pack_file.stat()
+        entry = previous_packs.get(pack_path)
+        if not (entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size):
+            month_dir = pack_file.parent / pack_file.name[:-len(PACK_SUFFIX)]
+            records = {}
+            for name, content in iter_pack(pack_file):
+                try:
+                    records[_relative(month_dir / name)] = parse_content(content)
+                except Exception as e:
+                    print(f"⚠️  Fehler beim Lesen von {pack_file.name}:{name}: {e}")
+            entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'records': records}
+            changed.update(records)
+        packs[pack_path] = entry
+        for path, record in entry['records'].items():
+            if path not in files:
+                packed[path] = record
+
+    previous_paths = set(previous)
+    for entry in previous_packs.values():
+        previous_paths.update(entry['records'])
+    removed = previous_paths - set(files) - set(packed)
+    if cache_file and (changed or removed or packs.keys() != previous_packs.keys()
+                       or not cache_file.exists()):
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': CORPUS_VERSION, 'files': files, 'packs': packs}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+            tmp_file.replace(cache_file)
+        except OSError as e:
+            print(f"⚠️  Korpus konnte nicht geschrieben werden: {e}")
+
+    records = {path: entry['record'] for path, entry in files.items() if entry['record']}
+    records.update((path, record) for path, record in packed.items() if record)
+    return EventCorpus(records, changed, removed)
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    corpus = load_event_corpus()
+    archived = sum(1 for path in corpus.records if '/_history/' in f"/{path}")
+    print(f"📚 {len(corpus)} Events im Korpus ({archived} archiviert), "
+          f"{len(corpus.changed)} neu geparst, {len(corpus.removed)} entfernt")
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""
+Event Store für krawl.ist
+Produktiv-Events des JSON-Workflows als Monats-Shards statt einer großen
+_data/events.json:
+
+    _data/events/YYYY-MM.json     {"month": "YYYY-MM", "events": [...]}
+    _data/events/manifest.json    Kopf (version, schema, generator, meta) und
+                                  je Shard Anzahl, erstes/letztes Datum, SHA256
+
+- Lesen: nur die Shards im gewünschten Zeitraum (load, iter_raw)
+- Schreiben: nur geänderte Shards, danach das Manifest (jeweils tmp + replace,
+  deterministisch: ohne Zeitstempel, mit abschließendem Zeilenumbruch)
+- Jekyll: site.data.events ist ein Hash Monat → Shard; die kombinierte
+  Ansicht ist eine Schleife über alle Shards außer "manifest"
+- Eine alte _data/events.json wird beim ersten save() übernommen und entfernt
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set
+
+from json_stream import iter_array
+from schemas import Event, EventCollection
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+EVENTS_DATA_DIR = PROJECT_ROOT / "_data" / "events"
+LEGACY_EVENTS_JSON = PROJECT_ROOT / "_data" / "events.json"
+MANIFEST_NAME = "manifest.json"
+
+MONTH_PATTERN = re.compile(r'^\d{4}-\d{2}$')
+UNDATED = "undated"
+
+
+def shard_key(date) -> str:
+    """Shard eines Datums: 'YYYY-MM' (ohne gültiges Datum: 'undated')"""
+    month = str(date or '')[:7]
+    return month if MONTH_PATTERN.match(month) else UNDATED
+
+
+def _event_sort_key(event: Event):
+    return (event.date or '', event.start_time or "00:00")
+
+
+class EventStore:
+    """Monats-Shards mit Manifest; Shards werden erst bei Bedarf geladen"""
+
+    def __init__(self, data_dir: Path = EVENTS_DATA_DIR, legacy_file: Optional[Path] = LEGACY_EVENTS_JSON):
+        self.data_dir = data_dir
+        self.manifest_file = data_dir / MANIFEST_NAME
+        self.legacy_file = legacy_file
+        self.shards: Dict[str, EventCollection] = {}
+        self.dirty: Set[str] = set()
+        self.locations: Optional[Dict[str, str]] = None
+        self.migrated = False
+        self.manifest = self._load_manifest()
+
+    # ============================================================
+    # Manifest + Shards
+    # ============================================================
+
+    def _load_manifest(self) -> Dict:
+        if self.manifest_file.exists():
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        header = EventCollection(events=[])
+        manifest = {
+            'version': header.version,
+            'schema': header.schema,
+            'generated_at': header.generated_at,
+            'generator': header.generator,
+            'meta': {},
+            'shards': {}
+        }
+        if self.legacy_file and self.legacy_file.exists():
+            with open(self.legacy_file, 'r', encoding='utf-8') as f:
+                legacy = EventCollection.from_dict(json.load(f))
+            manifest.update(version=legacy.version, schema=legacy.schema,
+                            generated_at=legacy.generated_at, generator=legacy.generator,
+                            meta=legacy.meta)
+            for event in legacy.events:
+                self.shard(shard_key(event.date)).add_event(event)
+            self.dirty.update(self.shards)
+            self.migrated = True
+        return manifest
+
+    def shard_file(self, month: str) -> Path:
+        return self.data_dir / f"{month}.json"
+
+    def months(self, start=None, end=None) -> List[str]:
+        """Vorhandene Shards im Zeitraum (start/end: Datum oder 'YYYY-MM'; 'undated' nur ohne Grenzen)"""
+        months = set(self.manifest['shards']) | set(self.shards)
+        first = str(start)[:7] if start else None
+        last = str(end)[:7] if end else None
+        if first or last:
+            months = {m for m in months if m != UNDATED
+                      and (not first or m >= first) and (not last or m <= last)}
+        return sorted(months)
+
+    def shard(self, month: str) -> EventCollection:
+        """Shard eines Monats (wird beim ersten Zugriff geladen, sonst leer angelegt)"""
+        collection = self.shards.get(month)
+        if collection is None:
+            events = []
+            shard_file = self.shard_file(month)
+            if shard_file.exists():
+                events = [Event.from_dict(e) for e in iter_array(shard_file)]
+            collection = EventCollection(events=events)
+            self.shards[month] = collection
+        return collection
+
+    # ============================================================
+    # Lesen
+    # ============================================================
+
+    def load(self, start=None, end=None) -> EventCollection:
+        """
+        Kombinierte Ansicht über die Shards im Zeitraum
+
+        Die Events sind dieselben Objekte wie in den Shards; Änderungen
+        laufen über add_event/upsert/remove, damit der Shard neu geschrieben wird.
+        """
+        events = []
+        for month in self.months(start, end):
+            events.extend(self.shard(month).events)
+        return EventCollection(
+            version=self.manifest['version'],
+            schema=self.manifest['schema'],
+            generated_at=self.manifest['generated_at'],
+            generator=self.manifest['generator'],
+            meta=dict(self.manifest.get('meta', {})),
+            events=events
+        )
+
+    def iter_raw(self, start=None, end=None) -> Iterator[Dict]:
+        """Events im Zeitraum als JSON-Dicts (ohne Event-Objekte zu bauen)"""
+        for month in self.months(start, end):
+            if month in self.shards:
+                for event in self.shards[month].events:
+                    yield event.to_dict()
+                continue
+            shard_file = self.shard_file(month)
+            if shard_file.exists():
+                yield from iter_array(shard_file)
+
+    def total(self) -> int:
+        """Anzahl aller Events (geänderte Shards gezählt, übrige laut Manifest)"""
+        total = 0
+        for month in self.months():
+            if month in self.dirty:
+                total += len(self.shards[month].events)
+            else:
+                total += self.manifest['shards'].get(month, {}).get('count', 0)
+        return total
+
+    def locate(self, event_id: str) -> Optional[str]:
+        """
+        Monat des Shards, der die ID enthält (None wenn unbekannt)
+
+        Die Zuordnung ID → Monat wird beim ersten Aufruf einmal aufgebaut
+        (nicht geladene Shards werden nur gestreamt) und danach von
+        add_event/upsert/remove mitgeführt.
+        """
+        if self.locations is None:
+            self.locations = {}
+            for month in self.months():
+                if month in self.shards:
+                    ids = [event.id for event in self.shards[month].events]
+                elif self.shard_file(month).exists():
+                    ids = [event.get('id') for event in iter_array(self.shard_file(month))]
+                else:
+                    ids = []
+                for known_id in ids:
+                    self.locations.setdefault(known_id, month)
+        return self.locations.get(event_id)
+
+    def verify(self) -> List[str]:
+        """Shards, deren Datei fehlt oder nicht zur Prüfsumme im Manifest passt"""
+        broken = []
+        for month, entry in sorted(self.manifest['shards'].items()):
+            shard_file = self.shard_file(month)
+            if not shard_file.exists() or hashlib.sha256(shard_file.read_bytes()).hexdigest() != entry['sha256']:
+                broken.append(month)
+        return broken
+
+    # ============================================================
+    # Schreiben
+    # ============================================================
+
+    def add_event(self, event: Event) -> bool:
+        """Fügt ein Event seinem Monats-Shard hinzu (False bei gleicher ID)"""
+        month = shard_key(event.date)
+        if not self.shard(month).add_event(event):
+            return False
+        self.dirty.add(month)
+        if self.locations is not None:
+            self.locations.setdefault(event.id, month)
+        return True
+
+    def upsert(self, event: Event) -> bool:
+        """
+        Ersetzt bzw. fügt hinzu (True wenn neu)
+
+        Liegt die ID bisher in einem anderen Monat (Datum verschoben), wird
+        die alte Kopie aus ihrem Shard entfernt und dieser neu geschrieben.
+        """
+        month = shard_key(event.date)
+        collection = self.shard(month)
+        moved = False
+        if event.id not in collection:
+            previous_month = self.locate(event.id)
+            if previous_month is not None and previous_month != month:
+                moved = self.shard(previous_month).remove(event.id) is not None
+                if moved:
+                    self.dirty.add(previous_month)
+        self.dirty.add(month)
+        if self.locations is not None:
+            self.locations[event.id] = month
+        return collection.upsert(event) and not moved
+
+    def remove(self, event: Event) -> Optional[Event]:
+        """Entfernt ein Event aus seinem Monats-Shard"""
+        month = shard_key(event.date)
+        removed = self.shard(month).remove(event.id)
+        if removed is not None:
+            self.dirty.add(month)
+            if self.locations is not None and self.locations.get(event.id) == month:
+                del self.locations[event.id]
+        return removed
+
+    def _write(self, path: Path, data: Dict) -> bytes:
+        payload = (json.dumps(data, ensure_ascii=False, indent=2) + '\n').encode('utf-8')
+        tmp_file = path.with_suffix('.json.tmp')
+        tmp_file.write_bytes(payload)
+        tmp_file.replace(path)
+        return payload
+
+    def save(self) -> List[str]:
+        """
+        Schreibt die geänderten Shards und das Manifest
+
+        Returns:
+            Geschriebene (bzw. geleert entfernte) Monate
+        """
+        written = sorted(self.dirty)
+        if not written and not self.migrated:
+            return []
+
+        self.data_dir.mkdir(parents=True, exist_ok=True)
+        for month in written:
+            collection = self.shards[month]
+            shard_file = self.shard_file(month)
+            if not collection.events:
+                shard_file.unlink(missing_ok=True)
+                self.manifest['shards'].pop(month, None)
+                continue
+            collection.sort(key=_event_sort_key)
+            payload = self._write(shard_file, {
+                'month': month,
+                'events': [event.to_dict() for event in collection.events]
+            })
+            self.manifest['shards'][month] = {
+                'count': len(collection.events),
+                'first': collection.events[0].date,
+                'last': collection.events[-1].date,
+                'sha256': hashlib.sha256(payload).hexdigest()
+            }
+        self.dirty.clear()
+
+        # Manifest nur aus den Daten ableiten (kein Laufzeit-Zeitstempel):
+        # gleiche Shards ergeben byte-gleiches Manifest, Änderungen stehen in git
+        self.manifest['shards'] = dict(sorted(self.manifest['shards'].items()))
+        meta = {key: value for key, value in self.manifest.get('meta', {}).items()
+                if key != 'last_updated'}
+        self.manifest['meta'] = {**meta, 'total_events': self.total()}
+        self._write(self.manifest_file, self.manifest)
+
+        if self.migrated and self.legacy_file and self.legacy_file.exists():
+            self.legacy_file.unlink()
+        self.migrated = False
+        return written
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Produktiv-Events (Monats-Shards)')
+    parser.add_argument('--from', dest='start', metavar='YYYY-MM[-DD]')
+    parser.add_argument('--to', dest='end', metavar='YYYY-MM[-DD]')
+    parser.add_argument('--migrate', action='store_true',
+                        help='_data/events.json in Monats-Shards überführen')
+    parser.add_argument('--verify', action='store_true', help='Prüfsummen gegen das Manifest prüfen')
+    args = parser.parse_args()
+
+    store = EventStore()
+    if args.migrate:
+        if store.migrated:
+            months = store.save()
+            print(f"📦 events.json → {len(months)} Shards, {store.total()} Events")
+        else:
+            print("ℹ️  Keine events.json zu übernehmen")
+    elif args.verify:
+        broken = store.verify()
+        print(f"✅ {len(store.manifest['shards'])} Shards ok" if not broken
+              else f"❌ Prüfsumme falsch oder Datei fehlt: {', '.join(broken)}")
+    else:
+        print(f"📚 {store.total()} Events in {len(store.months())} Shards")
+        for month in store.months(args.start, args.end):
+            entry = store.manifest['shards'].get(month, {})
+            print(f"  {month}: {entry.get('count', 0)} Events ({entry.get('first')} – {entry.get('last')})")
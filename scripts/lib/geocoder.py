@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Geocoder für krawl.ist
+Löst Adressen und Ortsnamen in drei Stufen auf:
+
+1. Lokales Gazetteer aus venues.csv, _data/places/*.json und den Adressen
+   bisheriger Events (_events/, _events/_history/)
+2. Persistenter Cache (normalisierte Adresse → Koordinaten, auch Fehlschläge)
+3. Netzwerk (Nominatim) - nur wenn 1. und 2. nichts liefern
+
+Für Tests und Offline-Läufe lässt sich das Netzwerk-Backend durch
+StaticBackend (feste Zuordnung) oder OfflineBackend ersetzen.
+"""
+
+import csv
+import json
+import re
+import time
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from archive_pack import PACK_SUFFIX
+from compiled_cache import CACHE_DIR, load_compiled
+from event_corpus import CORPUS_FILE, load_event_corpus
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+VENUES_CSV = PROJECT_ROOT / "_data" / "venues.csv"
+PLACES_DIR = PROJECT_ROOT / "_data" / "places"
+EVENTS_DIR = PROJECT_ROOT / "_events"
+HISTORY_DIR = EVENTS_DIR / "_history"
+GEOCODE_CACHE = CACHE_DIR / "geocode_cache.json"
+
+GAZETTEER_VERSION = 2
+
+# Quellen des Gazetteers (Änderungen erzwingen einen Neubau); Archiv-Events
+# liegen in _history/YYYYMM/*.md oder in Monats-Packs
+GAZETTEER_SOURCES = [
+    VENUES_CSV, PLACES_DIR, (EVENTS_DIR, "*.md"),
+    (HISTORY_DIR, "*/*.md"), (HISTORY_DIR, f"*{PACK_SUFFIX}")
+]
+
+# Rathaus Hof: Fallback-Koordinaten, die in Events keinen echten Ort belegen
+DEFAULT_COORDINATES = {'lat': 50.3197, 'lng': 11.9168}
+
+# Fehlgeschlagene Netzwerk-Abfragen erst nach dieser Zeit wiederholen
+NEGATIVE_TTL = timedelta(days=30)
+
+# Ortszusätze, die für den Vergleich keine Rolle spielen
+CITY_SUFFIXES = ('deutschland', 'germany', 'bayern', 'saale', 'hof')
+
+Coordinates = Dict[str, float]
+
+
+def normalize_address(text: str) -> str:
+    """
+    Normalisiert Adressen/Ortsnamen für Lookups
+
+    Beispiel:
+        "Kulmbacher Str. 4, 95030 Hof (Saale)" → "kulmbacher strasse 4 95030"
+    """
+    if not text:
+        return ""
+    text = str(text).lower()
+    text = text.replace('ß', 'ss').replace('ä', 'ae').replace('ö', 'oe').replace('ü', 'ue')
+    text = re.sub(r'\bstr\b\.?', 'strasse', text)
+    text = re.sub(r'str\.', 'strasse', text)
+    text = re.sub(r'[^\w\s]', ' ', text)
+    words = text.split()
+    # Ortszusätze am Ende entfernen ("..., Hof, Saale, Deutschland")
+    while len(words) > 1 and words[-1] in CITY_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+
+def _coords(lat, lng) -> Optional[Coordinates]:
+    try:
+        if lat in (None, '') or lng in (None, ''):
+            return None
+        return {'lat': float(lat), 'lng': float(lng)}
+    except (TypeError, ValueError):
+        return None
+
+
+def build_gazetteer(venues_csv: Path = VENUES_CSV, places_dir: Path = PLACES_DIR,
+                    events_dir: Path = EVENTS_DIR, history_dir: Path = HISTORY_DIR,
+                    corpus_file: Optional[Path] = CORPUS_FILE) -> Dict[str, Dict]:
+    """
+    Baut das Gazetteer: normalisierter Name/Adresse → {lat, lng, source}
+
+    Venues und Places haben Vorrang; aus Events (_events/ und dem Archiv
+    _history/YYYYMM/ samt Packs, über das Event-Korpus) zählt pro Adresse
+    die häufigste Koordinate (Fallback-Koordinaten werden ignoriert).
+    """
+    gazetteer: Dict[str, Dict] = {}
+
+    def put(key: str, coords: Optional[Coordinates], source: str):
+        key = normalize_address(key)
+        if key and coords and key not in gazetteer:
+            gazetteer[key] = {**coords, 'source': source}
+
+    if venues_csv.exists():
+        with open(venues_csv, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                coords = _coords(row.get('lat'), row.get('lng'))
+                put(row.get('name', ''), coords, 'venues.csv')
+                put(row.get('address', ''), coords, 'venues.csv')
+                for alias in (row.get('aliases') or '').split(','):
+                    put(alias.strip(), coords, 'venues.csv')
+
+    if places_dir.exists():
+        for json_file in sorted(places_dir.glob("*.json")):
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    place = json.load(f)
+            except Exception:
+                continue
+            coords = place.get('coords') or {}
+            coords = _coords(coords.get('lat'), coords.get('lng'))
+            put(place.get('name', ''), coords, 'places')
+            put(place.get('address', ''), coords, 'places')
+
+    # Historische Events: häufigste Koordinate je Adresse/Ort
+    seen: Dict[str, Counter] = defaultdict(Counter)
+    for data in load_event_corpus(corpus_file, events_dir, history_dir):
+        coords = data.get('coordinates') or {}
+        coords = _coords(coords.get('lat'), coords.get('lng')) if isinstance(coords, dict) else None
+        if not coords or coords == DEFAULT_COORDINATES:
+            continue
+        point = (coords['lat'], coords['lng'])
+        for key in (data.get('address'), data.get('location')):
+            if key:
+                seen[normalize_address(key)][point] += 1
+    for key, points in seen.items():
+        (lat, lng), _count = points.most_common(1)[0]
+        put(key, {'lat': lat, 'lng': lng}, 'events')
+
+    return gazetteer
+
+
+# ============================================================
+# Netzwerk-Backends
+# ============================================================
+
+class NominatimBackend:
+    """OpenStreetMap Nominatim (max. 1 Anfrage pro Sekunde)"""
+
+    URL = "https://nominatim.openstreetmap.org/search"
+
+    def __init__(self, region: str = "Hof, Saale, Deutschland",
+                 user_agent: str = "krawl.ist/1.0", min_interval: float = 1.0):
+        self.region = region
+        self.user_agent = user_agent
+        self.min_interval = min_interval
+        self._last_request = 0.0
+
+    def __call__(self, query: str) -> Optional[Coordinates]:
+        import requests
+
+        wait = self.min_interval - (time.monotonic() - self._last_request)
+        if wait > 0:
+            time.sleep(wait)
+        self._last_request = time.monotonic()
+
+        response = requests.get(
+            self.URL,
+            params={'q': f"{query}, {self.region}", 'format': 'json', 'limit': 1},
+            headers={'User-Agent': self.user_agent},
+            timeout=10
+        )
+        if response.status_code == 200:
+            results = response.json()
+            if results:
+                return {'lat': float(results[0]['lat']), 'lng': float(results[0]['lon'])}
+        return None
+
+
+class StaticBackend:
+    """Lokaler Ersatz für das Netzwerk: feste Zuordnung Anfrage → Koordinaten"""
+
+    def __init__(self, mapping: Optional[Dict[str, Coordinates]] = None):
+        self.mapping = {normalize_address(k): v for k, v in (mapping or {}).items()}
+        self.calls: List[str] = []
+
+    def __call__(self, query: str) -> Optional[Coordinates]:
+        self.calls.append(query)
+        return self.mapping.get(normalize_address(query))
+
+
+class OfflineBackend(StaticBackend):
+    """Kein Netzwerk: nur Gazetteer und Cache, Fehlschläge werden nicht gemerkt"""
+
+    offline = True
+
+
+# ============================================================
+# Geocoder
+# ============================================================
+
+class Geocoder:
+    """Gazetteer → persistenter Cache → Netzwerk"""
+
+    def __init__(self, backend: Optional[Callable[[str], Optional[Coordinates]]] = None,
+                 cache_file: Path = GEOCODE_CACHE, gazetteer: Optional[Dict[str, Dict]] = None):
+        self.backend = backend if backend is not None else NominatimBackend()
+        self.cache_file = cache_file
+        self.gazetteer = gazetteer if gazetteer is not None else load_compiled(
+            'gazetteer',
+            GAZETTEER_SOURCES,
+            build_gazetteer,
+            version=GAZETTEER_VERSION
+        )
+        self.cache = self._load_cache()
+        self.stats = Counter()
+
+    def _load_cache(self) -> Dict[str, Dict]:
+        if self.cache_file and self.cache_file.exists():
+            try:
+                with open(self.cache_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except Exception as e:
+                print(f"⚠️  Geocoding-Cache unlesbar, starte leer: {e}")
+        return {}
+
+    def _save_cache(self):
+        if not self.cache_file:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.cache, f, ensure_ascii=False, indent=1, sort_keys=True)
+            tmp_file.replace(self.cache_file)
+        except OSError as e:
+            print(f"⚠️  Geocoding-Cache konnte nicht geschrieben werden: {e}")
+
+    def lookup_local(self, query: str) -> Optional[Coordinates]:
+        """Nur Gazetteer und Cache (ohne Netzwerk)"""
+        key = normalize_address(query)
+        if not key:
+            return None
+        entry = self.gazetteer.get(key)
+        if entry:
+            self.stats['gazetteer'] += 1
+            return {'lat': entry['lat'], 'lng': entry['lng']}
+        entry = self.cache.get(key)
+        if entry and entry.get('lat') is not None:
+            self.stats['cache'] += 1
+            return {'lat': entry['lat'], 'lng': entry['lng']}
+        return None
+
+    def geocode(self, *queries: str) -> Optional[Coordinates]:
+        """
+        Geocodiert die erste auflösbare Anfrage (z.B. Adresse, dann Ortsname)
+
+        Alle Anfragen werden zuerst lokal geprüft; das Netzwerk wird nur für
+        Anfragen ohne frischen Negativ-Eintrag im Cache gefragt.
+
+        Returns:
+            {'lat': ..., 'lng': ...} oder None
+        """
+        queries = [q for q in queries if q and normalize_address(q)]
+        for query in queries:
+            coords = self.lookup_local(query)
+            if coords:
+                return coords
+
+        if getattr(self.backend, 'offline', False):
+            return None
+
+        for query in queries:
+            key = normalize_address(query)
+            entry = self.cache.get(key)
+            if entry and entry.get('lat') is None:
+                checked = datetime.fromisoformat(entry['checked_at'])
+                if datetime.now() - checked < NEGATIVE_TTL:
+                    self.stats['negative'] += 1
+                    continue
+
+            self.stats['network'] += 1
+            try:
+                coords = self.backend(query)
+            except Exception as e:
+                print(f"⚠️  Geocoding failed: {e}")
+                continue  # Netzwerkfehler nicht als Negativ-Eintrag merken
+
+            self.cache[key] = {
+                'query': query,
+                'lat': coords['lat'] if coords else None,
+                'lng': coords['lng'] if coords else None,
+                'checked_at': datetime.now().isoformat(timespec='seconds')
+            }
+            self._save_cache()
+            if coords:
+                return coords
+
+        return None
+
+
+_GEOCODER: Optional[Geocoder] = None
+
+
+def get_geocoder() -> Geocoder:
+    """Gemeinsame Geocoder-Instanz (Nominatim, persistenter Cache)"""
+    global _GEOCODER
+    if _GEOCODER is None:
+        _GEOCODER = Geocoder()
+    return _GEOCODER
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    import sys
+
+    geocoder = Geocoder(backend=OfflineBackend())
+    print(f"🗺️  Gazetteer: {len(geocoder.gazetteer)} Einträge, Cache: {len(geocoder.cache)} Einträge")
+    for query in sys.argv[1:] or ["Freiheitshalle", "Kulmbacher Str. 4, 95030 Hof", "Unbekannte Straße 1"]:
+        coords = geocoder.geocode(query)
+        label = f"{coords['lat']:.4f}, {coords['lng']:.4f}" if coords else "nicht gefunden (offline)"
+        print(f"  '{query}' → {label}")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+JSON Stream für krawl.ist
+Inkrementelles Lesen der Workflow-Dateien ({..., "events": [...], ...}):
+Staging (_data/staging/events-*.json), Archiv (_data/archive/) und
+Produktiv-Shards (_data/events/YYYY-MM.json).
+
+- read_header(): Felder außer dem events-Array + Anzahl der Events; das
+  Array wird Element für Element überlesen, nie als Ganzes gehalten
+- read_headers(): dasselbe für viele Dateien, gecacht nach mtime/Größe unter
+  .cache/json_headers.json (Listen mit hunderten Sessions ohne Neu-Lesen)
+- iter_array(): Events einzeln dekodieren (Speicher: ein Event + Puffer)
+- find_by_hash(): Events zu einer Menge von Hashes in einem Durchlauf
+
+Nur Standardbibliothek (json.JSONDecoder.raw_decode auf einem Puffer, der
+blockweise nachgelesen wird) - das Dateiformat bleibt unverändert.
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from compiled_cache import CACHE_DIR
+
+CHUNK_SIZE = 64 * 1024
+HEADER_CACHE = CACHE_DIR / "json_headers.json"
+HEADER_VERSION = 1
+
+WHITESPACE = ' \t\n\r'
+# Zeichen, mit denen eine Zahl weitergehen kann (z.B. Pufferende nach "1." oder "2e")
+NUMBER_CONTINUATION = '0123456789.eE+-'
+
+
+def event_hash(event: Dict) -> Optional[str]:
+    """Hash eines Staging-Events (meta.hash, sonst id)"""
+    meta = event.get('meta') or {}
+    return meta.get('hash') or event.get('id')
+
+
+class JsonStream:
+    """Puffer über einer Datei mit den Bausteinen für ein Objekt auf oberster Ebene"""
+
+    def __init__(self, f, chunk_size: Optional[int] = None):
+        self.f = f
+        self.chunk_size = chunk_size or CHUNK_SIZE
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Liest nach (verbrauchter Anfang wird verworfen); False am Dateiende"""
+        if self.eof:
+            return False
+        chunk = self.f.read(size or self.chunk_size)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Nächstes Zeichen ohne Whitespace ('' am Dateiende)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"JSON: '{char}' erwartet, '{found or 'EOF'}' gefunden")
+        self.pos += 1
+
+    def _complete(self, end: int) -> bool:
+        """
+        False, wenn ein Wert am Pufferende abgeschnitten sein könnte
+
+        Zahlen/Literale enden nicht an einem eigenen Zeichen: "1.5" kann im
+        Puffer als "1" + "." stehen. Folgen bis zum Pufferende nur Zeichen
+        einer Zahl, muss nachgelesen werden.
+        """
+        if end == len(self.buffer):
+            return False
+        if self.buffer[end] not in NUMBER_CONTINUATION:
+            return True
+        return bool(self.buffer[end:].lstrip(NUMBER_CONTINUATION))
+
+    def value(self) -> Any:
+        """Dekodiert den nächsten vollständigen Wert"""
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                if self.eof or self._complete(end):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise
+            # Nachlesen wächst mit dem Puffer (große Events nicht quadratisch dekodieren)
+            self._fill(max(self.chunk_size, len(self.buffer) - self.pos))
+
+    def skip_array(self) -> int:
+        """Überliest ein Array Element für Element; liefert die Anzahl der Elemente"""
+        return sum(1 for _ in self.items())
+
+    def members(self) -> Iterator[str]:
+        """Schlüssel des Objekts auf oberster Ebene; danach muss der Wert gelesen/überlesen werden"""
+        self.expect('{')
+        if self.peek() == '}':
+            self.pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(':')
+            yield key
+            separator = self.peek()
+            self.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"JSON: ',' oder '}}' erwartet, '{separator or 'EOF'}' gefunden")
+
+    def items(self) -> Iterator[Any]:
+        """Elemente eines Arrays einzeln dekodiert"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"JSON: ',' oder ']' erwartet, '{separator or 'EOF'}' gefunden")
+
+
+def read_header(path: Path, array_key: str = 'events') -> Tuple[Dict, int]:
+    """
+    Felder einer Workflow-Datei ohne das Array
+
+    Returns:
+        (Header-Dict, Anzahl der Elemente im Array)
+    """
+    header, count = {}, 0
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = JsonStream(f)
+        for key in stream.members():
+            if key == array_key and stream.peek() == '[':
+                count = stream.skip_array()
+            else:
+                header[key] = stream.value()
+    return header, count
+
+
+def read_headers(paths: Iterable[Path], cache_file: Optional[Path] = HEADER_CACHE,
+                 array_key: str = 'events') -> Dict[Path, Tuple[Dict, int]]:
+    """
+    read_header() für viele Dateien; unveränderte Dateien kommen aus dem Cache
+
+    Unlesbare Dateien fehlen im Ergebnis.
+    """
+    cached: Dict[str, Dict] = {}
+    if cache_file and cache_file.exists():
+        try:
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == HEADER_VERSION:
+                cached = data.get('files', {})
+        except Exception as e:
+            print(f"⚠️  Header-Cache unlesbar, lese neu: {e}")
+
+    results: Dict[Path, Tuple[Dict, int]] = {}
+    entries: Dict[str, Dict] = {}
+    changed = False
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        key = f"{path.resolve()}|{array_key}"
+        entry = cached.get(key)
+        if not (entry and entry['mtime_ns'] == stat.st_mtime_ns and entry['size'] == stat.st_size):
+            try:
+                header, count = read_header(path, array_key)
+            except (ValueError, OSError) as e:
+                print(f"⚠️  Fehler beim Lesen von {path.name}: {e}")
+                continue
+            entry = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'header': header, 'count': count}
+            changed = True
+        entries[key] = entry
+        results[path] = (entry['header'], entry['count'])
+
+    if cache_file and changed:
+        try:
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                # Einträge verschobener/gelöschter Dateien (z.B. archivierte Sessions) fallen heraus
+                kept = {k: v for k, v in cached.items() if Path(k.rsplit('|', 1)[0]).exists()}
+                json.dump({'version': HEADER_VERSION, 'files': {**kept, **entries}}, f,
+                          ensure_ascii=False, separators=(',', ':'))
+            tmp_file.replace(cache_file)
+        except OSError as e:
+            print(f"⚠️  Header-Cache konnte nicht geschrieben werden: {e}")
+    return results
+
+
+def iter_array(path: Path, array_key: str = 'events') -> Iterator[Dict]:
+    """Elemente des Arrays einzeln (Felder davor werden dekodiert, danach nicht mehr gelesen)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        stream = JsonStream(f)
+        for key in stream.members():
+            if key == array_key and stream.peek() == '[':
+                yield from stream.items()
+                return
+            stream.value()
+
+
+def find_by_hash(path: Path, hashes: Iterable[str], key: Callable[[Dict], Optional[str]] = event_hash,
+                 array_key: str = 'events') -> Dict[str, Dict]:
+    """Events zu den angegebenen Hashes (ein Durchlauf, endet sobald alle gefunden sind)"""
+    wanted = set(hashes)
+    found: Dict[str, Dict] = {}
+    if not wanted:
+        return found
+    for item in iter_array(path, array_key):
+        h = key(item)
+        if h in wanted and h not in found:
+            found[h] = item
+            if len(found) == len(wanted):
+                break
+    return found
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    started = time.perf_counter()
+    headers = read_headers([Path(name) for name in sys.argv[1:]])
+    elapsed = (time.perf_counter() - started) * 1000
+    for path, (header, count) in headers.items():
+        print(f"📄 {path.name}: {count} Events, scraped_at={header.get('scraped_at', '-')}")
+    print(f"⏱️  {len(headers)} Dateien in {elapsed:.1f} ms")
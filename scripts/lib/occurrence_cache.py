@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Occurrence Cache für krawl.ist
+Merkt sich expandierte Termine wiederkehrender Serien, damit Expander,
+Validatoren und Feeds dieselbe Serie pro Lauf nur einmal expandieren.
+
+Schlüssel: (Hash der recurring-Konfiguration inkl. Start, Fenster start/end)
+Wert:      sortierte Liste der Termine im Fenster
+
+- Im Speicher: LRU mit fester Größe
+- Optional auf Platte: .cache/occurrences.json (ebenfalls LRU-begrenzt)
+- next_after(): binäre Suche im Horizont-Fenster statt neuer Expansion
+"""
+
+import hashlib
+import json
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from compiled_cache import CACHE_DIR
+from rrule import RRule, parse_date
+
+OCCURRENCE_FILE = CACHE_DIR / "occurrences.json"
+OCCURRENCE_VERSION = 1
+
+# Horizont für next_after(): Fenster ab Monatsanfang, damit Abfragen mit
+# unterschiedlichen Daten im selben Monat denselben Eintrag treffen
+HORIZON_DAYS = 400
+
+
+def config_hash(recurring: Dict, default_start=None) -> str:
+    """Hash über die recurring-Konfiguration und den Default-Start (event.date)"""
+    payload = json.dumps([recurring, str(default_start or '')], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def event_config(event: Dict) -> Tuple[Dict, Optional[str]]:
+    """recurring-Konfiguration eines Events (top-level rrule eingerechnet) und Default-Start"""
+    recurring = dict(event.get('recurring') or {})
+    if event.get('rrule') and not recurring.get('rrule'):
+        recurring['rrule'] = event['rrule']
+    return recurring, event.get('date')
+
+
+class OccurrenceCache:
+    """LRU-Cache (Konfiguration, Fenster) → sortierte Termine"""
+
+    def __init__(self, maxsize: int = 256, cache_file: Optional[Path] = None, disk_size: int = 4096):
+        self.maxsize = maxsize
+        self.cache_file = cache_file
+        self.disk_size = disk_size
+        self.entries: 'OrderedDict[Tuple[str, date, date], List[date]]' = OrderedDict()
+        self.disk: Optional['OrderedDict[str, List[str]]'] = None
+        self.dirty = False
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    # ============================================================
+    # Speicher + Platte
+    # ============================================================
+
+    def _load_disk(self) -> 'OrderedDict[str, List[str]]':
+        if self.disk is None:
+            self.disk = OrderedDict()
+            if self.cache_file and self.cache_file.exists():
+                try:
+                    with open(self.cache_file, 'r', encoding='utf-8') as f:
+                        cached = json.load(f)
+                    if cached.get('version') == OCCURRENCE_VERSION:
+                        self.disk.update(cached.get('entries', {}))
+                except Exception as e:
+                    print(f"⚠️  Termin-Cache unlesbar, starte leer: {e}")
+        return self.disk
+
+    @staticmethod
+    def _disk_key(key: Tuple[str, date, date]) -> str:
+        return f"{key[0]}|{key[1].isoformat()}|{key[2].isoformat()}"
+
+    def _lookup(self, key: Tuple[str, date, date]) -> Optional[List[date]]:
+        dates = self.entries.get(key)
+        if dates is not None:
+            self.entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return dates
+        if self.cache_file:
+            disk = self._load_disk()
+            stored = disk.get(self._disk_key(key))
+            if stored is not None:
+                disk.move_to_end(self._disk_key(key))
+                self.stats['disk_hits'] += 1
+                dates = [date.fromisoformat(d) for d in stored]
+                self._remember(key, dates, persist=False)
+                return dates
+        return None
+
+    def _remember(self, key: Tuple[str, date, date], dates: List[date], persist: bool = True):
+        self.entries[key] = dates
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        if persist and self.cache_file:
+            disk = self._load_disk()
+            disk[self._disk_key(key)] = [d.isoformat() for d in dates]
+            disk.move_to_end(self._disk_key(key))
+            while len(disk) > self.disk_size:
+                disk.popitem(last=False)
+            self.dirty = True
+
+    def save(self):
+        """Schreibt die Platten-Schicht (nur bei Änderungen)"""
+        if not (self.cache_file and self.dirty):
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': OCCURRENCE_VERSION, 'entries': self.disk}, f,
+                          separators=(',', ':'))
+            tmp_file.replace(self.cache_file)
+            self.dirty = False
+        except OSError as e:
+            print(f"⚠️  Termin-Cache konnte nicht geschrieben werden: {e}")
+
+    # ============================================================
+    # Abfragen
+    # ============================================================
+
+    def occurrences(self, recurring: Dict, start, end, default_start=None) -> List[date]:
+        """
+        Termine im Fenster [start, end] (sortiert)
+
+        Raises:
+            ValueError: Ungültige recurring-Konfiguration (wie RRule.from_config)
+        """
+        start, end = parse_date(start), parse_date(end)
+        key = (config_hash(recurring, default_start), start, end)
+        dates = self._lookup(key)
+        if dates is None:
+            self.stats['misses'] += 1
+            dates = RRule.from_config(recurring, default_start).between(start, end)
+            self._remember(key, dates)
+        return dates
+
+    def store(self, recurring: Dict, start, end, dates: List[date], default_start=None):
+        """Übernimmt extern expandierte Termine (z.B. aus expand_batch)"""
+        key = (config_hash(recurring, default_start), parse_date(start), parse_date(end))
+        self._remember(key, sorted(dates))
+
+    def cached(self, recurring: Dict, start, end, default_start=None) -> Optional[List[date]]:
+        """Termine aus dem Cache oder None (ohne zu expandieren)"""
+        return self._lookup((config_hash(recurring, default_start), parse_date(start), parse_date(end)))
+
+    def next_after(self, recurring: Dict, day, default_start=None, inclusive: bool = False,
+                   horizon_days: int = HORIZON_DAYS) -> Optional[date]:
+        """
+        Nächster Termin nach (bzw. ab) day
+
+        Binäre Suche im Horizont-Fenster (Monatsanfang von day + horizon_days);
+        liegt der Termin dahinter, fragt die Regel direkt.
+        """
+        day = parse_date(day)
+        window_start = day.replace(day=1)
+        window_end = window_start + timedelta(days=horizon_days)
+        dates = self.occurrences(recurring, window_start, window_end, default_start)
+
+        position = bisect_left(dates, day) if inclusive else bisect_right(dates, day)
+        if position < len(dates):
+            return dates[position]
+        return RRule.from_config(recurring, default_start).after(day, inclusive=inclusive)
+
+
+_CACHE: Optional[OccurrenceCache] = None
+
+
+def get_occurrence_cache() -> OccurrenceCache:
+    """Gemeinsame Cache-Instanz (mit Platten-Schicht unter .cache/)"""
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = OccurrenceCache(cache_file=OCCURRENCE_FILE)
+    return _CACHE
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    import time
+
+    cache = OccurrenceCache()
+    karaoke = {'frequency': 'weekly', 'by_day': ['FR'], 'start_date': '2025-01-03'}
+    today = date.today()
+
+    started = time.perf_counter()
+    for offset in range(365):
+        RRule.from_config(karaoke).after(today + timedelta(days=offset))
+    direct = time.perf_counter() - started
+
+    started = time.perf_counter()
+    for offset in range(365):
+        cache.next_after(karaoke, today + timedelta(days=offset))
+    cached = time.perf_counter() - started
+
+    print(f"🎤 Nächster Karaoke-Abend: {cache.next_after(karaoke, today)}")
+    print(f"   365 Abfragen: direkt {direct * 1000:.1f} ms, Cache {cached * 1000:.1f} ms "
+          f"({cache.stats['hits']} Treffer, {cache.stats['misses']} Expansionen)")
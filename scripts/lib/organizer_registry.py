@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""
+Organizer Registry für krawl.ist
+Vereint _data/organizers.csv (CRM) und _data/organizers/*.json in einer
+Registry mit vorberechneten, normalisierten Indizes:
+
+- Name/Alias → Veranstalter
+- Venue      → Veranstalter (typische Venues)
+- Quelle     → Veranstalter (verified_sources, source-* Slugs)
+
+Die Registry wird aus einem kompilierten Cache (.cache/organizers.json)
+geladen und pro Prozess nur einmal aufgebaut.
+"""
+
+import csv
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from compiled_cache import load_compiled
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+ORGANIZERS_CSV = PROJECT_ROOT / "_data" / "organizers.csv"
+ORGANIZERS_DIR = PROJECT_ROOT / "_data" / "organizers"
+
+REGISTRY_VERSION = 1
+
+# Felder aus organizers.csv (CRM), Reihenfolge wie in der CSV
+CRM_FIELDS = [
+    'website', 'contact_email', 'contact_phone', 'contact_person', 'contact_role',
+    'social_media_facebook', 'social_media_instagram', 'press_contact', 'press_email',
+    'press_phone', 'best_contact_time', 'preferred_contact_method', 'notes',
+    'last_contact_date', 'relationship_status'
+]
+
+
+def normalize_key(text: str) -> str:
+    """Normalisiert Namen für Index-Lookups"""
+    if not text:
+        return ""
+    text = str(text).lower().strip()
+    text = re.sub(r'[^\w\s]', '', text)
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def slugify(text: str) -> str:
+    """Wie lib.schemas.slugify (ohne Import, um Doppel-Module zu vermeiden)"""
+    text = text.lower()
+    text = text.replace('ä', 'ae').replace('ö', 'oe').replace('ü', 'ue').replace('ß', 'ss')
+    text = re.sub(r'[^a-z0-9\s-]', '', text)
+    text = re.sub(r'[\s-]+', '-', text)
+    return text.strip('-')
+
+
+def _split_list(value: Optional[str]) -> List[str]:
+    return [v.strip() for v in (value or '').split(',') if v.strip()]
+
+
+def build_registry_payload(organizers_csv: Path = ORGANIZERS_CSV,
+                           organizers_dir: Path = ORGANIZERS_DIR) -> Dict:
+    """Parst CSV + JSON-Dateien und berechnet alle Indizes"""
+    organizers: Dict[str, Dict] = {}
+
+    # 1. CRM (organizers.csv) - maßgeblich für Kontaktdaten
+    if organizers_csv.exists():
+        with open(organizers_csv, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                slug = slugify(row['name'])
+                record = {
+                    'name': row['name'],
+                    'slug': slug,
+                    'crm': True,
+                    'aliases': _split_list(row.get('aliases')),
+                    'verified_sources': _split_list(row.get('verified_sources')),
+                    'typical_venues': _split_list(row.get('typical_venues')),
+                }
+                for field in CRM_FIELDS:
+                    record[field] = row.get(field, '') or ''
+                organizers[slug] = record
+
+    # 2. JSON-Dateien (_data/organizers/*.json) - ergänzen bzw. eigene Einträge
+    if organizers_dir.exists():
+        for json_file in sorted(organizers_dir.glob("*.json")):
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Error loading organizer {json_file}: {e}")
+                continue
+
+            slug = data.get('slug') or slugify(data.get('name', json_file.stem))
+            record = organizers.setdefault(slug, {
+                'name': data.get('name', slug),
+                'slug': slug,
+                'crm': False,
+                'aliases': [],
+                'verified_sources': [],
+                'typical_venues': [],
+                **{field: '' for field in CRM_FIELDS},
+            })
+            for field in ('email', 'phone', 'social_facebook', 'social_instagram'):
+                record[field] = data.get(field)
+            if not record.get('website') and data.get('website'):
+                record['website'] = data['website']
+            record['typical_places'] = data.get('typical_places') or []
+            for source in data.get('verified_sources') or []:
+                if source not in record['verified_sources']:
+                    record['verified_sources'].append(source)
+
+    # 3. Indizes (CRM-Einträge zuerst, damit sie bei Namensgleichheit gewinnen)
+    ordered = sorted(organizers.values(), key=lambda r: not r['crm'])
+    name_index: Dict[str, str] = {}
+    venue_index: Dict[str, List[str]] = {}
+    source_index: Dict[str, str] = {}
+
+    # Namen vor Aliases (ein Name schlägt einen gleichlautenden Alias)
+    for record in ordered:
+        name_index.setdefault(normalize_key(record['name']), record['slug'])
+    for record in ordered:
+        for alias in record['aliases']:
+            name_index.setdefault(normalize_key(alias), record['slug'])
+
+    for record in ordered:
+        for venue in record['typical_venues'] + record.get('typical_places', []):
+            slugs = venue_index.setdefault(normalize_key(venue), [])
+            if record['slug'] not in slugs:
+                slugs.append(record['slug'])
+        source_index.setdefault(record['slug'], record['slug'])
+        for source in record['verified_sources']:
+            source_index.setdefault(source, record['slug'])
+
+    return {
+        'organizers': {record['slug']: record for record in ordered},
+        'name_index': name_index,
+        'venue_index': venue_index,
+        'source_index': source_index,
+    }
+
+
+class OrganizerRegistry:
+    """Veranstalter mit vorberechneten Lookup-Indizes (alle O(1))"""
+
+    def __init__(self, payload: Dict):
+        self.organizers: Dict[str, Dict] = payload['organizers']
+        self.name_index: Dict[str, str] = payload['name_index']
+        self.venue_index: Dict[str, List[str]] = payload['venue_index']
+        self.source_index: Dict[str, str] = payload['source_index']
+
+    def __len__(self) -> int:
+        return len(self.organizers)
+
+    def get(self, slug: str) -> Optional[Dict]:
+        return self.organizers.get(slug)
+
+    def crm_organizers(self) -> Dict[str, Dict]:
+        """Nur Einträge aus organizers.csv, nach Name (wie früher load_organizers)"""
+        return {r['name']: r for r in self.organizers.values() if r['crm']}
+
+    def find_by_name(self, name: str) -> Optional[Dict]:
+        """Sucht über Name oder Alias"""
+        slug = self.name_index.get(normalize_key(name))
+        return self.organizers.get(slug) if slug else None
+
+    def find_by_venue(self, venue: str) -> List[Dict]:
+        """Alle Veranstalter, die diese Venue typischerweise nutzen"""
+        return [self.organizers[s] for s in self.venue_index.get(normalize_key(venue), [])]
+
+    def find_by_source(self, source: str) -> Optional[Dict]:
+        """Sucht über Quellen-Slug (z.B. 'freiheitshalle-web') oder Quellen-URL"""
+        slug = self.source_index.get(source)
+        return self.organizers.get(slug) if slug else None
+
+    def resolve(self, organizer_name: str = '', location: str = '') -> Optional[Dict]:
+        """
+        Findet Veranstalter für ein Event
+
+        Reihenfolge: Name/Alias → typische Venue (mit match_type/confidence)
+        """
+        if organizer_name:
+            organizer = self.find_by_name(organizer_name)
+            if organizer:
+                return organizer
+
+        if location:
+            by_venue = self.find_by_venue(location)
+            if by_venue:
+                return {**by_venue[0], 'match_type': 'venue_based', 'confidence': 0.7}
+
+        return None
+
+    @staticmethod
+    def to_schema_dict(record: Dict) -> Dict:
+        """Reduziert einen Eintrag auf die Felder von lib.schemas.Organizer"""
+        return {
+            'name': record['name'],
+            'slug': record['slug'],
+            'website': record.get('website') or None,
+            'email': record.get('email') or record.get('contact_email') or None,
+            'phone': record.get('phone') or record.get('contact_phone') or None,
+            'social_facebook': record.get('social_facebook') or record.get('social_media_facebook') or None,
+            'social_instagram': record.get('social_instagram') or record.get('social_media_instagram') or None,
+            'typical_places': list(record.get('typical_places') or []),
+            'verified_sources': list(record.get('verified_sources') or []),
+        }
+
+
+_REGISTRY: Optional[OrganizerRegistry] = None
+
+
+def get_registry(refresh: bool = False) -> OrganizerRegistry:
+    """Gemeinsame Registry-Instanz (einmal pro Prozess aus dem Cache geladen)"""
+    global _REGISTRY
+    if _REGISTRY is None or refresh:
+        payload = load_compiled(
+            'organizers',
+            [ORGANIZERS_CSV, ORGANIZERS_DIR],
+            build_registry_payload,
+            version=REGISTRY_VERSION
+        )
+        _REGISTRY = OrganizerRegistry(payload)
+    return _REGISTRY
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    registry = get_registry()
+    print(f"👥 {len(registry)} Veranstalter ({len(registry.crm_organizers())} im CRM)")
+    print(f"   {len(registry.name_index)} Namen/Aliases, "
+          f"{len(registry.venue_index)} Venues, {len(registry.source_index)} Quellen")
+
+    for name, location in [("Kulturzentrum Hof", ""), ("", "Altstadt Hof"), ("Unbekannt", "")]:
+        organizer = registry.resolve(name, location)
+        label = organizer['name'] if organizer else 'nicht gefunden'
+        print(f"  '{name or location}' → {label}")
@@ -0,0 +1,305 @@
+#!/usr/bin/env python3
+"""
+Recurring Discovery für krawl.ist
+Findet Serien in der kompletten Event-Historie (_events/ + _history/) und
+schlägt recurring-Konfigurationen mit Konfidenz vor.
+
+Ablauf:
+1. Gemeinsames Korpus laden (event_corpus, inkrementell geparst)
+2. Gruppieren nach normalisiertem Titel (ohne Datum/Nummer) + Venue
+3. Je Gruppe Intervall-Histogramm und Kandidaten-Regeln (wöchentlich,
+   14-tägig, n-ter Wochentag, Tag im Monat, jährlich); jede Regel wird mit
+   der RRULE-Engine über den Zeitraum der Gruppe expandiert und bewertet:
+
+       precision = Treffer / Events,  recall = Treffer / erwartete Termine
+       confidence = precision × recall × (1 - 0.5^(Events - 1))
+
+   Ausgefallene Wochen und Feiertage senken den recall, brechen die
+   Erkennung aber nicht ab.
+
+Ergebnisse je Gruppe liegen mit einer Signatur (Pfade + Daten) unter
+.cache/recurring_discovery.json; neu analysiert werden nur Gruppen, deren
+Events sich seit dem letzten Lauf geändert haben.
+"""
+
+import hashlib
+import json
+import re
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from compiled_cache import CACHE_DIR
+from dedup_index import normalize_text
+from event_corpus import EventCorpus, load_event_corpus
+from rrule import WEEKDAYS, RRule, parse_date
+
+DISCOVERY_FILE = CACHE_DIR / "recurring_discovery.json"
+DISCOVERY_VERSION = 2
+
+MIN_EVENTS = 3
+MIN_CONFIDENCE = 0.6
+
+MONTH_NAMES = (r'januar|februar|märz|maerz|april|mai|juni|juli|august|september|oktober|'
+               r'november|dezember|jan|feb|mär|apr|jun|jul|aug|sept?|okt|nov|dez')
+
+# Datums-, Jahres- und Folgenangaben, die sich zwischen Terminen einer Serie ändern
+TITLE_NOISE = [
+    re.compile(r'\b\d{1,2}\.\s*\d{1,2}\.(\d{2,4})?'),
+    re.compile(rf'\b\d{{1,2}}\.\s*({MONTH_NAMES})\b\.?'),
+    re.compile(r'\b\d{1,2}[./]\s*(19|20)\d{2}\b'),
+    re.compile(r'\b(19|20)\d{2}\b'),
+    re.compile(r'(#|\bnr\.?|\bno\.?|\bvol\.?|\bfolge|\bteil|\bausgabe)\s*\d+\b'),
+    re.compile(r'\b\d+\.\s*(ausgabe|edition|auflage)\b'),
+]
+
+
+def title_key(title: str) -> str:
+    """
+    Titel ohne Datum/Folgennummer
+
+    Beispiel:
+        "Jazz-Session #12 (14.11.2025)" → "jazzsession"
+    """
+    text = str(title or '').lower()
+    for pattern in TITLE_NOISE:
+        text = pattern.sub(' ', text)
+    return normalize_text(text)
+
+
+def venue_key(location: str, registry=None) -> str:
+    """Venue-Schlüssel: kanonischer Name aus der Venue-Registry (Aliases), sonst normalisiert"""
+    if registry is not None and location:
+        venue = registry.get(location)
+        if venue:
+            return normalize_text(venue['name'])
+    return normalize_text(location)
+
+
+def safe_date(value) -> Optional[date]:
+    """parse_date ohne Exception (unlesbares Datum wie '17.01.2025' → None)"""
+    try:
+        return parse_date(value)
+    except ValueError:
+        return None
+
+
+def group_events(records: Iterable[Dict], registry=None) -> Tuple[Dict[str, List[Dict]], set, List[Dict]]:
+    """
+    Gruppiert Events nach "titel|venue"
+
+    Auto-generierte Instanzen (recurring_parent) bleiben außen vor, Events
+    mit unlesbarem Datum werden gesammelt statt die Analyse abzubrechen.
+
+    Returns:
+        (Gruppen, Schlüssel von Gruppen mit bereits aktivem recurring-Template,
+         Events mit unlesbarem Datum)
+    """
+    groups: Dict[str, List[Dict]] = defaultdict(list)
+    configured = set()
+    invalid: List[Dict] = []
+    for record in records:
+        if record.get('recurring_parent') or not record.get('date'):
+            continue
+        if safe_date(record['date']) is None:
+            invalid.append(record)
+            continue
+        key = f"{title_key(record.get('title'))}|{venue_key(record.get('location'), registry)}"
+        if record.get('recurring'):
+            configured.add(key)
+            continue
+        groups[key].append(record)
+    return groups, configured, invalid
+
+
+def interval_histogram(dates: List[date]) -> Dict[int, int]:
+    """Abstände (Tage) zwischen aufeinanderfolgenden Terminen → Häufigkeit"""
+    return dict(sorted(Counter((b - a).days for a, b in zip(dates, dates[1:])).items()))
+
+
+def candidate_configs(dates: List[date]) -> List[Dict]:
+    """Kandidaten-Regeln, einfachste zuerst (bei gleicher Konfidenz gewinnt die erste)"""
+    start = dates[0].isoformat()
+    weekday_counts = Counter(WEEKDAYS[d.weekday()] for d in dates)
+    top_weekday, top = weekday_counts.most_common(1)[0]
+    by_day = [wd for wd in WEEKDAYS if weekday_counts[wd] >= max(2, top / 2)] or [top_weekday]
+
+    candidates = [
+        {'frequency': 'weekly', 'by_day': by_day},
+        {'frequency': 'biweekly', 'by_day': by_day},
+    ]
+
+    # n-ter bzw. letzter Wochentag im Monat (dokumentierte Form: by_day + by_set_pos)
+    on_top = [d for d in dates if WEEKDAYS[d.weekday()] == top_weekday]
+    position, _ = Counter((d.day - 1) // 7 + 1 for d in on_top).most_common(1)[0]
+    candidates.append({'frequency': 'monthly', 'by_day': [top_weekday], 'by_set_pos': position})
+    if any((d + timedelta(days=7)).month != d.month for d in on_top):
+        candidates.append({'frequency': 'monthly', 'by_day': [top_weekday], 'by_set_pos': -1})
+
+    month_day, _ = Counter(d.day for d in dates).most_common(1)[0]
+    candidates.append({'frequency': 'monthly', 'by_month_day': [month_day]})
+    candidates.append({'frequency': 'yearly'})
+
+    return [{'enabled': True, **config, 'start_date': start} for config in candidates]
+
+
+def analyze_dates(dates: Iterable, min_events: int = MIN_EVENTS) -> Optional[Dict]:
+    """
+    Beste Kandidaten-Regel für eine Terminliste
+
+    Returns:
+        {'config', 'confidence', 'matched', 'expected', 'missed', 'extra',
+         'intervals'} oder None (zu wenige Termine)
+    """
+    dates = sorted({day for day in map(safe_date, dates) if day})
+    if len(dates) < min_events:
+        return None
+
+    date_set = set(dates)
+    support = 1 - 0.5 ** (len(dates) - 1)
+    best = None
+    for config in candidate_configs(dates):
+        expected = set(RRule.from_config(config).between(dates[0], dates[-1]))
+        if not expected:
+            continue
+        matched = len(expected & date_set)
+        confidence = (matched / len(dates)) * (matched / len(expected)) * support
+        if best is None or confidence > best['confidence'] + 1e-9:
+            best = {
+                'config': config,
+                'confidence': round(confidence, 3),
+                'matched': matched,
+                'expected': len(expected),
+                'missed': len(expected - date_set),
+                'extra': len(date_set - expected),
+            }
+    if best:
+        best['intervals'] = {str(days): n for days, n in interval_histogram(dates).items()}
+    return best
+
+
+def group_signature(records: List[Dict]) -> str:
+    """Signatur über Pfade und Daten einer Gruppe (ändert sich bei neuen Events)"""
+    digest = hashlib.sha256()
+    for path, day in sorted((r['_path'], str(r['date'])) for r in records):
+        digest.update(f"{path}:{day}\n".encode())
+    return digest.hexdigest()[:16]
+
+
+def _load_state(state_file: Path, min_events: int) -> Dict[str, Dict]:
+    if not state_file or not state_file.exists():
+        return {}
+    try:
+        with open(state_file, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except Exception as e:
+        print(f"⚠️  {state_file.name} unlesbar, analysiere alles neu: {e}")
+        return {}
+    if state.get('version') != DISCOVERY_VERSION or state.get('min_events') != min_events:
+        return {}
+    return state.get('groups', {})
+
+
+def discover_patterns(corpus: Optional[EventCorpus] = None, state_file: Path = DISCOVERY_FILE,
+                      min_events: int = MIN_EVENTS, min_confidence: float = MIN_CONFIDENCE,
+                      full: bool = False, registry=None) -> Tuple[List[Dict], Dict[str, int]]:
+    """
+    Vorschläge für wiederkehrende Serien über die komplette Historie
+
+    Args:
+        corpus: Event-Korpus (default: load_event_corpus())
+        full: Alle Gruppen neu analysieren (Signaturen ignorieren)
+        registry: VenueRegistry für Alias-Auflösung (default: gemeinsame Instanz)
+
+    Returns:
+        (Vorschläge nach Konfidenz absteigend, Statistik)
+    """
+    if corpus is None:
+        corpus = load_event_corpus()
+    if registry is None:
+        from venue_registry import get_venue_registry
+        registry = get_venue_registry()
+
+    groups, configured, invalid = group_events(corpus, registry)
+    previous = {} if full else _load_state(state_file, min_events)
+    if invalid:
+        examples = ', '.join(f"{r.get('_path')}: '{r['date']}'" for r in invalid[:3])
+        print(f"⚠️  {len(invalid)} Events mit unlesbarem Datum übersprungen ({examples})")
+
+    state: Dict[str, Dict] = {}
+    stats = Counter(events=len(corpus), groups=len(groups), configured=len(configured),
+                    invalid_dates=len(invalid))
+    for key, records in groups.items():
+        if len({str(r['date']) for r in records}) < min_events:
+            continue
+        signature = group_signature(records)
+        cached = previous.get(key)
+        if cached and cached['signature'] == signature:
+            state[key] = cached
+            stats['reused'] += 1
+            continue
+
+        result = analyze_dates([r['date'] for r in records], min_events)
+        if result:
+            latest = max(records, key=lambda r: str(r['date']))
+            result.update({
+                'key': key,
+                'title': latest.get('title'),
+                'location': latest.get('location'),
+                'events': len(records),
+                'first': min(str(r['date']) for r in records),
+                'last': str(latest['date']),
+                'files': sorted(r['_path'] for r in records),
+            })
+        state[key] = {'signature': signature, 'result': result}
+        stats['analyzed'] += 1
+
+    if state_file:
+        try:
+            state_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = state_file.with_suffix('.json.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump({'version': DISCOVERY_VERSION, 'min_events': min_events, 'groups': state},
+                          f, ensure_ascii=False, separators=(',', ':'))
+            tmp_file.replace(state_file)
+        except OSError as e:
+            print(f"⚠️  Discovery-Status konnte nicht geschrieben werden: {e}")
+
+    proposals = [
+        entry['result'] for key, entry in state.items()
+        if entry['result'] and key not in configured and entry['result']['confidence'] >= min_confidence
+    ]
+    proposals.sort(key=lambda p: (-p['confidence'], p['key']))
+    stats['proposals'] = len(proposals)
+    return proposals, dict(stats)
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    import argparse
+
+    import yaml
+
+    parser = argparse.ArgumentParser(description='Wiederkehrende Serien in der Event-Historie finden')
+    parser.add_argument('--min-events', type=int, default=MIN_EVENTS)
+    parser.add_argument('--min-confidence', type=float, default=MIN_CONFIDENCE)
+    parser.add_argument('--full', action='store_true', help='Alle Gruppen neu analysieren')
+    args = parser.parse_args()
+
+    proposals, stats = discover_patterns(min_events=args.min_events,
+                                         min_confidence=args.min_confidence, full=args.full)
+    print(f"🔍 {stats['events']} Events, {stats['groups']} Gruppen "
+          f"({stats.get('analyzed', 0)} analysiert, {stats.get('reused', 0)} unverändert), "
+          f"{stats['proposals']} Vorschläge")
+    for proposal in proposals:
+        print(f"\n🔄 {proposal['title']} @ {proposal['location']} "
+              f"({proposal['events']} Events, {proposal['first']} – {proposal['last']})")
+        print(f"   Konfidenz {proposal['confidence']:.0%}: {proposal['matched']}/{proposal['expected']} "
+              f"Termine, {proposal['missed']} ausgefallen, {proposal['extra']} außerhalb")
+        print(f"   Intervalle: {proposal['intervals']}")
+        print('   ' + yaml.dump({'recurring': proposal['config']}, allow_unicode=True,
+                                 sort_keys=False).replace('\n', '\n   ').rstrip())
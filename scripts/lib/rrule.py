@@ -0,0 +1,781 @@
+#!/usr/bin/env python3
+"""
+RRULE Engine für krawl.ist
+Gemeinsame Berechnung wiederkehrender Termine (RFC 5545) für
+RecurringExpander, RecurringGenerator und die Validatoren.
+
+Unterstützt: FREQ (DAILY/WEEKLY/MONTHLY/YEARLY), INTERVAL, BYDAY (auch mit
+Position, z.B. "1FR", "-1SU"), BYMONTHDAY, BYSETPOS, COUNT, UNTIL sowie
+EXDATE/RDATE (= exceptions/additions aus der recurring-Konfiguration).
+
+Alle Termine werden lazy erzeugt: Die Engine springt pro Periode (Tag,
+Woche, Monat, Jahr) direkt zu den passenden Tagen. Ohne COUNT beginnt
+between(a, b) sofort in der Periode von a, statt ab DTSTART zu zählen.
+
+Einschränkungen: Wochen beginnen montags (WKST=MO); YEARLY bezieht sich
+auf den Monat von DTSTART (kein BYMONTH).
+
+expand_batch() expandiert viele Regeln auf einmal mit numpy-datetime64
+(falls installiert); expand_scalar() ist die Referenz dazu.
+"""
+
+import calendar
+import random
+import re
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # optional: nur für expand_batch
+    np = None
+
+WEEKDAYS = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU']
+FREQUENCIES = ['DAILY', 'WEEKLY', 'MONTHLY', 'YEARLY']
+
+# recurring.frequency → (FREQ, Faktor für INTERVAL)
+CONFIG_FREQUENCIES = {
+    'daily': ('DAILY', 1),
+    'weekly': ('WEEKLY', 1),
+    'biweekly': ('WEEKLY', 2),
+    'monthly': ('MONTHLY', 1),
+    'yearly': ('YEARLY', 1),
+}
+
+# Regeln ohne Treffer (z.B. 29.02. alle 4 Jahre ab einem Nicht-Schaltjahr)
+# brechen nach dieser Lücke ab, statt endlos zu suchen
+MAX_GAP = timedelta(days=366 * 30)
+
+ByDay = Tuple[Optional[int], int]  # (Position oder None, Wochentag 0-6)
+
+
+def parse_date(value) -> Optional[date]:
+    """'YYYY-MM-DD', 'YYYYMMDD[THHMMSSZ]', date oder datetime → date"""
+    if value in (None, ''):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    text = str(value).strip()
+    for fmt, length in (('%Y-%m-%d', 10), ('%Y%m%d', 8)):
+        try:
+            return datetime.strptime(text[:length], fmt).date()
+        except ValueError:
+            continue
+    raise ValueError(f"Ungültiges Datum: '{value}'")
+
+
+def parse_by_day(values) -> List[ByDay]:
+    """["MO", "1FR", "-1SU"] → [(None, 0), (1, 4), (-1, 6)]"""
+    if not values:
+        return []
+    if isinstance(values, str):
+        values = values.split(',')
+    result = []
+    for value in values:
+        match = re.fullmatch(r'([+-]?\d{1,2})?([A-Z]{2})', str(value).strip().upper())
+        if not match or match.group(2) not in WEEKDAYS:
+            raise ValueError(f"Ungültiger Wochentag: '{value}'")
+        position = int(match.group(1)) if match.group(1) else None
+        if position is not None and not (1 <= abs(position) <= 53):
+            raise ValueError(f"Ungültige Position in BYDAY: '{value}'")
+        result.append((position, WEEKDAYS.index(match.group(2))))
+    return result
+
+
+def _int_list(values, name: str, low: int, high: int) -> List[int]:
+    if values in (None, '', []):
+        return []
+    if not isinstance(values, (list, tuple)):
+        values = str(values).split(',') if isinstance(values, str) else [values]
+    result = []
+    for value in values:
+        try:
+            number = int(value)
+        except (TypeError, ValueError):
+            raise ValueError(f"{name} muss Ganzzahl sein (ist: {value!r})")
+        if not (low <= abs(number) <= high):
+            raise ValueError(f"{name} muss zwischen {low} und {high} bzw. -{high} und -{low} liegen (ist: {number})")
+        result.append(number)
+    return result
+
+
+def _add_months(year: int, month: int, months: int) -> Tuple[int, int]:
+    year_offset, month_index = divmod(month - 1 + months, 12)
+    return year + year_offset, month_index + 1
+
+
+def weekdays_in_month(year: int, month: int, weekday: int) -> range:
+    """Alle Tage (1-31) eines Wochentags im Monat, ohne den Monat abzulaufen"""
+    first_weekday, month_days = calendar.monthrange(year, month)
+    return range(1 + (weekday - first_weekday) % 7, month_days + 1, 7)
+
+
+def nth_weekday_in_month(year: int, month: int, weekday: int, position: int) -> Optional[int]:
+    """
+    Tag des position-ten Wochentags im Monat (1 = erster, -1 = letzter)
+
+    None, wenn es die Position im Monat nicht gibt (z.B. 5. Freitag).
+    """
+    occurrences = weekdays_in_month(year, month, weekday)
+    if not position or abs(position) > len(occurrences):
+        return None
+    return occurrences[position - 1 if position > 0 else position]
+
+
+class RRule:
+    """
+    Wiederkehrende Regel mit lazy Iteration
+
+    Beispiel:
+        rule = RRule.from_config({'frequency': 'monthly', 'by_day': ['FR'],
+                                  'by_set_pos': 1}, default_start='2025-01-01')
+        rule.between(date(2026, 1, 1), date(2026, 3, 31))
+    """
+
+    def __init__(self, freq: str, dtstart, interval: int = 1, by_day=None,
+                 by_month_day=None, by_set_pos=None, count: Optional[int] = None,
+                 until=None, exdates: Iterable = (), rdates: Iterable = ()):
+        freq = str(freq).upper()
+        if freq not in FREQUENCIES:
+            raise ValueError(f"Ungültige FREQ: '{freq}'. Erlaubt: {', '.join(FREQUENCIES)}")
+        if not isinstance(interval, int) or isinstance(interval, bool) or interval < 1:
+            raise ValueError(f"INTERVAL muss positive Ganzzahl sein (ist: {interval})")
+        if count is not None and (not isinstance(count, int) or count < 1):
+            raise ValueError(f"COUNT muss positive Ganzzahl sein (ist: {count})")
+
+        self.freq = freq
+        self.dtstart = parse_date(dtstart)
+        if self.dtstart is None:
+            raise ValueError("DTSTART fehlt")
+        self.interval = interval
+        self.by_day = parse_by_day(by_day)
+        self.by_month_day = _int_list(by_month_day, 'BYMONTHDAY', 1, 31)
+        self.by_set_pos = _int_list(by_set_pos, 'BYSETPOS', 1, 366)
+        self.count = count
+        self.until = parse_date(until)
+        self.exdates = {parse_date(d) for d in exdates or ()}
+        self.rdates = sorted({parse_date(d) for d in rdates or ()})
+
+        if self.by_set_pos and not (self.by_day or self.by_month_day):
+            raise ValueError("BYSETPOS benötigt BYDAY oder BYMONTHDAY")
+
+        # RFC 5545: fehlende BYxxx-Angaben werden aus DTSTART abgeleitet
+        if freq == 'WEEKLY' and not self.by_day:
+            self.by_day = [(None, self.dtstart.weekday())]
+        if freq in ('MONTHLY', 'YEARLY') and not self.by_day and not self.by_month_day:
+            self.by_month_day = [self.dtstart.day]
+
+    # ------------------------------------------------------------
+    # Konstruktoren
+    # ------------------------------------------------------------
+
+    @classmethod
+    def from_config(cls, recurring: Dict, default_start=None) -> 'RRule':
+        """
+        Regel aus der recurring-Konfiguration eines Events
+
+        exceptions → EXDATE, additions → RDATE, end_date → UNTIL,
+        biweekly → WEEKLY mit doppeltem INTERVAL. Ein optionales
+        recurring.rrule (RFC-String) hat Vorrang vor den Einzelfeldern.
+        """
+        start = recurring.get('start_date') or default_start
+        exdates = [d for d in recurring.get('exceptions') or [] if d]
+        rdates = [d for d in recurring.get('additions') or [] if d]
+
+        if recurring.get('rrule'):
+            return cls.parse(recurring['rrule'], start, exdates=exdates, rdates=rdates)
+
+        frequency = recurring.get('frequency')
+        if frequency not in CONFIG_FREQUENCIES:
+            raise ValueError(f"Ungültige frequency: '{frequency}'")
+        freq, factor = CONFIG_FREQUENCIES[frequency]
+        interval = recurring.get('interval', 1)
+        if isinstance(interval, int) and not isinstance(interval, bool):
+            interval *= factor
+
+        return cls(
+            freq,
+            start,
+            interval=interval,
+            by_day=recurring.get('by_day'),
+            by_month_day=recurring.get('by_month_day'),
+            by_set_pos=recurring.get('by_set_pos'),
+            count=recurring.get('count'),
+            until=recurring.get('end_date'),
+            exdates=exdates,
+            rdates=rdates
+        )
+
+    @classmethod
+    def from_event(cls, event: Dict) -> 'RRule':
+        """Regel eines Events (recurring-Block oder top-level rrule), Start = date"""
+        recurring = dict(event.get('recurring') or {})
+        if event.get('rrule') and not recurring.get('rrule'):
+            recurring['rrule'] = event['rrule']
+        return cls.from_config(recurring, default_start=event.get('date'))
+
+    @classmethod
+    def parse(cls, text: str, dtstart, exdates: Iterable = (), rdates: Iterable = ()) -> 'RRule':
+        """'FREQ=WEEKLY;BYDAY=SU;UNTIL=20261231T235959Z' → RRule"""
+        text = str(text).strip()
+        if text.upper().startswith('RRULE:'):
+            text = text[6:]
+        parts = {}
+        for part in filter(None, text.split(';')):
+            key, _, value = part.partition('=')
+            parts[key.strip().upper()] = value.strip()
+
+        unknown = set(parts) - {'FREQ', 'INTERVAL', 'BYDAY', 'BYMONTHDAY', 'BYSETPOS',
+                                'COUNT', 'UNTIL', 'WKST'}
+        if unknown:
+            raise ValueError(f"Nicht unterstützte RRULE-Teile: {', '.join(sorted(unknown))}")
+        if parts.get('WKST', 'MO').upper() != 'MO':
+            raise ValueError("Nur WKST=MO wird unterstützt")
+
+        try:
+            interval = int(parts.get('INTERVAL', 1))
+            count = int(parts['COUNT']) if 'COUNT' in parts else None
+        except ValueError:
+            raise ValueError(f"Ungültige RRULE: '{text}'")
+
+        return cls(
+            parts.get('FREQ', ''),
+            dtstart,
+            interval=interval,
+            by_day=parts.get('BYDAY'),
+            by_month_day=parts.get('BYMONTHDAY'),
+            by_set_pos=parts.get('BYSETPOS'),
+            count=count,
+            until=parts.get('UNTIL'),
+            exdates=exdates,
+            rdates=rdates
+        )
+
+    def to_string(self) -> str:
+        """RFC-5545-Darstellung (ohne DTSTART/EXDATE/RDATE)"""
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.by_day:
+            parts.append("BYDAY=" + ','.join(
+                f"{'' if pos is None else pos}{WEEKDAYS[wd]}" for pos, wd in self.by_day
+            ))
+        if self.by_month_day:
+            parts.append("BYMONTHDAY=" + ','.join(map(str, self.by_month_day)))
+        if self.by_set_pos:
+            parts.append("BYSETPOS=" + ','.join(map(str, self.by_set_pos)))
+        if self.count:
+            parts.append(f"COUNT={self.count}")
+        if self.until:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%d')}")
+        return ';'.join(parts)
+
+    def __repr__(self) -> str:
+        return f"RRule({self.to_string()!r}, dtstart={self.dtstart})"
+
+    # ------------------------------------------------------------
+    # Perioden
+    # ------------------------------------------------------------
+
+    def _period_index(self, day: date) -> int:
+        """Index der Periode (in Einheiten von FREQ ab DTSTART), die day enthält"""
+        start = self.dtstart
+        if self.freq == 'DAILY':
+            return (day - start).days
+        if self.freq == 'WEEKLY':
+            week_start = start - timedelta(days=start.weekday())
+            return (day - week_start).days // 7
+        if self.freq == 'MONTHLY':
+            return (day.year - start.year) * 12 + (day.month - start.month)
+        return day.year - start.year
+
+    def _period(self, index: int) -> Tuple[date, List[date]]:
+        """(Periodenbeginn, sortierte Kandidaten) für eine Periode"""
+        start = self.dtstart
+
+        if self.freq == 'DAILY':
+            day = start + timedelta(days=index)
+            return day, self._apply_set_pos([day] if self._matches_filters(day) else [])
+
+        if self.freq == 'WEEKLY':
+            week_start = start - timedelta(days=start.weekday()) + timedelta(weeks=index)
+            weekdays = {wd for _pos, wd in self.by_day}
+            return week_start, self._apply_set_pos([
+                week_start + timedelta(days=wd) for wd in sorted(weekdays)
+            ])
+
+        if self.freq == 'MONTHLY':
+            year, month = _add_months(start.year, start.month, index)
+        else:
+            year, month = start.year + index, start.month
+        return date(year, month, 1), self._apply_set_pos(self._month_candidates(year, month))
+
+    def _month_candidates(self, year: int, month: int) -> List[date]:
+        month_days = calendar.monthrange(year, month)[1]
+
+        if self.by_month_day:
+            days = set()
+            for day in self.by_month_day:
+                day = day if day > 0 else month_days + day + 1
+                if 1 <= day <= month_days:
+                    days.add(day)
+            if self.by_day:
+                # BYDAY schränkt BYMONTHDAY ein
+                days = {d for d in days if self._weekday_matches(date(year, month, d))}
+            return [date(year, month, d) for d in sorted(days)]
+
+        days = set()
+        for position, weekday in self.by_day:
+            if position is None:
+                days.update(weekdays_in_month(year, month, weekday))
+            else:
+                days.add(nth_weekday_in_month(year, month, weekday, position))
+        days.discard(None)
+        return [date(year, month, d) for d in sorted(days)]
+
+    def _weekday_matches(self, day: date) -> bool:
+        for position, weekday in self.by_day:
+            if day.weekday() != weekday:
+                continue
+            if position is None or nth_weekday_in_month(day.year, day.month, weekday, position) == day.day:
+                return True
+        return False
+
+    def _matches_filters(self, day: date) -> bool:
+        """BYDAY/BYMONTHDAY als Filter (für DAILY)"""
+        if self.by_day and day.weekday() not in {wd for _pos, wd in self.by_day}:
+            return False
+        if self.by_month_day:
+            month_days = calendar.monthrange(day.year, day.month)[1]
+            if day.day not in {d if d > 0 else month_days + d + 1 for d in self.by_month_day}:
+                return False
+        return True
+
+    def _apply_set_pos(self, candidates: List[date]) -> List[date]:
+        if not self.by_set_pos:
+            return candidates
+        selected = set()
+        for position in self.by_set_pos:
+            if abs(position) <= len(candidates):
+                selected.add(candidates[position - 1 if position > 0 else position])
+        return sorted(selected)
+
+    # ------------------------------------------------------------
+    # Iteration
+    # ------------------------------------------------------------
+
+    def _rule_dates(self, lower: Optional[date] = None) -> Iterator[date]:
+        """Termine der Regel (ohne EXDATE/RDATE) ab lower, aufsteigend"""
+        jump = lower is not None and self.count is None and lower > self.dtstart
+        index = self._period_index(lower) // self.interval * self.interval if jump else 0
+        emitted = 0
+        last_hit = lower if jump else self.dtstart
+
+        while True:
+            try:
+                period_start, candidates = self._period(index)
+            except (ValueError, OverflowError):
+                return  # Jenseits von date.max
+            if self.until and period_start > self.until:
+                return
+            if period_start - last_hit > MAX_GAP:
+                return
+
+            for day in candidates:
+                if day < self.dtstart:
+                    continue
+                if self.until and day > self.until:
+                    return
+                emitted += 1
+                last_hit = day
+                if lower is None or day >= lower:
+                    yield day
+                if self.count and emitted >= self.count:
+                    return
+            index += self.interval
+
+    def iter_dates(self, lower: Optional[date] = None) -> Iterator[date]:
+        """Alle Termine inkl. RDATE, ohne EXDATE, ab lower (lazy)"""
+        lower = parse_date(lower)
+        rdates = iter(d for d in self.rdates if lower is None or d >= lower)
+        pending = next(rdates, None)
+        previous = None
+
+        for day in self._rule_dates(lower):
+            while pending is not None and pending <= day:
+                if pending != previous and pending not in self.exdates:
+                    yield pending
+                    previous = pending
+                pending = next(rdates, None)
+            if day != previous and day not in self.exdates:
+                yield day
+                previous = day
+
+        while pending is not None:
+            if pending != previous and pending not in self.exdates:
+                yield pending
+                previous = pending
+            pending = next(rdates, None)
+
+    __iter__ = iter_dates
+
+    def between(self, start, end, inclusive: bool = True) -> List[date]:
+        """Alle Termine im Fenster [start, end] (ohne Iteration ab DTSTART)"""
+        start, end = parse_date(start), parse_date(end)
+        result = []
+        for day in self.iter_dates(start):
+            if day > end or (not inclusive and day == end):
+                break
+            if inclusive or day != start:
+                result.append(day)
+        return result
+
+    def after(self, day, inclusive: bool = False) -> Optional[date]:
+        """Erster Termin nach (bzw. ab) day"""
+        day = parse_date(day)
+        for occurrence in self.iter_dates(day):
+            if inclusive or occurrence > day:
+                return occurrence
+        return None
+
+    def first(self) -> Optional[date]:
+        return next(self.iter_dates(), None)
+
+    def is_regular(self, day) -> bool:
+        """True, wenn day ein Termin der Regel ist (ohne RDATE/EXDATE)"""
+        day = parse_date(day)
+        return next(self._rule_dates(day), None) == day
+
+    # ------------------------------------------------------------
+    # Referenz (für Paritäts-Checks)
+    # ------------------------------------------------------------
+
+    def _day_matches(self, day: date) -> bool:
+        """BYDAY/BYMONTHDAY direkt für einen Tag geprüft (ohne BYSETPOS)"""
+        if self.freq == 'DAILY':
+            return self._matches_filters(day)
+        if self.freq == 'WEEKLY':
+            return day.weekday() in {wd for _pos, wd in self.by_day}
+        if self.freq == 'YEARLY' and day.month != self.dtstart.month:
+            return False
+        month_days = calendar.monthrange(day.year, day.month)[1]
+        if self.by_month_day:
+            if day.day not in {d if d > 0 else month_days + d + 1 for d in self.by_month_day}:
+                return False
+            return not self.by_day or self._weekday_matches(day)
+        return self._weekday_matches(day)
+
+    def _matches_day(self, day: date) -> bool:
+        """Prüft einen einzelnen Tag gegen die Regel (ohne COUNT)"""
+        if day < self.dtstart or (self.until and day > self.until):
+            return False
+        if self._period_index(day) % self.interval or not self._day_matches(day):
+            return False
+        if not self.by_set_pos:
+            return True
+
+        # BYSETPOS: alle Tage der Periode einzeln prüfen
+        if self.freq == 'WEEKLY':
+            first, length = day - timedelta(days=day.weekday()), 7
+        elif self.freq == 'DAILY':
+            first, length = day, 1
+        else:
+            first, length = day.replace(day=1), calendar.monthrange(day.year, day.month)[1]
+        period = [first + timedelta(days=i) for i in range(length)]
+        return day in self._apply_set_pos([d for d in period if self._day_matches(d)])
+
+    def daywalk(self, start, end) -> List[date]:
+        """Tag-für-Tag-Referenz zu between() (langsam, nur für Tests)"""
+        start, end = parse_date(start), parse_date(end)
+        emitted = 0
+        rule_days = []
+        day = self.dtstart
+        while day <= end:
+            if self._matches_day(day):
+                emitted += 1
+                if self.count and emitted > self.count:
+                    break
+                rule_days.append(day)
+            day += timedelta(days=1)
+        days = set(rule_days) | set(self.rdates)
+        return sorted(d for d in days if start <= d <= end and d not in self.exdates)
+
+
+# ============================================================
+# Batch-Expansion
+# ============================================================
+
+FREQ_CODES = {freq: code for code, freq in enumerate(FREQUENCIES)}
+
+
+def expand_scalar(rules: Dict[str, RRule], start, end) -> List[Tuple[str, date]]:
+    """
+    Referenz: jede Regel einzeln über between()
+
+    Returns:
+        [(series_id, date), ...] nach Regel-Reihenfolge, dann Datum
+    """
+    return [(series_id, day) for series_id, rule in rules.items() for day in rule.between(start, end)]
+
+
+def _set_pos_as_by_day(rule: RRule) -> bool:
+    """MONTHLY/YEARLY mit genau einem Wochentag: BYSETPOS=n ≡ BYDAY=nXX"""
+    return (rule.freq in ('MONTHLY', 'YEARLY') and not rule.by_month_day
+            and len(rule.by_day) == 1 and rule.by_day[0][0] is None)
+
+
+def _vectorizable(rule: RRule) -> bool:
+    """COUNT und (allgemeines) BYSETPOS brauchen die Perioden-Logik → skalar"""
+    return not rule.count and (not rule.by_set_pos or _set_pos_as_by_day(rule))
+
+
+def expand_batch(rules: Dict[str, RRule], start, end) -> List[Tuple[str, date]]:
+    """
+    Expandiert alle Regeln im Fenster [start, end] in einem Durchlauf
+
+    Baut eine Maske (Regeln × Tage) aus numpy-datetime64-Arrays:
+    Wochentags-/Positions-Masken für BYDAY, Monatstag-Masken für
+    BYMONTHDAY, Perioden-Modulo für INTERVAL, DTSTART/UNTIL-Grenzen,
+    dann RDATE setzen und EXDATE löschen. Regeln mit BYSETPOS oder COUNT
+    laufen über die skalare Engine. Ohne numpy: expand_scalar().
+
+    Returns:
+        [(series_id, date), ...] wie expand_scalar()
+    """
+    start, end = parse_date(start), parse_date(end)
+    if np is None or end < start:
+        return expand_scalar(rules, start, end)
+
+    ids = list(rules)
+    vector_rows = [i for i, series_id in enumerate(ids) if _vectorizable(rules[series_id])]
+    table = [
+        (i, day) for i, series_id in enumerate(ids) if not _vectorizable(rules[series_id])
+        for day in rules[series_id].between(start, end)
+    ]
+
+    if vector_rows:
+        # Tages-Achse
+        days = np.arange(np.datetime64(start, 'D'), np.datetime64(end, 'D') + 1)
+        day_num = days.astype('int64')
+        month_start = days.astype('datetime64[M]')
+        month_num = month_start.astype('int64')
+        year = month_num // 12 + 1970
+        month_of_year = month_num % 12 + 1
+        weekday = (day_num + 3) % 7  # 1970-01-01 war ein Donnerstag
+        dom = (days - month_start.astype('datetime64[D]')).astype('int64') + 1
+        dim = ((month_start + 1).astype('datetime64[D]') - month_start.astype('datetime64[D]')).astype('int64')
+        nth = (dom - 1) // 7 + 1             # 1..5
+        nth_from_end = -((dim - dom) // 7 + 1)  # -1..-5
+
+        # Regel-Achse
+        n = len(vector_rows)
+        freq = np.zeros(n, dtype='int64')
+        interval = np.ones(n, dtype='int64')
+        anchor = np.zeros(n, dtype='int64')
+        first = np.zeros(n, dtype='int64')
+        last = np.full(n, np.iinfo('int64').max)
+        start_month = np.zeros(n, dtype='int64')
+        has_by_day = np.zeros(n, dtype=bool)
+        has_month_day = np.zeros(n, dtype=bool)
+        by_day_any = np.zeros((n, 7), dtype=bool)
+        by_day_pos = np.zeros((n, 7, 11), dtype=bool)  # Position -5..5 → 0..10
+        month_day_pos = np.zeros((n, 32), dtype=bool)
+        month_day_neg = np.zeros((n, 32), dtype=bool)
+        set_rows, set_cols, clear_rows, clear_cols = [], [], [], []
+
+        for row, i in enumerate(vector_rows):
+            rule = rules[ids[i]]
+            dtstart = rule.dtstart
+            freq[row] = FREQ_CODES[rule.freq]
+            interval[row] = rule.interval
+            first[row] = (dtstart - date(1970, 1, 1)).days
+            if rule.until:
+                last[row] = (rule.until - date(1970, 1, 1)).days
+            start_month[row] = dtstart.month
+            anchor[row] = {
+                'DAILY': first[row],
+                'WEEKLY': first[row] - dtstart.weekday(),
+                'MONTHLY': (dtstart.year - 1970) * 12 + dtstart.month - 1,
+                'YEARLY': dtstart.year,
+            }[rule.freq]
+
+            has_by_day[row] = bool(rule.by_day)
+            by_day = rule.by_day
+            if rule.by_set_pos:
+                by_day = [(position, rule.by_day[0][1]) for position in rule.by_set_pos]
+            for position, wd in by_day:
+                if position is None or rule.freq in ('DAILY', 'WEEKLY'):
+                    by_day_any[row, wd] = True
+                elif abs(position) <= 5:
+                    by_day_pos[row, wd, position + 5] = True
+
+            # WEEKLY ignoriert BYMONTHDAY (wie RRule._period)
+            if rule.by_month_day and rule.freq != 'WEEKLY':
+                has_month_day[row] = True
+                for day in rule.by_month_day:
+                    if day > 0:
+                        month_day_pos[row, day] = True
+                    else:
+                        month_day_neg[row, -day] = True
+
+            for day in rule.rdates:
+                if start <= day <= end:
+                    set_rows.append(row)
+                    set_cols.append((day - start).days)
+            for day in rule.exdates:
+                if day and start <= day <= end:
+                    clear_rows.append(row)
+                    clear_cols.append((day - start).days)
+
+        # Periode je Regel/Tag (in FREQ-Einheiten ab Anker)
+        unit = np.where(
+            (freq == 0)[:, None], day_num[None, :],
+            np.where((freq == 1)[:, None], day_num[None, :],
+                     np.where((freq == 2)[:, None], month_num[None, :], year[None, :]))
+        )
+        period = unit - anchor[:, None]
+        period = np.where((freq == 1)[:, None], period // 7, period)
+
+        mask = (period % interval[:, None] == 0)
+        mask &= (day_num[None, :] >= first[:, None]) & (day_num[None, :] <= last[:, None])
+
+        by_day_match = (by_day_any[:, weekday]
+                        | by_day_pos[:, weekday, nth + 5]
+                        | by_day_pos[:, weekday, nth_from_end + 5])
+        month_day_match = month_day_pos[:, dom] | month_day_neg[:, dim - dom + 1]
+        mask &= ~has_by_day[:, None] | by_day_match
+        mask &= ~has_month_day[:, None] | month_day_match
+        mask &= (freq != 3)[:, None] | (month_of_year[None, :] == start_month[:, None])
+
+        mask[set_rows, set_cols] = True
+        mask[clear_rows, clear_cols] = False
+
+        rows, cols = np.nonzero(mask)
+        dates = days[cols].astype(object)
+        row_ids = np.asarray(vector_rows)[rows]
+        table.extend(zip(row_ids.tolist(), dates.tolist()))
+
+    table.sort()
+    return [(ids[i], day) for i, day in table]
+
+
+# ============================================================
+# Paritäts-Checks
+# ============================================================
+
+def random_config(rng: random.Random) -> Dict:
+    """Zufällige recurring-Konfiguration für Paritäts-Checks und Benchmarks"""
+    dtstart = date(2020, 1, 1) + timedelta(days=rng.randint(0, 2500))
+    config = {
+        'frequency': rng.choice(list(CONFIG_FREQUENCIES)),
+        'interval': rng.randint(1, 4),
+        'start_date': dtstart.isoformat(),
+    }
+    if rng.random() < 0.6:
+        config['by_day'] = [
+            rng.choice(['', '', '1', '2', '-1', '5']) + day
+            if config['frequency'] in ('monthly', 'yearly') else day
+            for day in rng.sample(WEEKDAYS, rng.randint(1, 3))
+        ]
+    if rng.random() < 0.3:
+        config['by_month_day'] = rng.sample([1, 13, 15, 29, 30, 31, -1, -2], rng.randint(1, 2))
+    if rng.random() < 0.3 and (config.get('by_day') or config.get('by_month_day')):
+        config['by_set_pos'] = rng.choice([1, 2, -1, [1, -1]])
+    if rng.random() < 0.3:
+        config['count'] = rng.randint(1, 30)
+    if rng.random() < 0.3:
+        config['end_date'] = (dtstart + timedelta(days=rng.randint(0, 900))).isoformat()
+    config['exceptions'] = [(dtstart + timedelta(days=rng.randint(0, 400))).isoformat()
+                            for _ in range(rng.randint(0, 3))]
+    config['additions'] = [(dtstart + timedelta(days=rng.randint(-20, 400))).isoformat()
+                           for _ in range(rng.randint(0, 2))]
+    return config
+
+
+def check_parity(samples: int = 2000, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Randomisierter Vergleich between() vs. daywalk()
+
+    Returns:
+        Liste der Abweichungen (leer = identisch)
+    """
+    rng = random.Random(seed)
+    mismatches = []
+
+    for _ in range(samples):
+        config = random_config(rng)
+        rule = RRule.from_config(config)
+        window_start = rule.dtstart + timedelta(days=rng.randint(-30, 900))
+        window_end = window_start + timedelta(days=rng.randint(0, 400))
+
+        expected = rule.daywalk(window_start, window_end)
+        actual = rule.between(window_start, window_end)
+        if actual != expected:
+            mismatches.append({
+                'config': config,
+                'window': (window_start.isoformat(), window_end.isoformat()),
+                'expected': [d.isoformat() for d in expected[:5]],
+                'actual': [d.isoformat() for d in actual[:5]],
+            })
+
+    return mismatches
+
+
+def check_batch_parity(samples: int = 200, series: int = 50, seed: Optional[int] = None) -> List[Dict]:
+    """
+    Randomisierter Vergleich expand_batch() vs. expand_scalar()
+
+    Jede Stichprobe expandiert `series` zufällige Regeln in einem Fenster.
+
+    Returns:
+        Liste der Abweichungen (leer = identisch)
+    """
+    rng = random.Random(seed)
+    mismatches = []
+
+    for _ in range(samples):
+        configs = {f"s{i}": random_config(rng) for i in range(series)}
+        rules = {series_id: RRule.from_config(config) for series_id, config in configs.items()}
+        window_start = date(2020, 1, 1) + timedelta(days=rng.randint(-30, 3000))
+        window_end = window_start + timedelta(days=rng.randint(-1, 400))
+
+        expected = expand_scalar(rules, window_start, window_end)
+        actual = expand_batch(rules, window_start, window_end)
+        if actual != expected:
+            missing = sorted(set(expected) - set(actual))[:5]
+            extra = sorted(set(actual) - set(expected))[:5]
+            series_id = (missing or extra or [(None,)])[0][0]
+            mismatches.append({
+                'config': configs.get(series_id),
+                'window': (window_start.isoformat(), window_end.isoformat()),
+                'expected': [f"{s}:{d.isoformat()}" for s, d in missing],
+                'actual': [f"{s}:{d.isoformat()}" for s, d in extra],
+            })
+
+    return mismatches
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and not sys.argv[1].startswith('--check'):
+        rule = RRule.parse(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else date.today())
+        print(f"📅 {rule}")
+        for occurrence in rule.between(date.today(), date.today() + timedelta(days=365))[:10]:
+            print(f"  {occurrence.isoformat()} ({WEEKDAYS[occurrence.weekday()]})")
+    else:
+        batch = len(sys.argv) > 1 and sys.argv[1] == '--check-batch-parity'
+        samples = int(sys.argv[2]) if len(sys.argv) > 2 else (200 if batch else 2000)
+        mismatches = check_batch_parity(samples) if batch else check_parity(samples)
+        label = "Batch-Paritäts-Check" if batch else "Paritäts-Check"
+        print(f"🔁 {label}: {samples} Fälle, {len(mismatches)} Abweichungen")
+        for mismatch in mismatches[:5]:
+            print(f"   ❌ {mismatch['config']} {mismatch['window']}")
+            print(f"      erwartet: {mismatch['expected']}")
+            print(f"      erhalten: {mismatch['actual']}")
@@ -230,7 +230,7 @@ class Event:
 class EventCollection:
     """
     Collection von Events mit Metadaten
-    Repräsentiert _data/events.json oder Staging-Files
+    Repräsentiert Produktiv-Daten (_data/events/, siehe event_store) oder Staging-Files
     """
     version: str = "2.0"
     schema: str = "https://krawl.ist/schema/events-v2.json"
@@ -239,18 +239,91 @@ class EventCollection:
     meta: Dict = field(default_factory=dict)
     events: List[Event] = field(default_factory=list)
     
+    # ID → Position in events (gepflegt von add_event/upsert/extend/remove/sort;
+    # nach direkten Änderungen an events ist reindex() nötig)
+    _index: Dict[str, int] = field(default_factory=dict, init=False, repr=False, compare=False)
+    _indexed: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.reindex()
+    
+    def reindex(self):
+        """
+        Baut die ID-Map neu auf
+        Nötig nach direkten Änderungen an self.events (Zuweisen, Einfügen,
+        Umsortieren). Erkannt werden nur eine geänderte Länge und Treffer,
+        deren Position inzwischen ein anderes Event hält - eine per
+        events[i] = ... ersetzte ID wird ohne reindex() nicht gefunden.
+        """
+        self._index = {}
+        for position, event in enumerate(self.events):
+            self._index.setdefault(event.id, position)
+        self._indexed = len(self.events)
+    
+    def _position(self, event_id: str) -> Optional[int]:
+        if self._indexed != len(self.events):
+            self.reindex()
+        position = self._index.get(event_id)
+        if position is not None and self.events[position].id != event_id:
+            self.reindex()
+            position = self._index.get(event_id)
+        return position
+    
+    def __contains__(self, item) -> bool:
+        """Event oder Event-ID in der Collection?"""
+        event_id = getattr(item, 'id', item)
+        return self._position(event_id) is not None
+    
+    def get(self, event_id: str) -> Optional[Event]:
+        """Event per ID (None wenn nicht vorhanden)"""
+        position = self._position(event_id)
+        return self.events[position] if position is not None else None
+    
     def add_event(self, event: Event) -> bool:
         """
-        Fügt Event hinzu (mit Duplikat-Check)
+        Fügt Event hinzu (mit Duplikat-Check über die ID-Map)
         Returns: True wenn hinzugefügt, False wenn Duplikat
         """
-        for existing in self.events:
-            if existing.is_duplicate(event):
-                return False
+        if event in self:
+            return False
         
+        self._index[event.id] = len(self.events)
         self.events.append(event)
+        self._indexed = len(self.events)
         return True
     
+    def extend(self, events) -> int:
+        """
+        Fügt mehrere Events hinzu (Duplikate werden übersprungen)
+        Returns: Anzahl hinzugefügter Events
+        """
+        return sum(1 for event in events if self.add_event(event))
+    
+    def upsert(self, event: Event) -> bool:
+        """
+        Ersetzt das Event mit gleicher ID bzw. fügt es hinzu
+        Returns: True wenn neu hinzugefügt, False wenn ersetzt
+        """
+        position = self._position(event.id)
+        if position is None:
+            return self.add_event(event)
+        self.events[position] = event
+        return False
+    
+    def remove(self, event_id: str) -> Optional[Event]:
+        """Entfernt ein Event per ID (nachfolgende Positionen werden verschoben)"""
+        position = self._position(event_id)
+        if position is None:
+            return None
+        event = self.events.pop(position)
+        self.reindex()
+        return event
+    
+    def sort(self, key=None, reverse: bool = False):
+        """Sortiert events und hält die ID-Map aktuell"""
+        self.events.sort(key=key, reverse=reverse)
+        self.reindex()
+    
     def to_dict(self) -> Dict:
         """Konvertiert zu JSON-serialisierbarem Dict"""
         return {
@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Spatial Index für krawl.ist
+Grid-Index über Venue- und Event-Koordinaten mit vektorisierter
+Haversine-Distanz (numpy, falls installiert).
+
+Abfragen:
+- within(lat, lng, radius_km)  → alle Einträge im Umkreis (nach Distanz)
+- nearest(lat, lng, k)         → die k nächsten Einträge
+
+Nutzung als CLI:
+    python3 scripts/lib/spatial_index.py --radius 3
+    python3 scripts/lib/spatial_index.py --venues --nearest 5 --lat 50.32 --lng 11.92
+"""
+
+import math
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import yaml
+
+try:
+    import numpy as np
+except ImportError:
+    np = None  # Fallback: reine Python-Schleife
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+EVENTS_DIR = PROJECT_ROOT / "_events"
+CONFIG_FILE = PROJECT_ROOT / "_config.yml"
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = 111.32
+
+# "Gleicher Ort": Koordinaten höchstens 50 m auseinander
+SAME_VENUE_KM = 0.05
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Großkreis-Distanz zweier Punkte in km"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def haversine_many(lat: float, lng: float, lats: List[float], lngs: List[float]) -> List[float]:
+    """Distanzen (km) von einem Punkt zu vielen Punkten in einem Schritt"""
+    if np is None:
+        return [haversine_km(lat, lng, la, ln) for la, ln in zip(lats, lngs)]
+    phi = np.radians(np.asarray(lats, dtype=np.float64))
+    lmb = np.radians(np.asarray(lngs, dtype=np.float64))
+    phi0, lmb0 = math.radians(lat), math.radians(lng)
+    a = np.sin((phi - phi0) / 2) ** 2 + math.cos(phi0) * np.cos(phi) * np.sin((lmb - lmb0) / 2) ** 2
+    return (2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))).tolist()
+
+
+def pairwise_within(coords: List[Optional[Tuple[float, float]]], max_km: float) -> List[List[bool]]:
+    """
+    Paarweise Nähe-Matrix: True, wenn beide Koordinaten gesetzt und ≤ max_km entfernt
+
+    Mit numpy als ein Broadcast über alle Paare, sonst als Doppelschleife.
+    """
+    n = len(coords)
+    if np is None:
+        return [[bool(coords[i] and coords[j]
+                      and haversine_km(*coords[i], *coords[j]) <= max_km)
+                 for j in range(n)] for i in range(n)]
+    known = np.array([c is not None for c in coords])
+    values = np.array([c if c is not None else (0.0, 0.0) for c in coords], dtype=np.float64)
+    phi = np.radians(values[:, 0])
+    lmb = np.radians(values[:, 1])
+    a = np.sin((phi[:, None] - phi[None, :]) / 2) ** 2 \
+        + np.cos(phi)[:, None] * np.cos(phi)[None, :] * np.sin((lmb[:, None] - lmb[None, :]) / 2) ** 2
+    distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+    return (distances <= max_km) & known[:, None] & known[None, :]
+
+
+def coords_of(data: Dict) -> Optional[Tuple[float, float]]:
+    """Liest Koordinaten aus Event-/Venue-/Place-Dicts (coordinates, coords oder lat/lng)"""
+    if not isinstance(data, dict):
+        return None
+    for key in ('coordinates', 'coords'):
+        value = data.get(key)
+        if isinstance(value, dict):
+            data = value
+            break
+    try:
+        lat, lng = data.get('lat'), data.get('lng')
+        if lat in (None, '') or lng in (None, ''):
+            return None
+        return float(lat), float(lng)
+    except (TypeError, ValueError):
+        return None
+
+
+class SpatialIndex:
+    """
+    Gleichmäßiges Grid (Zellgröße in km) über Koordinaten
+
+    Umkreis-Abfragen prüfen nur die Zellen, die der Kreis berührt, und
+    berechnen die Distanzen für deren Einträge vektorisiert.
+    """
+
+    def __init__(self, cell_km: float = 1.0):
+        self.cell_km = cell_km
+        self.cell_lat = cell_km / KM_PER_DEGREE_LAT
+        self.cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self.lats: List[float] = []
+        self.lngs: List[float] = []
+        self.items: List[Any] = []
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def _cell_lng(self, lat: float) -> float:
+        """Zellbreite in Grad Länge (abhängig von der Breite)"""
+        return self.cell_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+
+    def _cell(self, lat: float, lng: float) -> Tuple[int, int]:
+        row = math.floor(lat / self.cell_lat)
+        # Spaltenbreite über die Zeilenmitte, damit sie pro Zeile konstant ist
+        return row, math.floor(lng / self._cell_lng((row + 0.5) * self.cell_lat))
+
+    def add(self, lat: float, lng: float, item: Any) -> None:
+        """Fügt einen Eintrag (beliebiges Objekt) an einer Koordinate hinzu"""
+        position = len(self.items)
+        self.items.append(item)
+        self.lats.append(lat)
+        self.lngs.append(lng)
+        self.cells[self._cell(lat, lng)].append(position)
+
+    def _positions_near(self, lat: float, lng: float, radius_km: float) -> List[int]:
+        """Positionen aller Einträge in Zellen, die der Umkreis berühren kann"""
+        dlat = radius_km / KM_PER_DEGREE_LAT
+        row_min = math.floor((lat - dlat) / self.cell_lat)
+        row_max = math.floor((lat + dlat) / self.cell_lat)
+        positions = []
+        for row in range(row_min, row_max + 1):
+            row_lat = (row + 0.5) * self.cell_lat
+            # Breitengrad der Zeile mit der kleinsten Länge pro Grad (polwärts)
+            edge_lat = max(abs(lat) + dlat, abs(row_lat) + self.cell_lat)
+            dlng = radius_km / (KM_PER_DEGREE_LAT * max(math.cos(math.radians(min(edge_lat, 89.9))), 0.01))
+            cell_lng = self._cell_lng(row_lat)
+            for col in range(math.floor((lng - dlng) / cell_lng), math.floor((lng + dlng) / cell_lng) + 1):
+                positions.extend(self.cells.get((row, col), ()))
+        return positions
+
+    def within(self, lat: float, lng: float, radius_km: float) -> List[Tuple[Any, float]]:
+        """Alle Einträge im Umkreis als (Eintrag, Distanz km), nächste zuerst"""
+        positions = self._positions_near(lat, lng, radius_km)
+        if not positions:
+            return []
+        distances = haversine_many(lat, lng,
+                                   [self.lats[p] for p in positions],
+                                   [self.lngs[p] for p in positions])
+        hits = [(self.items[p], d) for p, d in zip(positions, distances) if d <= radius_km]
+        hits.sort(key=lambda hit: hit[1])
+        return hits
+
+    def nearest(self, lat: float, lng: float, k: int = 5,
+                max_km: Optional[float] = None) -> List[Tuple[Any, float]]:
+        """
+        Die k nächsten Einträge (optional höchstens max_km entfernt)
+
+        Vergrößert den Suchradius schrittweise, bis k Treffer sicher sind.
+        """
+        if not self.items:
+            return []
+        radius = self.cell_km
+        while True:
+            hits = self.within(lat, lng, radius if max_km is None else min(radius, max_km))
+            if len(hits) >= k or len(hits) == len(self.items) \
+                    or (max_km is not None and radius >= max_km) or radius > 2 * math.pi * EARTH_RADIUS_KM:
+                return hits[:k]
+            radius *= 2
+
+    def to_payload(self) -> Dict:
+        """JSON-serialisierbarer Index (ohne Einträge, nur Positionen)"""
+        return {
+            'cell_km': self.cell_km,
+            'lats': self.lats,
+            'lngs': self.lngs,
+            'cells': {f"{row},{col}": positions for (row, col), positions in self.cells.items()}
+        }
+
+    @classmethod
+    def from_payload(cls, payload: Dict, items: List[Any]) -> 'SpatialIndex':
+        """Stellt einen Index aus to_payload() wieder her (items in gleicher Reihenfolge)"""
+        index = cls(payload['cell_km'])
+        index.items = list(items)
+        index.lats = list(payload['lats'])
+        index.lngs = list(payload['lngs'])
+        for key, positions in payload['cells'].items():
+            row, col = key.split(',')
+            index.cells[(int(row), int(col))] = list(positions)
+        return index
+
+    @classmethod
+    def from_items(cls, items: Iterable[Tuple[Any, Optional[Tuple[float, float]]]],
+                   cell_km: float = 1.0) -> 'SpatialIndex':
+        """Baut einen Index aus (Eintrag, (lat, lng))-Paaren; ohne Koordinaten wird übersprungen"""
+        index = cls(cell_km)
+        for item, coords in items:
+            if coords:
+                index.add(coords[0], coords[1], item)
+        return index
+
+
+# ============================================================
+# Loader
+# ============================================================
+
+def load_event_records(events_dir: Path = EVENTS_DIR) -> List[Dict]:
+    """Front Matter aller Markdown-Events (mit '_path' relativ zum Projekt)"""
+    records = []
+    if not events_dir.exists():
+        return records
+    for filepath in sorted(events_dir.glob("*.md")):
+        try:
+            with open(filepath, 'r', encoding='utf-8') as f:
+                content = f.read()
+            if not content.startswith('---'):
+                continue
+            parts = content.split('---', 2)
+            if len(parts) < 3:
+                continue
+            data = yaml.safe_load(parts[1])
+            if isinstance(data, dict):
+                try:
+                    data['_path'] = str(filepath.relative_to(PROJECT_ROOT))
+                except ValueError:
+                    data['_path'] = str(filepath)
+                records.append(data)
+        except Exception as e:
+            print(f"⚠️  Fehler beim Lesen von {filepath.name}: {e}")
+    return records
+
+
+def build_event_index(events: Optional[List[Dict]] = None, cell_km: float = 1.0) -> SpatialIndex:
+    """Spatial Index über Events (Markdown-Front-Matter, falls nicht übergeben)"""
+    if events is None:
+        events = load_event_records()
+    return SpatialIndex.from_items(((e, coords_of(e)) for e in events), cell_km)
+
+
+def build_venue_index(venues: Optional[List[Dict]] = None, cell_km: float = 1.0) -> SpatialIndex:
+    """Spatial Index über Venues (default: vorberechnet aus der Venue-Registry)"""
+    if venues is None:
+        from venue_registry import get_venue_registry
+        return get_venue_registry().spatial
+    return SpatialIndex.from_items(((v, coords_of(v)) for v in venues), cell_km)
+
+
+def load_city_center(config_file: Path = CONFIG_FILE) -> Tuple[float, float]:
+    """Stadtzentrum aus _config.yml (city.center, sonst default_center)"""
+    with open(config_file, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f)
+    center = (config.get('city') or {}).get('center') or config.get('default_center') or {}
+    return float(center['lat']), float(center['lng'])
+
+
+def radius_membership(index: SpatialIndex, center: Tuple[float, float],
+                      radii_km: Iterable[float], key: str = '_path') -> Dict[str, List[str]]:
+    """
+    Welche Einträge liegen in welchem Radius?
+
+    Eine Abfrage mit dem größten Radius; kleinere Radien werden aus den
+    sortierten Distanzen abgeleitet.
+
+    Returns:
+        {"1": [pfad, ...], "3": [...], ...} (Schlüssel wie in _config.yml)
+    """
+    radii = sorted({float(r) for r in radii_km})
+    if not radii:
+        return {}
+    hits = index.within(center[0], center[1], radii[-1])
+    result = {}
+    for radius in radii:
+        label = f"{radius:g}"
+        result[label] = [item.get(key) for item, distance in hits if distance <= radius]
+    return result
+
+
+# ============================================================
+# CLI
+# ============================================================
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Umkreis-Abfragen über Events und Venues')
+    parser.add_argument('--lat', type=float, help='Breitengrad (default: Stadtzentrum)')
+    parser.add_argument('--lng', type=float, help='Längengrad (default: Stadtzentrum)')
+    parser.add_argument('--radius', type=float, default=3.0, help='Radius in km (default: 3)')
+    parser.add_argument('--nearest', type=int, metavar='K', help='Statt Umkreis: die K nächsten Einträge')
+    parser.add_argument('--venues', action='store_true', help='Venues statt Events abfragen')
+    args = parser.parse_args()
+
+    center_lat, center_lng = load_city_center()
+    lat = args.lat if args.lat is not None else center_lat
+    lng = args.lng if args.lng is not None else center_lng
+
+    index = build_venue_index() if args.venues else build_event_index()
+    kind = 'Venues' if args.venues else 'Events'
+    print(f"📍 {len(index)} {kind} mit Koordinaten, Punkt {lat:.4f}, {lng:.4f}")
+
+    if args.nearest:
+        hits = index.nearest(lat, lng, args.nearest)
+        print(f"\n🔎 {len(hits)} nächste {kind}:")
+    else:
+        hits = index.within(lat, lng, args.radius)
+        print(f"\n🔎 {len(hits)} {kind} im Umkreis von {args.radius:g} km:")
+
+    for item, distance in hits:
+        label = item.get('name') or item.get('title', '?')
+        suffix = f" ({item['date']})" if item.get('date') else ''
+        print(f"  {distance:6.2f} km  {label}{suffix}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Venue Registry für krawl.ist
+Vereint _data/venues.csv und _data/places/*.json in einem kompilierten
+Artefakt (.cache/venues.json) mit:
+
+- Venues (Booleans/Aliases bereits konvertiert, Places ergänzt)
+- Namens-Index (normalisierter Name/Alias → Venue)
+- Trigramm-Index für Fuzzy-Matching
+- Spatial Index (Grid) über die Koordinaten
+- Places im JSON-Schema (lib.schemas.Place) je Slug
+
+Das Artefakt wird neu gebaut, sobald sich venues.csv oder ein Place ändert;
+alle Tools laden es mit einem einzigen Dateizugriff.
+"""
+
+import csv
+import json
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from compiled_cache import load_compiled
+from spatial_index import SpatialIndex, coords_of
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+VENUES_CSV = PROJECT_ROOT / "_data" / "venues.csv"
+PLACES_DIR = PROJECT_ROOT / "_data" / "places"
+
+REGISTRY_VERSION = 1
+
+BOOL_FIELDS = ['wheelchair_accessible', 'wheelchair_toilet', 'parking', 'public_transport']
+
+
+def normalize_name(name: str) -> str:
+    """Normalisiert Namen für Vergleiche (wie VenueManager._normalize_name)"""
+    if not name:
+        return ""
+    name = name.lower().strip()
+    name = re.sub(r'\s+', ' ', name)
+    name = re.sub(r'[^\w\s]', '', name)
+    return name
+
+
+def trigrams(text: str) -> set:
+    """Zeichen-Trigramme mit Rand-Padding ("  hof " → "  h", " ho", "hof", "of ")"""
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def parse_venue_row(row: Dict) -> Dict:
+    """Konvertiert eine venues.csv-Zeile (Booleans, Aliases als Liste)"""
+    for bool_field in BOOL_FIELDS:
+        if row.get(bool_field):
+            row[bool_field] = row[bool_field].lower() == 'true'
+    if row.get('aliases'):
+        row['aliases'] = [a.strip() for a in row['aliases'].split(',')]
+    else:
+        row['aliases'] = []
+    return row
+
+
+def place_to_venue(place: Dict) -> Dict:
+    """Bringt einen Place (_data/places/*.json) in das Venue-Format von venues.csv"""
+    coords = place.get('coords') or {}
+    capacity = place.get('capacity')
+    return {
+        'name': place['name'],
+        'aliases': [],
+        'address': place.get('address', '') or '',
+        'lat': str(coords['lat']) if coords.get('lat') is not None else '',
+        'lng': str(coords['lng']) if coords.get('lng') is not None else '',
+        'wheelchair_accessible': bool(place.get('wheelchair_accessible', False)),
+        'public_transport': bool(place.get('public_transport', False)),
+        'website': place.get('website') or '',
+        'phone': place.get('phone') or '',
+        'capacity': str(capacity) if capacity is not None else '',
+        'icon': place.get('icon', ''),
+        'color': place.get('color', ''),
+        'slug': place.get('slug', ''),
+    }
+
+
+def build_name_index(venues: List[Dict]) -> Tuple[Dict[str, int], Dict[str, List[str]]]:
+    """
+    Namens- und Trigramm-Index über Venues
+
+    Returns:
+        (normalisierter Name/Alias → Position in venues,
+         Trigramm → normalisierte Namen in Index-Reihenfolge)
+    """
+    name_index: Dict[str, int] = {}
+    for position, venue in enumerate(venues):
+        name_index[normalize_name(venue['name'])] = position
+        for alias in venue['aliases']:
+            name_index[normalize_name(alias)] = position
+
+    trigram_index: Dict[str, List[str]] = {}
+    for name in name_index:
+        for trigram in trigrams(name):
+            trigram_index.setdefault(trigram, []).append(name)
+    return name_index, trigram_index
+
+
+def build_registry_payload(venues_csv: Path = VENUES_CSV, places_dir: Path = PLACES_DIR) -> Dict:
+    """Parst CSV + Places und berechnet alle Indizes"""
+    venues: List[Dict] = []
+    if venues_csv.exists():
+        with open(venues_csv, 'r', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                venues.append(parse_venue_row(row))
+
+    # Places: ergänzen gleichnamige CSV-Venues, sonst eigener Eintrag
+    by_name = {normalize_name(v['name']): v for v in venues}
+    for v in venues:
+        for alias in v['aliases']:
+            by_name.setdefault(normalize_name(alias), v)
+
+    places: Dict[str, Dict] = {}
+    if places_dir.exists():
+        for json_file in sorted(places_dir.glob("*.json")):
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    place = json.load(f)
+            except Exception as e:
+                print(f"⚠️  Error loading place {json_file}: {e}")
+                continue
+            places[place.get('slug') or json_file.stem] = place
+
+            venue = by_name.get(normalize_name(place.get('name', '')))
+            if venue is None:
+                venue = place_to_venue(place)
+                venues.append(venue)
+                by_name[normalize_name(venue['name'])] = venue
+            else:
+                venue.setdefault('slug', place.get('slug', ''))
+                for key, value in place_to_venue(place).items():
+                    if value and not venue.get(key):
+                        venue[key] = value
+
+    name_index, trigram_index = build_name_index(venues)
+    spatial = SpatialIndex.from_items((position, coords_of(v)) for position, v in enumerate(venues))
+
+    return {
+        'venues': venues,
+        'name_index': name_index,
+        'trigram_index': trigram_index,
+        'spatial': spatial.to_payload(),
+        'spatial_positions': spatial.items,
+        'places': places,
+    }
+
+
+class VenueRegistry:
+    """Kompilierte Venues mit Namens-, Trigramm- und Spatial-Index"""
+
+    def __init__(self, payload: Dict):
+        self.venues: List[Dict] = payload['venues']
+        self.name_index: Dict[str, Dict] = {
+            name: self.venues[position] for name, position in payload['name_index'].items()
+        }
+        self.name_order: Dict[str, int] = {name: i for i, name in enumerate(payload['name_index'])}
+        self.trigram_index: Dict[str, List[str]] = payload['trigram_index']
+        self.spatial = SpatialIndex.from_payload(
+            payload['spatial'], [self.venues[p] for p in payload['spatial_positions']]
+        )
+        self.places: Dict[str, Dict] = payload['places']
+
+    def __len__(self) -> int:
+        return len(self.venues)
+
+    def get(self, name: str) -> Optional[Dict]:
+        """Exakter Lookup über Name oder Alias"""
+        return self.name_index.get(normalize_name(name))
+
+    def nearest(self, lat: float, lng: float, k: int = 5, max_km: Optional[float] = None):
+        """Die k nächsten Venues als (Venue, Distanz km)"""
+        return self.spatial.nearest(lat, lng, k, max_km)
+
+
+_REGISTRY: Optional[VenueRegistry] = None
+
+
+def get_venue_registry(refresh: bool = False) -> VenueRegistry:
+    """
+    Gemeinsame Registry-Instanz
+
+    refresh=True prüft die Quellen erneut (z.B. nach einem Schreibzugriff
+    auf venues.csv) und baut bei Änderungen neu.
+    """
+    global _REGISTRY
+    if _REGISTRY is None or refresh:
+        payload = load_compiled(
+            'venues',
+            [VENUES_CSV, PLACES_DIR],
+            build_registry_payload,
+            version=REGISTRY_VERSION
+        )
+        _REGISTRY = VenueRegistry(payload)
+    return _REGISTRY
+
+
+# ============================================================
+# CLI Helper (für Testing)
+# ============================================================
+
+if __name__ == "__main__":
+    registry = get_venue_registry()
+    print(f"📍 {len(registry)} Venues ({len(registry.places)} Places), "
+          f"{len(registry.name_index)} Namen/Aliases, {len(registry.trigram_index)} Trigramme")
+    for venue, distance in registry.nearest(50.3197, 11.9168, 3):
+        print(f"  {distance:5.2f} km  {venue['name']}")
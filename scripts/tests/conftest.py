@@ -0,0 +1,14 @@
+"""
+Gemeinsame Einstellungen für die Python-Tests (pytest)
+
+Die Skripte importieren ihre Module ohne Paket-Präfix (z.B. `from rrule import RRule`);
+die Tests machen scripts/lib und die Skript-Ordner genauso importierbar.
+"""
+
+import sys
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).parent.parent
+
+for folder in ('lib', 'editorial', 'validation'):
+    sys.path.insert(0, str(SCRIPTS_DIR / folder))
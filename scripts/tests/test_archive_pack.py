@@ -0,0 +1,40 @@
+"""
+Tests für archive_pack: Monats-Packs mit wahlfreiem Zugriff
+"""
+
+import pytest
+
+from archive_pack import BLOCK_RECORDS, ArchivePack, iter_pack, write_pack
+
+
+def markdown(title, body='', event_hash=''):
+    return f"---\ntitle: {title}\ndate: 2025-01-15\nevent_hash: '{event_hash}'\n---\n{body}\n"
+
+
+# Zeichen, an denen str.splitlines() zusätzlich zu '\n' trennt und die
+# json.dumps(ensure_ascii=False) nicht escaped
+@pytest.mark.parametrize('separator', ['\u2028', '\u2029', '\x85'])
+def test_read_content_with_unicode_line_separators(tmp_path, separator):
+    entries = [
+        ('2025-01-15-a.md', markdown('A', f"Zeile 1{separator}Zeile 2", 'hash-a')),
+        ('2025-01-15-b.md', markdown('B', 'Text', 'hash-b')),
+    ]
+    write_pack('202501', entries, tmp_path)
+    pack = ArchivePack('202501', tmp_path)
+
+    assert pack.get('2025-01-15-a.md') == entries[0][1]
+    assert pack.get('2025-01-15-b.md') == entries[1][1]
+    assert pack.by_hash('hash-b') == entries[1][1]
+    assert list(iter_pack(pack.pack_file)) == entries
+
+
+def test_read_across_blocks(tmp_path):
+    entries = [(f"2025-01-{i:04d}.md", markdown(f"Event {i}")) for i in range(BLOCK_RECORDS + 5)]
+    write_pack('202501', entries, tmp_path)
+    pack = ArchivePack('202501', tmp_path)
+
+    assert len(pack) == len(entries)
+    assert len(pack.index['blocks']) == 2
+    for name, content in (entries[0], entries[BLOCK_RECORDS], entries[-1], entries[1]):
+        assert pack.get(name) == content
+    assert pack.get('fehlt.md') is None
@@ -0,0 +1,31 @@
+"""Tests für scripts/lib/dedup_index.py"""
+
+from dedup_index import DedupIndex, dedup_key
+
+
+def _index_with(**event):
+    index = DedupIndex()
+    index.add_front_matter({'title': 'Hamlet', 'date': '2025-11-25', 'start_time': '15:00',
+                            'location': 'Theater Hof', 'event_hash': 'matinee', **event})
+    return index
+
+
+def test_key_includes_start_time():
+    assert dedup_key('2025-11-25', 'Jazz-Night', 'Freiheitshalle Hof', '20:00:00') == \
+        '2025-11-25|20:00|jazznight|freiheitshalle hof'
+
+
+def test_same_key_and_time_is_exact():
+    result = _index_with().query('Hamlet', '2025-11-25', 'Theater Hof', '15:00', ['other'])
+    assert result.is_duplicate
+
+
+def test_matinee_and_evening_show_are_not_exact_duplicates():
+    result = _index_with().query('Hamlet', '2025-11-25', 'Theater Hof', '20:00', ['evening'])
+    assert not result.is_duplicate
+    assert [record.start_time for record, _ in result.fuzzy] == ['15:00']
+
+
+def test_hash_match_is_exact_regardless_of_key():
+    result = _index_with().query('Hamlet (Matinee)', '2025-11-25', '', '', ['matinee'])
+    assert result.is_duplicate
@@ -0,0 +1,82 @@
+"""Tests für scripts/editorial/deduplication_engine.py (skalarer und NumPy-Pfad)"""
+
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from deduplication_engine import BlockScorer, DeduplicationEngine
+
+WORDS = ['party', 'jazz', 'night', 'konzert', 'markt', 'flohmarkt', 'lesung',
+         'kino', 'punk', 'open', 'air', 'tanz', 'disco']
+LOCATIONS = ['', '', 'freiheitshalle', 'theater hof', 'galeriehaus', 'bar', 'x']
+TIMES = ['', '20:00', '20:15', '21:00', '19:30']
+
+
+def _engine():
+    engine = DeduplicationEngine.__new__(DeduplicationEngine)
+    engine.clusters, engine.event_signatures = {}, {}
+    return engine
+
+
+def _clusters(items, vectorized):
+    return _engine().cluster_events(items, vectorized=vectorized)
+
+
+def _typo(rng, text):
+    if not text:
+        return text
+    i = rng.randrange(len(text))
+    char = rng.choice('abcdefghijklmnoprstu ')
+    return rng.choice([text[:i] + char + text[i + 1:], text[:i] + text[i + 1:], text[:i] + char + text[i:]])
+
+
+def _random_items(rng, size=30):
+    originals = [{
+        'title': ' '.join(rng.sample(WORDS, rng.randint(1, 3))),
+        'location': rng.choice(LOCATIONS),
+        'date': rng.choice(['2025-01-01', '2025-01-02']),
+        'start_time': rng.choice(TIMES),
+    } for _ in range(size // 2)]
+    events = list(originals)
+    while len(events) < size:
+        event = dict(rng.choice(originals))
+        for _ in range(rng.randint(0, 2)):
+            field = rng.choice(['title', 'location'])
+            event[field] = _typo(rng, event[field])
+        if rng.random() < 0.3:
+            event['start_time'] = rng.choice(TIMES)
+        events.append(event)
+    rng.shuffle(events)
+    return [(event, 'test') for event in events]
+
+
+def test_empty_locations_cluster_like_scalar_path():
+    items = [({'title': 'party', 'location': '', 'date': '2025-01-01', 'start_time': '20:00'}, 'a'),
+             ({'title': 'prrty', 'location': '', 'date': '2025-01-01', 'start_time': '20:00'}, 'b')]
+    scalar = _clusters(items, vectorized=False)
+    assert scalar[0] == scalar[1]
+    assert _clusters(items, vectorized=True) == scalar
+
+
+def test_typos_in_title_and_location_cluster_like_scalar_path():
+    items = [({'title': 'paunk', 'location': 'galerimhaus', 'date': '2025-01-01', 'start_time': '20:00'}, 'a'),
+             ({'title': 'punk', 'location': 'galrihaus', 'date': '2025-01-01', 'start_time': ''}, 'b')]
+    assert _clusters(items, vectorized=True) == _clusters(items, vectorized=False)
+
+
+def test_bound_is_never_below_scalar_score():
+    rng = random.Random(7)
+    engine = _engine()
+    events = [event for event, _ in _random_items(rng, 60)]
+    bound = BlockScorer().score_bound(events)
+    for i, first in enumerate(events):
+        for j, second in enumerate(events):
+            assert bound[i, j] >= engine.calculate_similarity(first, second) - 1e-9
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_random_sets_cluster_identically(seed):
+    items = _random_items(random.Random(seed))
+    assert _clusters(items, vectorized=True) == _clusters(items, vectorized=False)
@@ -0,0 +1,98 @@
+"""
+Tests für event_store: Monats-Shards mit Manifest
+"""
+
+import json
+
+from event_store import EventStore
+from schemas import Event
+
+
+def make_event(date, title):
+    return Event(id=f"id-{date}-{title}", title=title, date=date, start_time='20:00',
+                 meta={'hash': f"id-{date}-{title}"})
+
+
+EVENTS = [make_event('2025-01-10', 'A'), make_event('2025-01-03', 'B'), make_event('2025-02-01', 'C')]
+
+
+def saved_store(data_dir):
+    store = EventStore(data_dir, legacy_file=None)
+    for event in EVENTS:
+        store.add_event(event)
+    assert store.save() == ['2025-01', '2025-02']
+    return store
+
+
+def test_manifest_has_no_run_timestamp(tmp_path):
+    payload = saved_store(tmp_path).manifest_file.read_bytes()
+
+    assert payload.endswith(b'}\n')
+    manifest = json.loads(payload)
+    assert 'last_updated' not in manifest['meta']
+    assert manifest['meta']['total_events'] == 3
+    assert manifest['shards']['2025-01'] == {
+        'count': 2, 'first': '2025-01-03', 'last': '2025-01-10',
+        'sha256': manifest['shards']['2025-01']['sha256']
+    }
+
+
+def test_resave_keeps_manifest_bytes(tmp_path):
+    before = saved_store(tmp_path).manifest_file.read_bytes()
+
+    # Späterer Lauf mit denselben Daten: byte-gleiches Manifest
+    store = EventStore(tmp_path, legacy_file=None)
+    store.upsert(make_event('2025-02-01', 'C'))
+    assert store.save() == ['2025-02']
+    assert store.manifest_file.read_bytes() == before
+
+
+def test_reload_reads_only_requested_months(tmp_path):
+    saved_store(tmp_path)
+    store = EventStore(tmp_path, legacy_file=None)
+
+    assert store.verify() == []
+    assert store.total() == 3
+    assert [e.title for e in store.load('2025-01', '2025-01').events] == ['B', 'A']
+    assert set(store.shards) == {'2025-01'}
+    assert [e['title'] for e in store.iter_raw('2025-02')] == ['C']
+
+
+def test_legacy_meta_timestamp_is_dropped(tmp_path):
+    legacy = tmp_path / 'events.json'
+    legacy.write_text(json.dumps({
+        'version': '2.0', 'meta': {'last_updated': '2025-11-21T15:00:00', 'sources_scraped': 2},
+        'events': [EVENTS[0].to_dict()]
+    }), encoding='utf-8')
+    store = EventStore(tmp_path / 'events', legacy_file=legacy)
+    store.save()
+
+    manifest = json.loads(store.manifest_file.read_text(encoding='utf-8'))
+    assert manifest['meta'] == {'sources_scraped': 2, 'total_events': 1}
+    assert not legacy.exists()
+
+
+def test_upsert_moves_event_between_months(tmp_path):
+    saved_store(tmp_path)
+    store = EventStore(tmp_path, legacy_file=None)
+    moved = Event(id='id-2025-01-10-A', title='A', date='2025-02-10', start_time='20:00')
+
+    # Alter Januar-Shard ist nicht geladen: Kopie wird trotzdem gefunden
+    assert store.upsert(moved) is False
+    assert [e['title'] for e in store.iter_raw()] == ['B', 'C', 'A']
+    assert store.total() == 3
+    assert store.save() == ['2025-01', '2025-02']
+
+    store = EventStore(tmp_path, legacy_file=None)
+    assert store.verify() == []
+    assert store.locate('id-2025-01-10-A') == '2025-02'
+    assert [e['date'] for e in store.iter_raw() if e['title'] == 'A'] == ['2025-02-10']
+    assert store.manifest['shards']['2025-01']['count'] == 1
+
+
+def test_upsert_new_event_is_new(tmp_path):
+    saved_store(tmp_path)
+    store = EventStore(tmp_path, legacy_file=None)
+    assert store.upsert(make_event('2025-03-01', 'D')) is True
+    assert store.upsert(make_event('2025-03-01', 'D')) is False
+    assert store.total() == 4
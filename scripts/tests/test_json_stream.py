@@ -0,0 +1,94 @@
+"""
+Tests für json_stream: blockweises Lesen gegen json.loads
+
+Mit winzigen Blockgrößen fällt jede Blockgrenze einmal mitten in Zahlen
+("1." | "5", "2e" | "3"), Literale, Strings und Escapes.
+"""
+
+import json
+import random
+
+import pytest
+
+import json_stream
+from json_stream import find_by_hash, iter_array, read_header
+
+NUMBERS = [0, -1, 7, 1.5, -0.25, 1e21, 2.5e-08, 12345678901234567890, 3.0]
+
+
+def make_event(index, rng):
+    return {
+        'id': f"ev-{index}",
+        'title': f"Konzert \"{index}\" – Ü\\ber\n",
+        'meta': {'hash': f"h{index}", 'score': rng.choice(NUMBERS) * (index + 1)},
+        'coordinates': {'lat': 50.3 + index / 997, 'lng': -11.9 - index / 7},
+        'price': rng.choice(NUMBERS),
+        'tags': [rng.choice(NUMBERS), True, False, None, []],
+        'empty': {}
+    }
+
+
+def make_document(seed, count=12):
+    rng = random.Random(seed)
+    return {
+        'version': '2.0',
+        'scraped_at': '2025-11-21T15:00:00',
+        'ratio': rng.choice(NUMBERS),
+        'events': [make_event(i, rng) for i in range(count)],
+        'total': count + 0.5
+    }
+
+
+@pytest.fixture(params=[1, 2, 3, 5, 7])
+def chunk_size(request, monkeypatch):
+    monkeypatch.setattr(json_stream, 'CHUNK_SIZE', request.param)
+    return request.param
+
+
+@pytest.fixture(params=range(4))
+def document(request, tmp_path):
+    data = make_document(request.param)
+    path = tmp_path / 'events.json'
+    # Kompakt und eingerückt: Zahlen stehen mal vor ',' mal vor Zeilenumbruch
+    indent = 2 if request.param % 2 else None
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=indent), encoding='utf-8')
+    return path
+
+
+def test_read_header_matches_json_loads(document, chunk_size):
+    expected = json.loads(document.read_text(encoding='utf-8'))
+    events = expected.pop('events')
+
+    header, count = read_header(document)
+    assert header == expected
+    assert count == len(events)
+
+
+def test_iter_array_matches_json_loads(document, chunk_size):
+    expected = json.loads(document.read_text(encoding='utf-8'))['events']
+    assert list(iter_array(document)) == expected
+
+
+def test_find_by_hash_matches_json_loads(document, chunk_size):
+    events = json.loads(document.read_text(encoding='utf-8'))['events']
+    wanted = {'h0', 'h5', 'h11', 'fehlt'}
+
+    found = find_by_hash(document, wanted)
+    assert found == {e['meta']['hash']: e for e in events if e['meta']['hash'] in wanted}
+
+
+@pytest.mark.parametrize('text', ['1.5', '2e3', '-0.25E-2', '10', 'true', 'null'])
+def test_scalar_at_every_boundary(tmp_path, monkeypatch, text):
+    path = tmp_path / 'scalar.json'
+    path.write_text(f'{{"events": [{text}, {text}], "n": {text}}}', encoding='utf-8')
+    for size in range(1, len(text) + 3):
+        monkeypatch.setattr(json_stream, 'CHUNK_SIZE', size)
+        assert list(iter_array(path)) == [json.loads(text)] * 2
+        assert read_header(path) == ({'n': json.loads(text)}, 2)
+
+
+def test_truncated_file_raises(tmp_path):
+    path = tmp_path / 'broken.json'
+    path.write_text('{"events": [1.5, 2', encoding='utf-8')
+    with pytest.raises(ValueError):
+        list(iter_array(path))
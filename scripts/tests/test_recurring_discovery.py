@@ -0,0 +1,75 @@
+"""
+Tests für recurring_discovery: Serien-Erkennung und Regel-Vorschläge
+"""
+
+from datetime import date
+
+import pytest
+
+from recurring_discovery import analyze_dates, candidate_configs, discover_patterns, group_events
+from recurring_validator import RecurringValidator
+
+
+class NoVenues:
+    """Venue-Registry ohne Einträge (Orte werden nur normalisiert)"""
+
+    def get(self, name):
+        return None
+
+
+def record(day, path=None, title='Jazz-Session'):
+    return {'title': title, 'location': 'Galerie', 'date': day, '_path': path or f"_events/{day}.md"}
+
+
+WEEKLY = ['2025-01-07', '2025-01-14', '2025-01-21', '2025-01-28', '2025-02-04']
+
+
+def test_analyze_dates_skips_unparseable():
+    result = analyze_dates(WEEKLY + ['17.01.2025', 'demnächst'])
+    assert result['config']['frequency'] == 'weekly'
+    assert result['config']['by_day'] == ['TU']
+    assert result['matched'] == 5 and result['extra'] == 0
+
+
+def test_analyze_dates_accepts_date_objects():
+    result = analyze_dates([date.fromisoformat(day) for day in WEEKLY])
+    assert result['matched'] == 5
+
+
+def test_group_events_collects_invalid_dates():
+    records = [record(day) for day in WEEKLY] + [record('17.01.2025', '_events/alt.md')]
+    groups, configured, invalid = group_events(records)
+    assert [len(g) for g in groups.values()] == [5]
+    assert configured == set()
+    assert [r['_path'] for r in invalid] == ['_events/alt.md']
+
+
+def test_discover_patterns_survives_invalid_dates(capsys):
+    corpus = [record(day) for day in WEEKLY] + [record('17.01.2025', '_events/alt.md')]
+    proposals, stats = discover_patterns(corpus, state_file=None, registry=NoVenues())
+
+    assert stats['invalid_dates'] == 1
+    assert [p['config']['by_day'] for p in proposals] == [['TU']]
+    assert "_events/alt.md: '17.01.2025'" in capsys.readouterr().out
+
+
+# Zweiter Freitag bzw. letzter Sonntag im Monat
+SECOND_FRIDAY = ['2025-01-10', '2025-02-14', '2025-03-14', '2025-04-11', '2025-05-09']
+LAST_SUNDAY = ['2025-01-26', '2025-02-23', '2025-03-30', '2025-04-27', '2025-05-25']
+
+
+@pytest.mark.parametrize('days, by_set_pos', [(SECOND_FRIDAY, 2), (LAST_SUNDAY, -1)])
+def test_monthly_position_uses_by_set_pos(days, by_set_pos):
+    result = analyze_dates(days)
+    assert result['config']['frequency'] == 'monthly'
+    assert len(result['config']['by_day']) == 1
+    assert result['config']['by_set_pos'] == by_set_pos
+    assert result['matched'] == 5 and result['extra'] == 0
+
+
+@pytest.mark.parametrize('days', [WEEKLY, SECOND_FRIDAY, LAST_SUNDAY])
+def test_all_candidates_pass_validator(days):
+    dates = [date.fromisoformat(day) for day in days]
+    for config in candidate_configs(dates):
+        result = RecurringValidator().validate_recurring_config(config, event_date=days[0])
+        assert result['errors'] == [], config
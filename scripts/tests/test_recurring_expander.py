@@ -0,0 +1,105 @@
+"""
+Tests für RecurringExpander (Links virtueller Termine, Index und Scan-Manifest)
+"""
+
+import json
+from datetime import date
+
+import pytest
+
+import recurring_expander
+from recurring_expander import RecurringExpander
+
+
+@pytest.fixture
+def events_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(recurring_expander, 'EVENTS_DIR', tmp_path)
+    return tmp_path
+
+
+def template(found_in):
+    return {
+        'title': 'Karaoke-Abend', 'start_time': '18:00', 'location': "Butler's",
+        'template_file': f"{found_in}/2025-11-17-butlers-karaoke.md", 'found_in': found_in
+    }
+
+
+def test_template_in_events_links_itself(events_dir):
+    url = RecurringExpander().series_page_url(template('_events'), [])
+    assert url == '/events/2025-11-17-butlers-karaoke/'
+
+
+def test_archived_template_links_materialized_instance(events_dir):
+    (events_dir / '2026-01-07-karaoke-abend.md').write_text('---\n---\n', encoding='utf-8')
+    url = RecurringExpander().series_page_url(
+        template('_history/202511'), [date(2025, 12, 31), date(2026, 1, 7)]
+    )
+    assert url == '/events/2026-01-07-karaoke-abend/'
+
+
+def test_archived_template_without_instances_has_no_link(events_dir):
+    assert RecurringExpander().series_page_url(template('_history/202511'), [date(2026, 1, 7)]) is None
+
+
+TEMPLATE = """---
+title: "Wochenmarkt"
+date: 2025-11-19
+start_time: "08:00"
+location: "Maxplatz"
+recurring:
+  enabled: true
+  frequency: "weekly"
+  by_day: ["WE"]
+---
+"""
+
+
+@pytest.fixture
+def index_paths(events_dir, tmp_path, monkeypatch):
+    monkeypatch.setattr(recurring_expander, 'HISTORY_DIR', tmp_path / '_history')
+    monkeypatch.setattr(recurring_expander, 'INDEX_FILE', tmp_path / 'recurring_index.json')
+    monkeypatch.setattr(recurring_expander, 'MANIFEST_FILE', tmp_path / '.cache' / 'recurring_manifest.json')
+    (events_dir / '2025-11-19-wochenmarkt.md').write_text(TEMPLATE, encoding='utf-8')
+    (events_dir / '2025-11-20-einmalig.md').write_text('---\ntitle: "Einmalig"\n---\n', encoding='utf-8')
+    return recurring_expander.INDEX_FILE, recurring_expander.MANIFEST_FILE
+
+
+def scanned(use_manifest=True):
+    expander = RecurringExpander()
+    previous = expander.load_index() if use_manifest else None
+    expander.scan_for_recurring_events(previous)
+    return expander
+
+
+def test_index_holds_only_events_and_stats(index_paths):
+    index_file, manifest_file = index_paths
+    scanned().save_index()
+
+    index = json.loads(index_file.read_text(encoding='utf-8'))
+    assert set(index) == {'last_update', 'recurring_events', 'stats'}
+    assert [e['title'] for e in index['recurring_events']] == ['Wochenmarkt']
+    assert index['stats'] == {'total_recurring': 1, 'last_scan_files': 2}
+
+    manifest = json.loads(manifest_file.read_text(encoding='utf-8'))
+    assert set(manifest) == {'version', 'directories', 'templates'}
+    assert len(manifest['templates']) == 2
+
+
+def test_unchanged_scan_keeps_index_file(index_paths):
+    index_file, manifest_file = index_paths
+    scanned().save_index()
+    before = index_file.read_text(encoding='utf-8')
+
+    # Inkrementell: nichts neu geparst, Index unverändert
+    expander = scanned()
+    assert expander.stats['parsed_files'] == 0
+    assert expander.stats['recurring_found'] == 1
+    expander.save_index()
+    assert index_file.read_text(encoding='utf-8') == before
+
+    # Ohne Manifest (frischer Checkout): voller Scan, Index trotzdem unverändert
+    manifest_file.unlink()
+    expander = scanned()
+    assert expander.stats['parsed_files'] == 2
+    expander.save_index()
+    assert index_file.read_text(encoding='utf-8') == before
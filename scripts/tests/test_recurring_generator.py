@@ -0,0 +1,95 @@
+"""
+Tests für RecurringGenerator.generate_instances (recurring_validator.py)
+
+Erwartete Termine sind von Hand aus dem Kalender abgelesen, nicht aus
+einer zweiten Implementierung erzeugt.
+"""
+
+import pytest
+
+from recurring_validator import RecurringGenerator
+
+
+def dates(recurring, max_instances=10, from_date=None, days_ahead=60, date='2025-01-01'):
+    event = {'title': 'Test', 'date': date, 'recurring': {'enabled': True, **recurring}}
+    instances = RecurringGenerator().generate_instances(
+        event, days_ahead=days_ahead, max_instances=max_instances, from_date=from_date
+    )
+    return [instance['date'] for instance in instances]
+
+
+@pytest.mark.parametrize('recurring, from_date, expected', [
+    # Erster Freitag im Monat, Start direkt im Juni
+    ({'frequency': 'monthly', 'start_date': '2025-01-01', 'by_day': ['FR'], 'by_set_pos': 1},
+     '2025-06-01', ['2025-06-06', '2025-07-04', '2025-08-01']),
+    # Letzter Sonntag im Monat
+    ({'frequency': 'monthly', 'start_date': '2025-01-01', 'by_day': ['SU'], 'by_set_pos': -1},
+     None, ['2025-01-26', '2025-02-23', '2025-03-30']),
+    # Alle 3 Tage, from_date liegt zwischen zwei Terminen
+    ({'frequency': 'daily', 'interval': 3, 'start_date': '2025-01-01'},
+     '2025-01-05', ['2025-01-07', '2025-01-10', '2025-01-13']),
+    # Dienstag + Donnerstag, from_date mitten in der Woche
+    ({'frequency': 'weekly', 'start_date': '2025-03-03', 'by_day': ['TU', 'TH']},
+     '2025-03-12', ['2025-03-13', '2025-03-18', '2025-03-20']),
+    # Jeden zweiten Samstag ab 01.03.2025
+    ({'frequency': 'biweekly', 'start_date': '2025-03-01', 'by_day': ['SA']},
+     '2025-03-10', ['2025-03-15', '2025-03-29', '2025-04-12']),
+])
+def test_generate_from_date(recurring, from_date, expected):
+    assert dates(recurring, max_instances=3, from_date=from_date) == expected
+
+
+def test_yearly_leap_day_skips_non_leap_years():
+    recurring = {'frequency': 'yearly', 'start_date': '2024-02-29'}
+    assert dates(recurring, max_instances=2, from_date='2025-01-01',
+                 days_ahead=365 * 10) == ['2028-02-29', '2032-02-29']
+
+
+def test_exceptions_and_additions():
+    event = {'title': 'Test', 'date': '2025-05-04', 'recurring': {
+        'enabled': True, 'frequency': 'weekly', 'by_day': ['SU'],
+        'exceptions': ['2025-05-11'], 'additions': ['2025-05-14']
+    }}
+    instances = RecurringGenerator().generate_instances(event, max_instances=4)
+
+    assert [i['date'] for i in instances] == ['2025-05-04', '2025-05-14', '2025-05-18', '2025-05-25']
+    assert [i['date'] for i in instances if i.get('is_addition')] == ['2025-05-14']
+    assert all(i['recurring_parent'] == 'Test' for i in instances)
+
+
+def test_end_date_limits_instances():
+    recurring = {'frequency': 'weekly', 'start_date': '2025-03-03', 'by_day': ['MO'],
+                 'end_date': '2025-03-17'}
+    assert dates(recurring) == ['2025-03-03', '2025-03-10', '2025-03-17']
+
+
+def test_disabled_recurring_returns_event():
+    event = {'title': 'Einmalig', 'date': '2025-01-01', 'recurring': {'enabled': False}}
+    assert RecurringGenerator().generate_instances(event) == [event]
+
+
+# Konfigurationen, die der alte Tag-für-Tag-Generator anders ausgelegt hat
+# (siehe docs/RECURRING_EVENTS_ADVANCED.md, "Änderungen gegenüber dem alten Generator")
+
+@pytest.mark.parametrize('recurring, expected', [
+    # monthly + by_day ohne by_set_pos: jeder Freitag (früher nur der 3. des Monats)
+    ({'frequency': 'monthly', 'start_date': '2025-01-03', 'by_day': ['FR']},
+     ['2025-01-03', '2025-01-10', '2025-01-17']),
+    # yearly + by_day: alle Samstage im März (früher by_day ignoriert)
+    ({'frequency': 'yearly', 'start_date': '2025-03-01', 'by_day': ['SA']},
+     ['2025-03-01', '2025-03-08', '2025-03-15']),
+    # weekly ohne by_day: Wochentag von start_date (früher keine Termine)
+    ({'frequency': 'weekly', 'start_date': '2025-03-05'},
+     ['2025-03-05', '2025-03-12', '2025-03-19']),
+    # biweekly ab Mittwoch: Wochen beginnen montags
+    ({'frequency': 'biweekly', 'start_date': '2025-03-05', 'by_day': ['MO', 'FR']},
+     ['2025-03-07', '2025-03-17', '2025-03-21', '2025-03-31']),
+])
+def test_changed_semantics(recurring, expected):
+    assert dates(recurring, max_instances=len(expected)) == expected
+
+
+def test_invalid_rule_yields_no_instances(capsys):
+    recurring = {'frequency': 'monthly', 'start_date': '2025-01-01', 'by_set_pos': 1}
+    assert dates(recurring) == []
+    assert 'BYSETPOS' in capsys.readouterr().out
@@ -0,0 +1,69 @@
+"""
+Tests für RecurringValidator: Migrations-Warnungen für Konfigurationen,
+die die RRULE-Engine anders auslegt als der alte Generator
+"""
+
+import pytest
+
+from recurring_validator import RecurringValidator
+
+
+def validate(recurring, event_date=None):
+    return RecurringValidator().validate_recurring_config({'enabled': True, **recurring}, event_date)
+
+
+@pytest.mark.parametrize('recurring, fragment', [
+    ({'frequency': 'monthly', 'start_date': '2025-01-03', 'by_day': ['FR']}, 'JEDER passende Wochentag'),
+    ({'frequency': 'yearly', 'start_date': '2025-03-01', 'by_day': ['SA']}, 'yearly + by_day'),
+    ({'frequency': 'weekly', 'start_date': '2025-03-05'}, 'Wochentag von start_date (WE)'),
+    ({'frequency': 'biweekly', 'start_date': '2025-03-05', 'by_day': ['MO', 'FR']}, 'Wochen beginnen jetzt montags'),
+])
+def test_semantic_change_warnings(recurring, fragment):
+    result = validate(recurring)
+    assert result['is_valid']
+    assert any(fragment in warning for warning in result['warnings'])
+
+
+def test_weekly_without_by_day_uses_event_date():
+    result = validate({'frequency': 'weekly'}, event_date='2025-03-03')
+    assert any('(MO)' in warning for warning in result['warnings'])
+
+
+def test_set_pos_without_by_day_is_error_with_hint():
+    result = validate({'frequency': 'monthly', 'start_date': '2025-01-01', 'by_set_pos': 1})
+    assert not result['is_valid']
+    assert any('BYSETPOS' in error for error in result['errors'])
+    assert any('früher ignoriert' in warning for warning in result['warnings'])
+
+
+@pytest.mark.parametrize('recurring', [
+    {'frequency': 'monthly', 'start_date': '2025-01-01', 'by_day': ['FR'], 'by_set_pos': 1},
+    {'frequency': 'weekly', 'start_date': '2025-03-03', 'by_day': ['TU', 'TH']},
+    {'frequency': 'weekly', 'interval': 2, 'start_date': '2025-03-03', 'by_day': ['MO', 'FR']},
+    {'frequency': 'monthly', 'start_date': '2025-01-15'},
+    {'frequency': 'yearly', 'start_date': '2025-05-01'},
+])
+def test_unchanged_configs_have_no_warnings(recurring):
+    assert validate(recurring) == {'is_valid': True, 'errors': [], 'warnings': []}
+
+
+@pytest.mark.parametrize('recurring', [
+    {'frequency': 'monthly', 'start_date': '2025-01-01', 'by_day': ['1FR']},
+    {'frequency': 'monthly', 'start_date': '2025-01-01', 'by_day': ['-1SU']},
+    {'rrule': 'FREQ=MONTHLY;BYDAY=-1FR', 'start_date': '2025-01-01'},
+    {'rrule': 'FREQ=WEEKLY;INTERVAL=2;BYDAY=TU', 'start_date': '2025-01-07'},
+])
+def test_accepts_engine_forms(recurring):
+    assert validate(recurring, event_date='2025-01-07') == {'is_valid': True, 'errors': [], 'warnings': []}
+
+
+@pytest.mark.parametrize('recurring, fragment', [
+    ({'frequency': 'monthly', 'start_date': '2025-01-01', 'by_day': ['XX']}, "Ungültiger Wochentag: 'XX'"),
+    ({'frequency': 'monthly', 'start_date': '2025-01-01', 'by_day': ['60FR']}, 'Ungültige Position'),
+    ({'rrule': 'FREQ=MONTHLY;BYHOUR=10', 'start_date': '2025-01-01'}, 'BYHOUR'),
+    ({'rrule': 'FREQ=HOURLY', 'start_date': '2025-01-01'}, 'FREQ'),
+])
+def test_rejects_what_the_engine_rejects(recurring, fragment):
+    result = validate(recurring)
+    assert not result['is_valid']
+    assert any(fragment in error for error in result['errors'])
@@ -0,0 +1,149 @@
+"""
+Tests für die RRULE-Engine (scripts/lib/rrule.py)
+
+Alle erwarteten Termine sind von Hand aus dem Kalender abgelesen. Die
+Fälle laufen durch between() (skalar) und durch expand_batch() (numpy),
+damit beide Pfade gegen dieselben festen Werte geprüft werden.
+"""
+
+from datetime import date
+
+import pytest
+
+from rrule import RRule, expand_batch, expand_scalar, nth_weekday_in_month, weekdays_in_month
+
+
+def d(text):
+    return date.fromisoformat(text)
+
+
+# (Name, recurring-Konfiguration, Fenster, erwartete Termine)
+CASES = [
+    ('daily-interval',
+     {'frequency': 'daily', 'interval': 2, 'start_date': '2025-01-30', 'count': 4},
+     ('2025-01-01', '2025-12-31'), ['2025-01-30', '2025-02-01', '2025-02-03', '2025-02-05']),
+    ('daily-weekdays',
+     {'frequency': 'daily', 'start_date': '2025-12-24', 'by_day': ['MO', 'TU', 'WE', 'TH', 'FR']},
+     ('2025-12-24', '2025-12-31'), ['2025-12-24', '2025-12-25', '2025-12-26', '2025-12-29',
+                                    '2025-12-30', '2025-12-31']),
+    ('weekly-until',
+     {'frequency': 'weekly', 'start_date': '2025-03-02', 'by_day': ['SU'], 'end_date': '2025-03-23'},
+     ('2025-01-01', '2025-12-31'), ['2025-03-02', '2025-03-09', '2025-03-16', '2025-03-23']),
+    ('weekly-two-days',
+     {'frequency': 'weekly', 'start_date': '2025-11-19', 'by_day': ['WE', 'SA']},
+     ('2025-11-19', '2025-11-30'), ['2025-11-19', '2025-11-22', '2025-11-26', '2025-11-29']),
+    ('biweekly',
+     {'frequency': 'biweekly', 'start_date': '2025-11-20', 'by_day': ['TH']},
+     ('2025-11-01', '2026-01-05'), ['2025-11-20', '2025-12-04', '2025-12-18', '2026-01-01']),
+    ('weekly-interval-2',
+     {'frequency': 'weekly', 'interval': 2, 'start_date': '2025-11-20', 'by_day': ['TH']},
+     ('2025-11-01', '2026-01-05'), ['2025-11-20', '2025-12-04', '2025-12-18', '2026-01-01']),
+    # 31. fällt in kürzeren Monaten aus
+    ('monthly-day-31',
+     {'frequency': 'monthly', 'start_date': '2025-01-31', 'count': 4},
+     ('2025-01-01', '2025-12-31'), ['2025-01-31', '2025-03-31', '2025-05-31', '2025-07-31']),
+    ('monthly-last-day',
+     {'frequency': 'monthly', 'start_date': '2025-01-31', 'by_month_day': [-1]},
+     ('2025-01-01', '2025-04-30'), ['2025-01-31', '2025-02-28', '2025-03-31', '2025-04-30']),
+    ('monthly-second-tuesday',
+     {'frequency': 'monthly', 'start_date': '2025-12-09', 'by_day': ['TU'], 'by_set_pos': 2},
+     ('2025-12-01', '2026-03-31'), ['2025-12-09', '2026-01-13', '2026-02-10', '2026-03-10']),
+    ('monthly-first-friday',
+     {'frequency': 'monthly', 'start_date': '2025-12-05', 'by_day': ['FR'], 'by_set_pos': 1},
+     ('2025-12-01', '2026-03-31'), ['2025-12-05', '2026-01-02', '2026-02-06', '2026-03-06']),
+    ('monthly-last-sunday',
+     {'frequency': 'monthly', 'start_date': '2025-01-01', 'by_day': ['-1SU']},
+     ('2025-01-01', '2025-03-31'), ['2025-01-26', '2025-02-23', '2025-03-30']),
+    ('monthly-first-weekend-day',
+     {'frequency': 'monthly', 'start_date': '2025-03-01', 'by_day': ['SA', 'SU'], 'by_set_pos': 1},
+     ('2025-03-01', '2025-06-30'), ['2025-03-01', '2025-04-05', '2025-05-03', '2025-06-01']),
+    # monthly + by_day ohne by_set_pos: jeder Freitag
+    ('monthly-every-friday',
+     {'frequency': 'monthly', 'start_date': '2025-01-03', 'by_day': ['FR']},
+     ('2025-01-01', '2025-01-31'), ['2025-01-03', '2025-01-10', '2025-01-17', '2025-01-24',
+                                    '2025-01-31']),
+    ('yearly-leap-day',
+     {'frequency': 'yearly', 'start_date': '2024-02-29'},
+     ('2024-01-01', '2032-12-31'), ['2024-02-29', '2028-02-29', '2032-02-29']),
+    # Position bezieht sich auf den Monat von start_date (kein BYMONTH)
+    ('yearly-first-sunday',
+     {'frequency': 'yearly', 'start_date': '2025-10-05', 'by_day': ['1SU']},
+     ('2025-01-01', '2027-12-31'), ['2025-10-05', '2026-10-04', '2027-10-03']),
+    ('exceptions-additions',
+     {'frequency': 'weekly', 'start_date': '2025-05-04', 'by_day': ['SU'],
+      'exceptions': ['2025-05-11'], 'additions': ['2025-05-14']},
+     ('2025-05-01', '2025-05-25'), ['2025-05-04', '2025-05-14', '2025-05-18', '2025-05-25']),
+    # Fenster Jahre nach start_date (ohne COUNT: Sprung direkt ins Fenster)
+    ('far-window',
+     {'frequency': 'weekly', 'start_date': '2020-01-01', 'by_day': ['WE']},
+     ('2026-10-19', '2026-11-01'), ['2026-10-21', '2026-10-28']),
+    ('count-before-window',
+     {'frequency': 'weekly', 'start_date': '2025-01-06', 'by_day': ['MO'], 'count': 3},
+     ('2025-01-10', '2025-12-31'), ['2025-01-13', '2025-01-20']),
+    ('rrule-string',
+     {'rrule': 'RRULE:FREQ=MONTHLY;INTERVAL=2;BYMONTHDAY=15', 'start_date': '2025-01-15'},
+     ('2025-01-01', '2025-07-31'), ['2025-01-15', '2025-03-15', '2025-05-15', '2025-07-15']),
+]
+
+
+@pytest.mark.parametrize('config, window, expected', [c[1:] for c in CASES], ids=[c[0] for c in CASES])
+def test_between(config, window, expected):
+    rule = RRule.from_config(config)
+    assert rule.between(*window) == [d(day) for day in expected]
+
+
+@pytest.mark.parametrize('config, window, expected', [c[1:] for c in CASES], ids=[c[0] for c in CASES])
+def test_daywalk_reference(config, window, expected):
+    assert RRule.from_config(config).daywalk(*window) == [d(day) for day in expected]
+
+
+def test_expand_batch_all_cases():
+    pytest.importorskip('numpy')
+    start, end = d('2020-01-01'), d('2032-12-31')
+    rules = {name: RRule.from_config(config) for name, config, _window, _expected in CASES}
+
+    batch = expand_batch(rules, start, end)
+    assert batch == expand_scalar(rules, start, end)
+    for name, _config, (first, last), expected in CASES:
+        days = [day for series_id, day in batch if series_id == name and d(first) <= day <= d(last)]
+        assert days == [d(day) for day in expected], name
+
+
+def test_after_and_is_regular():
+    rule = RRule.from_config({'frequency': 'monthly', 'start_date': '2025-12-05',
+                              'by_day': ['FR'], 'by_set_pos': 1, 'additions': ['2026-01-20']})
+    assert rule.after('2026-01-02') == d('2026-01-20')
+    assert rule.after('2026-01-02', inclusive=True) == d('2026-01-02')
+    assert rule.is_regular('2026-01-02')
+    assert not rule.is_regular('2026-01-09')
+    assert not rule.is_regular('2026-01-20')  # nur RDATE
+
+
+def test_parse_and_to_string():
+    rule = RRule.parse('RRULE:FREQ=MONTHLY;BYDAY=-1SU;UNTIL=20261231T235959Z', '2025-01-01')
+    assert rule.to_string() == 'FREQ=MONTHLY;BYDAY=-1SU;UNTIL=20261231'
+    assert rule.until == d('2026-12-31')
+
+    config = RRule.from_config({'frequency': 'biweekly', 'start_date': '2025-11-20', 'by_day': ['TH']})
+    assert config.to_string() == 'FREQ=WEEKLY;INTERVAL=2;BYDAY=TH'
+
+
+@pytest.mark.parametrize('config, message', [
+    ({'frequency': 'hourly'}, 'frequency'),
+    ({'frequency': 'daily', 'interval': 0}, 'INTERVAL'),
+    ({'frequency': 'monthly', 'by_set_pos': 1}, 'BYSETPOS'),
+    ({'frequency': 'monthly', 'by_month_day': [32]}, 'BYMONTHDAY'),
+    ({'rrule': 'FREQ=WEEKLY;WKST=SU'}, 'WKST'),
+    ({'rrule': 'FREQ=WEEKLY;BYHOUR=10'}, 'BYHOUR'),
+])
+def test_invalid_rules(config, message):
+    with pytest.raises(ValueError, match=message):
+        RRule.from_config({'start_date': '2025-01-01', **config})
+
+
+def test_month_helpers():
+    # Januar 2026 beginnt an einem Donnerstag
+    assert list(weekdays_in_month(2026, 1, 3)) == [1, 8, 15, 22, 29]
+    assert nth_weekday_in_month(2026, 1, 3, 5) == 29
+    assert nth_weekday_in_month(2026, 1, 3, -1) == 29
+    assert nth_weekday_in_month(2026, 2, 3, 5) is None
@@ -0,0 +1,74 @@
+"""
+Tests für schemas.EventCollection: ID-Map hinter __contains__/get
+"""
+
+from schemas import Event, EventCollection
+
+
+def make_event(event_id, date='2025-01-01'):
+    return Event(id=event_id, title=event_id.upper(), date=date, start_time='20:00')
+
+
+def collection(*ids):
+    return EventCollection(events=[make_event(event_id) for event_id in ids])
+
+
+def test_contains_and_get():
+    c = collection('a', 'b')
+    assert 'a' in c and make_event('b') in c
+    assert 'x' not in c
+    assert c.get('b').title == 'B'
+    assert c.get('x') is None
+
+
+def test_add_event_and_extend_skip_duplicates():
+    c = collection('a')
+    assert c.add_event(make_event('b')) is True
+    assert c.add_event(make_event('a')) is False
+    assert c.extend([make_event('c'), make_event('b'), make_event('c'), make_event('d')]) == 2
+    assert [e.id for e in c.events] == ['a', 'b', 'c', 'd']
+    assert c.get('d') is c.events[3]
+
+
+def test_upsert_replaces_in_place():
+    c = collection('a', 'b')
+    assert c.upsert(make_event('b', date='2025-02-01')) is False
+    assert c.upsert(make_event('c')) is True
+    assert [e.id for e in c.events] == ['a', 'b', 'c']
+    assert c.get('b').date == '2025-02-01'
+
+
+def test_remove_shifts_positions():
+    c = collection('a', 'b', 'c')
+    assert c.remove('a').id == 'a'
+    assert c.remove('a') is None
+    assert 'a' not in c
+    assert c.get('c') is c.events[1]
+    assert c.add_event(make_event('a')) is True
+
+
+def test_sort_keeps_map():
+    c = EventCollection(events=[make_event('a', '2025-03-01'), make_event('b', '2025-01-01'),
+                                make_event('c', '2025-02-01')])
+    c.sort(key=lambda e: e.date)
+    assert [e.id for e in c.events] == ['b', 'c', 'a']
+    assert [c.get(event_id) is c.events[i] for i, event_id in enumerate('bca')] == [True] * 3
+
+
+def test_direct_changes():
+    c = collection('a', 'b')
+
+    # Längenänderung wird erkannt
+    c.events.append(make_event('c'))
+    assert c.get('c') is c.events[2]
+
+    # Treffer an veralteter Position wird erkannt
+    c.events.reverse()
+    assert c.get('a') is c.events[2]
+
+    # Ersetzte ID: erst nach reindex() auffindbar
+    c.events[0] = make_event('x')
+    assert 'x' not in c
+    c.reindex()
+    assert 'x' in c and 'c' not in c
+    assert c.get('x') is c.events[0]
@@ -7,9 +7,11 @@ Prüft alle URLs in archivierten Event-Dateien und markiert defekte Links.
 Verwendung:
     python scripts/check_broken_links.py
     python scripts/check_broken_links.py --fix  # Fügt 🔗💔 Icon zu defekten Links hinzu
+    python scripts/check_broken_links.py --from 2025-01-01 --to 2025-06-30  # inkl. _history/
 
 Funktionen:
     - Lädt alle Events mit status: "Archiviert"
+    - Mit --from/--to zusätzlich _history/ über den Archiv-Index (nur Monate im Zeitraum)
     - Prüft URL-Felder (url, source_url, etc.)
     - HTTP-Status-Codes checken
     - Markiert defekte Links mit 🔗💔 Icon
@@ -25,10 +27,15 @@ from datetime import datetime
 from typing import Dict, List, Tuple
 import time
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from archive_index import load_event, query_archive
+
 class BrokenLinkChecker:
-    def __init__(self, fix_mode=False):
+    def __init__(self, fix_mode=False, start=None, end=None):
         self.fix_mode = fix_mode
-        self.events_dir = Path(__file__).parent.parent / '_events'
+        self.events_dir = Path(__file__).parent.parent.parent / '_events'
+        self.start = start
+        self.end = end
         self.broken_links = []
         self.checked_links = set()
         self.session = requests.Session()
@@ -103,6 +110,16 @@ class BrokenLinkChecker:
             print(f"⚠️  Error parsing {filepath.name}: {e}")
             return None
     
+    def load_history_events(self) -> List[Dict]:
+        """Archivierte Events aus _history/ im Zeitraum (über den Archiv-Index)"""
+        events = []
+        for entry in query_archive(self.start, self.end):
+            event = load_event(entry)
+            if event:
+                event['_filepath'] = event['_path']
+                events.append(event)
+        return events
+    
     def extract_urls(self, event: Dict) -> List[Tuple[str, str]]:
         """
         Extrahiert alle URLs aus Event
@@ -234,6 +251,10 @@ class BrokenLinkChecker:
             if event and event.get('status') == 'Archiviert':
                 archived_events.append(event)
         
+        if self.start or self.end:
+            print(f"📂 Lade _history/ ({self.start or '…'} – {self.end or '…'})...")
+            archived_events.extend(self.load_history_events())
+        
         print(f"   Gefunden: {len(archived_events)} archivierte Events\n")
         
         if not archived_events:
@@ -252,7 +273,9 @@ class BrokenLinkChecker:
             if broken:
                 self.broken_links.extend(broken)
                 
-                if self.fix_mode:
+                if self.fix_mode and event.get('_packed'):
+                    print("\n   ⚠️  Gepackter Monat - erst entpacken (archive_pack.py --unpack)")
+                elif self.fix_mode:
                     print(f"\n   🔧 Markiere defekte Links...")
                     for link in broken:
                         success = self.mark_broken_link(
@@ -282,9 +305,17 @@ class BrokenLinkChecker:
 
 
 def main():
-    fix_mode = '--fix' in sys.argv or '-f' in sys.argv
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Prüft Links archivierter Events')
+    parser.add_argument('--fix', '-f', action='store_true', help='Defekte Links mit 🔗💔 markieren')
+    parser.add_argument('--from', dest='start', metavar='YYYY-MM-DD',
+                        help='Archiv (_history/) ab Datum mitprüfen')
+    parser.add_argument('--to', dest='end', metavar='YYYY-MM-DD',
+                        help='Archiv (_history/) bis Datum mitprüfen')
+    args = parser.parse_args()
     
-    checker = BrokenLinkChecker(fix_mode=fix_mode)
+    checker = BrokenLinkChecker(fix_mode=args.fix, start=args.start, end=args.end)
     exit_code = checker.run()
     
     sys.exit(exit_code)
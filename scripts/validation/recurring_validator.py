@@ -5,10 +5,16 @@ Validiert wiederkehrende Event-Konfigurationen und generiert Instanzen
 """
 
 import re
+import sys
 import yaml
 from datetime import datetime, timedelta
 from pathlib import Path
-from collections import defaultdict
+
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from event_corpus import load_event_corpus
+from recurring_discovery import discover_patterns
+from occurrence_cache import event_config, get_occurrence_cache
+from rrule import RRule, check_parity, parse_by_day
 
 EVENTS_DIR = Path("_events")
 
@@ -48,27 +54,30 @@ class RecurringValidator:
         if not recurring_data.get('enabled'):
             return {'is_valid': True, 'errors': [], 'warnings': ['recurring.enabled ist false']}
         
-        # Frequency prüfen
-        frequency = recurring_data.get('frequency')
-        if not frequency:
-            self.errors.append("recurring.frequency fehlt")
-        elif frequency not in VALID_FREQUENCIES:
-            self.errors.append(f"Ungültige frequency: '{frequency}'. Erlaubt: {', '.join(VALID_FREQUENCIES)}")
-        
-        # Interval prüfen
-        interval = recurring_data.get('interval', 1)
-        if not isinstance(interval, int) or interval < 1:
-            self.errors.append(f"interval muss positive Ganzzahl sein (ist: {interval})")
+        # Frequency/Interval prüfen (ein rrule-String ersetzt die Einzelfelder,
+        # seine Struktur prüft RRule.from_config weiter unten)
+        if not recurring_data.get('rrule'):
+            frequency = recurring_data.get('frequency')
+            if not frequency:
+                self.errors.append("recurring.frequency fehlt")
+            elif frequency not in VALID_FREQUENCIES:
+                self.errors.append(f"Ungültige frequency: '{frequency}'. Erlaubt: {', '.join(VALID_FREQUENCIES)}")
+            
+            interval = recurring_data.get('interval', 1)
+            if not isinstance(interval, int) or interval < 1:
+                self.errors.append(f"interval muss positive Ganzzahl sein (ist: {interval})")
         
-        # by_day prüfen
+        # by_day prüfen (wie die RRULE-Engine: "FR", "1FR", "-1SU")
         by_day = recurring_data.get('by_day')
         if by_day:
             if not isinstance(by_day, list):
                 self.errors.append("by_day muss Array sein")
             else:
-                for day in by_day:
-                    if day not in VALID_WEEKDAYS:
-                        self.errors.append(f"Ungültiger Wochentag: '{day}'. Erlaubt: {', '.join(VALID_WEEKDAYS)}")
+                try:
+                    parse_by_day(by_day)
+                except ValueError as e:
+                    self.errors.append(f"{e}. Erlaubt: {', '.join(VALID_WEEKDAYS)}, "
+                                       f"optional mit Position (z.B. 1FR, -1SU)")
         
         # Datum-Validierung
         start_date = recurring_data.get('start_date')
@@ -107,8 +116,68 @@ class RecurringValidator:
                     except ValueError:
                         self.errors.append(f"Ungültige Exception: '{exc}' (Format: YYYY-MM-DD)")
         
+        # Konfigurationen, die die RRULE-Engine anders auslegt als der alte Generator
+        if not self.errors and not recurring_data.get('rrule'):
+            self._check_semantic_changes(recurring_data, start or self._parse_date(event_date))
+        
+        # Regel mit der RRULE-Engine prüfen (by_set_pos, by_month_day, count, rrule)
+        if not self.errors:
+            try:
+                rule = RRule.from_config(recurring_data, default_start=event_date)
+            except ValueError as e:
+                self.errors.append(f"Ungültige Regel: {e}")
+            else:
+                if rule.first() is None:
+                    self.warnings.append(f"Regel erzeugt keine Termine ({rule.to_string()})")
+        
         return self._result()
     
+    def _check_semantic_changes(self, recurring_data, start):
+        """
+        Migrations-Check: Warnt, wenn eine bestehende Konfiguration seit der
+        RRULE-Engine andere Termine liefert als der alte Tag-für-Tag-Generator
+        """
+        frequency = recurring_data.get('frequency')
+        by_day = recurring_data.get('by_day') or []
+        by_set_pos = recurring_data.get('by_set_pos')
+        # Ordinal-Angaben ("1FR", "-1SU") kannte der alte Generator nicht
+        plain_days = [day for day in by_day if day in VALID_WEEKDAYS]
+        
+        if frequency == 'monthly' and plain_days and by_set_pos is None \
+                and not recurring_data.get('by_month_day'):
+            self.warnings.append(
+                "monthly + by_day ohne by_set_pos: jetzt JEDER passende Wochentag im Monat "
+                "(früher nur der Monatstag von start_date) – für 'erster …' by_set_pos: 1 setzen"
+            )
+        if frequency == 'yearly' and plain_days:
+            self.warnings.append(
+                "yearly + by_day: Wochentage im Monat von start_date werden jetzt ausgewertet "
+                "(früher ignoriert, nur das Datum von start_date)"
+            )
+        if frequency in ('weekly', 'biweekly') and not by_day and start:
+            self.warnings.append(
+                f"{frequency} ohne by_day: erzeugt jetzt Termine am Wochentag von start_date "
+                f"({VALID_WEEKDAYS[start.weekday()]}), früher keine"
+            )
+        step = recurring_data.get('interval', 1) * (2 if frequency == 'biweekly' else 1)
+        if frequency in ('weekly', 'biweekly') and step > 1 and start and \
+                any(WEEKDAY_MAP.get(day, 7) < start.weekday() for day in by_day):
+            self.warnings.append(
+                "Wochen beginnen jetzt montags: by_day-Tage vor dem Wochentag von start_date "
+                "fallen in die Folgewoche des Intervalls (früher 7-Tage-Blöcke ab start_date)"
+            )
+        if by_set_pos is not None and not by_day and not recurring_data.get('by_month_day'):
+            self.warnings.append(
+                "by_set_pos ohne by_day wurde früher ignoriert – by_day ergänzen oder by_set_pos entfernen"
+            )
+    
+    @staticmethod
+    def _parse_date(value):
+        try:
+            return datetime.strptime(str(value), '%Y-%m-%d').date() if value else None
+        except ValueError:
+            return None
+    
     def _result(self):
         return {
             'is_valid': len(self.errors) == 0,
@@ -120,7 +189,7 @@ class RecurringValidator:
 class RecurringGenerator:
     """Generiert Instanzen wiederkehrender Events"""
     
-    def generate_instances(self, event_data, days_ahead=60, max_instances=50):
+    def generate_instances(self, event_data, days_ahead=60, max_instances=50, from_date=None):
         """
         Generiert Event-Instanzen für wiederkehrende Events
         
@@ -128,6 +197,8 @@ class RecurringGenerator:
             event_data: Event mit recurring-Konfiguration
             days_ahead: Wie viele Tage in die Zukunft
             max_instances: Maximale Anzahl Instanzen
+            from_date: Erst ab diesem Datum generieren (springt direkt dorthin;
+                       default: ab start_date)
         
         Returns:
             list: Liste von Event-Instanzen
@@ -137,335 +208,102 @@ class RecurringGenerator:
         if not recurring or not recurring.get('enabled'):
             return [event_data]  # Einmaliges Event
         
-        instances = []
-        
-        # Start- und End-Datum
-        start_date = recurring.get('start_date') or event_data.get('date')
-        if isinstance(start_date, str):
-            start_date = datetime.strptime(start_date, '%Y-%m-%d').date()
-        
-        end_date = recurring.get('end_date')
-        if end_date and isinstance(end_date, str):
-            end_date = datetime.strptime(end_date, '%Y-%m-%d').date()
+        try:
+            rule = RRule.from_event(event_data)
+        except ValueError as e:
+            print(f"  ⚠️  Ungültige Regel ({event_data.get('title')}): {e}")
+            return []
         
-        # Maximales Datum
+        # Maximales Datum (end_date steckt als UNTIL in der Regel)
         max_date = datetime.now().date() + timedelta(days=days_ahead)
-        if end_date:
-            max_date = min(max_date, end_date)
-        
-        # Exceptions und Additions
-        exceptions = set(recurring.get('exceptions', []))
-        additions = recurring.get('additions', [])
+        additions = set(rule.rdates)
         
-        # Generiere reguläre Instanzen
-        frequency = recurring.get('frequency')
-        interval = recurring.get('interval', 1)
-        by_day = recurring.get('by_day')
-        by_set_pos = recurring.get('by_set_pos')  # NEU: Position im Monat
-        
-        # Tägliches Durchlaufen aller Tage von start bis max_date
-        current = start_date
-        count = 0
-        
-        while current <= max_date and count < max_instances:
-            should_include = False
-            weekday = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU'][current.weekday()]
-            
-            # Frequenz-basierte Logik
-            if frequency == 'daily':
-                # Täglich: Jeder Tag ist gültig (mit interval)
-                days_diff = (current - start_date).days
-                should_include = (days_diff % interval == 0)
-                
-                # by_day Filter (optional bei daily)
-                if should_include and by_day:
-                    should_include = weekday in by_day
-            
-            elif frequency in ['weekly', 'biweekly']:
-                # Wöchentlich: Nur bestimmte Wochentage
-                if by_day and weekday in by_day:
-                    # Prüfe ob die Woche passt (interval)
-                    weeks_diff = (current - start_date).days // 7
-                    multiplier = 2 if frequency == 'biweekly' else 1
-                    should_include = (weeks_diff % (interval * multiplier) == 0)
-            
-            elif frequency == 'monthly':
-                # Monatlich: Verschiedene Modi
-                if by_set_pos is not None and by_day:
-                    # Position im Monat (z.B. "erster Freitag", "letzter Sonntag")
-                    should_include = self._is_nth_weekday_in_month(current, by_day, by_set_pos)
-                    
-                    # Prüfe Monats-Interval
-                    if should_include:
-                        months_diff = (current.year - start_date.year) * 12 + (current.month - start_date.month)
-                        should_include = (months_diff % interval == 0)
-                
-                else:
-                    # Fester Tag im Monat (z.B. "15. jeden Monats")
-                    if current.day == start_date.day:
-                        months_diff = (current.year - start_date.year) * 12 + (current.month - start_date.month)
-                        should_include = (months_diff % interval == 0)
-                        
-                        # by_day Filter (optional)
-                        if should_include and by_day:
-                            should_include = weekday in by_day
-            
-            elif frequency == 'yearly':
-                # Jährlich: Gleicher Tag und Monat
-                if current.month == start_date.month and current.day == start_date.day:
-                    years_diff = current.year - start_date.year
-                    should_include = (years_diff % interval == 0)
-            
-            # Instanz hinzufügen
-            if should_include:
-                date_str = current.strftime('%Y-%m-%d')
-                
-                # Prüfe Ausnahmen
-                if date_str not in exceptions:
-                    instance = event_data.copy()
-                    instance['date'] = date_str
-                    instance['is_recurring_instance'] = True
-                    instance['recurring_parent'] = event_data.get('title')
-                    instances.append(instance)
-                    count += 1
+        instances = []
+        for current in rule.iter_dates(from_date):
+            if current > max_date or len(instances) >= max_instances:
+                break
             
-            # Nächster Tag
-            current = current + timedelta(days=1)
+            instance = event_data.copy()
+            instance['date'] = current.strftime('%Y-%m-%d')
+            instance['is_recurring_instance'] = True
+            if current in additions and not rule.is_regular(current):
+                instance['is_addition'] = True  # Markierung als Zusatztermin
+            instance['recurring_parent'] = event_data.get('title')
+            instances.append(instance)
         
-        # Additions hinzufügen (außerordentliche Termine)
-        for addition_date in additions:
-            if isinstance(addition_date, str):
-                try:
-                    add_date = datetime.strptime(addition_date, '%Y-%m-%d').date()
-                    
-                    # Nur wenn im gültigen Zeitraum
-                    if start_date <= add_date <= max_date:
-                        # Prüfe ob schon vorhanden
-                        if not any(inst['date'] == addition_date for inst in instances):
-                            instance = event_data.copy()
-                            instance['date'] = addition_date
-                            instance['is_recurring_instance'] = True
-                            instance['is_addition'] = True  # Markierung als Zusatztermin
-                            instance['recurring_parent'] = event_data.get('title')
-                            instances.append(instance)
-                except ValueError:
-                    pass  # Ungültiges Datum ignorieren
-        
-        # Sortiere nach Datum
-        instances.sort(key=lambda x: x['date'] if isinstance(x['date'], str) else str(x['date']))
-        
-        return instances[:max_instances]
+        return instances
     
-    def _is_nth_weekday_in_month(self, date, by_day, by_set_pos):
+    def get_next_occurrence_after(self, event_data, after_date=None):
         """
-        Prüft ob ein Datum der N-te Wochentag im Monat ist
-        
-        Args:
-            date: Zu prüfendes Datum
-            by_day: Liste der erlaubten Wochentage (z.B. ["FR"])
-            by_set_pos: Position (1=erster, 2=zweiter, -1=letzter)
+        Findet nächsten Termin nach einem Datum
         
-        Returns:
-            bool: True wenn Datum passt
+        Binäre Suche im gemeinsamen Occurrence-Cache statt neuer Expansion.
         """
-        weekday = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU'][date.weekday()]
-        
-        # Prüfe ob richtiger Wochentag
-        if weekday not in by_day:
-            return False
-        
-        # Finde alle Vorkommen dieses Wochentags im Monat
-        import calendar
-        month_start = date.replace(day=1)
-        month_days = calendar.monthrange(date.year, date.month)[1]
-        
-        occurrences = []
-        for day in range(1, month_days + 1):
-            check_date = date.replace(day=day)
-            check_weekday = ['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU'][check_date.weekday()]
-            if check_weekday == weekday:
-                occurrences.append(day)
-        
-        # Prüfe Position
-        if by_set_pos > 0:
-            # Positiv: 1=erster, 2=zweiter, etc.
-            if by_set_pos <= len(occurrences):
-                return date.day == occurrences[by_set_pos - 1]
-        else:
-            # Negativ: -1=letzter, -2=vorletzter, etc.
-            pos = by_set_pos
-            if abs(pos) <= len(occurrences):
-                return date.day == occurrences[pos]
-        
-        return False
-        
-        return instances
-    
-    def _next_occurrence(self, current, frequency, interval):
-        """Berechnet nächsten Termin"""
-        if frequency == 'daily':
-            return current + timedelta(days=interval)
-        elif frequency == 'weekly' or frequency == 'biweekly':
-            weeks = 2 if frequency == 'biweekly' else 1
-            return current + timedelta(days=7 * interval * weeks)
-        elif frequency == 'monthly':
-            # Monat erhöhen
-            month = current.month + interval
-            year = current.year
-            while month > 12:
-                month -= 12
-                year += 1
-            # Gleicher Tag im nächsten Monat (oder letzter Tag des Monats)
-            try:
-                return current.replace(year=year, month=month)
-            except ValueError:
-                # Tag existiert nicht (z.B. 31. Februar)
-                import calendar
-                last_day = calendar.monthrange(year, month)[1]
-                return current.replace(year=year, month=month, day=last_day)
-        elif frequency == 'yearly':
-            return current.replace(year=current.year + interval)
-        
-        return current
-    
-    def get_next_occurrence_after(self, event_data, after_date=None):
-        """Findet nächsten Termin nach einem Datum"""
         if after_date is None:
             after_date = datetime.now().date()
         
-        instances = self.generate_instances(event_data, days_ahead=365, max_instances=1)
+        recurring = event_data.get('recurring')
+        if not recurring or not recurring.get('enabled'):
+            return None
         
-        for instance in instances:
-            inst_date = instance['date']
-            if isinstance(inst_date, str):
-                inst_date = datetime.strptime(inst_date, '%Y-%m-%d').date()
-            
-            if inst_date > after_date:
-                return instance
+        config, default_start = event_config(event_data)
+        next_date = get_occurrence_cache().next_after(config, after_date, default_start=default_start)
+        if next_date is None:
+            return None
         
-        return None
+        instance = event_data.copy()
+        instance['date'] = next_date.strftime('%Y-%m-%d')
+        instance['is_recurring_instance'] = True
+        instance['recurring_parent'] = event_data.get('title')
+        return instance
 
 
 class RecurringDetector:
-    """Erkennt automatisch wiederkehrende Patterns in Events"""
+    """Erkennt automatisch wiederkehrende Patterns in Events (inkl. Archiv)"""
     
-    def detect_recurring_patterns(self, events_dir=EVENTS_DIR):
+    def detect_recurring_patterns(self, events_dir=EVENTS_DIR, full=False):
         """
-        Findet potentiell wiederkehrende Events
+        Findet potentiell wiederkehrende Events in _events/ und _history/
+        
+        Nutzt das gemeinsame Event-Korpus und recurring_discovery; neu
+        analysiert werden nur Gruppen mit neuen/geänderten Events.
         
         Returns:
-            dict: Gruppen von Events die wiederkehrend sein könnten
+            dict: (titel, location) → {'events', 'pattern', 'count'}
         """
-        events = []
+        corpus = load_event_corpus(events_dir=events_dir, history_dir=events_dir / "_history")
+        proposals, _stats = discover_patterns(corpus, full=full)
         
-        for file_path in events_dir.glob("*.md"):
-            if file_path.name.startswith('_'):
-                continue
-            
-            event_data = self._parse_event_file(file_path)
-            if event_data:
-                events.append({
-                    'file': file_path,
-                    'data': event_data
-                })
-        
-        # Gruppiere nach Titel + Location
-        title_groups = defaultdict(list)
-        
-        for event in events:
-            # Vereinfachter Titel (ohne Datum)
-            title = event['data'].get('title', '')
-            title_simple = re.sub(r'\d{1,2}\.\s*\w+|\d{4}', '', title).strip()
-            
-            location = event['data'].get('location', '')
-            key = (title_simple.lower(), location.lower())
-            
-            title_groups[key].append(event)
-        
-        # Finde Gruppen mit 2+ Events
         recurring_candidates = {}
-        
-        for key, group in title_groups.items():
-            if len(group) >= 2:
-                # Analysiere Pattern
-                pattern = self._analyze_pattern(group)
-                if pattern:
-                    recurring_candidates[key] = {
-                        'events': group,
-                        'pattern': pattern,
-                        'count': len(group)
-                    }
-        
-        return recurring_candidates
-    
-    def _parse_event_file(self, file_path):
-        """Parst Event-Datei"""
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-            if match:
-                data = yaml.safe_load(match.group(1))
-                
-                if isinstance(data.get('date'), str):
-                    data['date'] = datetime.strptime(data['date'], '%Y-%m-%d').date()
-                
-                return data
-        except Exception:
-            pass
-        
-        return None
-    
-    def _analyze_pattern(self, events):
-        """Analysiert Datums-Pattern einer Event-Gruppe"""
-        dates = [e['data']['date'] for e in events if e['data'].get('date')]
-        dates.sort()
-        
-        if len(dates) < 2:
-            return None
-        
-        # Berechne Intervalle
-        intervals = []
-        for i in range(len(dates) - 1):
-            delta = (dates[i+1] - dates[i]).days
-            intervals.append(delta)
-        
-        # Erkenne Pattern
-        if all(i == 7 for i in intervals):
-            return {
-                'frequency': 'weekly',
-                'interval': 1,
-                'by_day': [['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU'][dates[0].weekday()]],
-                'confidence': 1.0
-            }
-        elif all(i == 14 for i in intervals):
-            return {
-                'frequency': 'weekly',
-                'interval': 2,
-                'by_day': [['MO', 'TU', 'WE', 'TH', 'FR', 'SA', 'SU'][dates[0].weekday()]],
-                'confidence': 1.0
-            }
-        elif all(28 <= i <= 31 for i in intervals):
-            return {
-                'frequency': 'monthly',
-                'interval': 1,
-                'by_month_day': dates[0].day,
-                'confidence': 0.9
-            }
-        elif len(set(intervals)) == 1:
-            # Einheitliches Intervall (aber nicht standard)
-            return {
-                'frequency': 'custom',
-                'interval_days': intervals[0],
-                'confidence': 0.7
+        for proposal in proposals:
+            recurring_candidates[(proposal['title'], proposal['location'])] = {
+                'events': proposal['files'],
+                'pattern': {**proposal['config'], 'confidence': proposal['confidence']},
+                'count': proposal['events'],
+                'proposal': proposal
             }
         
-        return None
+        return recurring_candidates
 
 
 def main():
     """Hauptprogramm - Validiert alle Events"""
+    import argparse
+    
+    parser = argparse.ArgumentParser(description='Recurring Events Validator')
+    parser.add_argument('--check-parity', type=int, nargs='?', const=2000, metavar='N',
+                        help='RRULE-Engine gegen Tag-für-Tag-Referenz prüfen (N Zufallsfälle)')
+    args = parser.parse_args()
+    
+    if args.check_parity:
+        mismatches = check_parity(args.check_parity)
+        print(f"🔁 Paritäts-Check: {args.check_parity} Fälle, {len(mismatches)} Abweichungen")
+        for mismatch in mismatches[:5]:
+            print(f"   ❌ {mismatch['config']} {mismatch['window']}")
+            print(f"      erwartet: {mismatch['expected']}")
+            print(f"      erhalten: {mismatch['actual']}")
+        raise SystemExit(1 if mismatches else 0)
+    
     print("🔄 Recurring Events Validator\n")
     
     validator = RecurringValidator()
@@ -543,7 +381,8 @@ def main():
             print(f"   Pattern: {data['pattern']['frequency']}")
             if data['pattern'].get('by_day'):
                 print(f"   Wochentage: {', '.join(data['pattern']['by_day'])}")
-            print(f"   Konfidenz: {data['pattern']['confidence']:.0%}")
+            print(f"   Konfidenz: {data['pattern']['confidence']:.0%} "
+                  f"({data['proposal']['missed']} ausgefallene Termine)")
             print()
     else:
         print("ℹ️  Keine wiederkehrenden Patterns gefunden\n")
@@ -567,7 +406,9 @@ def main():
                     if data.get('recurring', {}).get('enabled'):
                         print(f"📌 {data.get('title')}")
                         
-                        instances = generator.generate_instances(data, days_ahead=30, max_instances=5)
+                        instances = generator.generate_instances(
+                            data, days_ahead=30, max_instances=5, from_date=datetime.now().date()
+                        )
                         
                         for i, inst in enumerate(instances[:5], 1):
                             print(f"   {i}. {inst['date']} - {data.get('start_time', 'N/A')}")
@@ -5,11 +5,15 @@ Prüft Events auf häufige Datumsfehler und bietet Korrekturvorschläge
 """
 
 import re
+import sys
 import yaml
 from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+sys.path.insert(0, str(Path(__file__).parent.parent / 'lib'))
+from occurrence_cache import event_config, get_occurrence_cache
+
 EVENTS_DIR = Path("_events")
 
 class EventDateValidator:
@@ -133,7 +137,13 @@ class EventDateValidator:
             })
     
     def check_recurring_patterns(self, events):
-        """Erkennt potentiell wiederkehrende Events"""
+        """
+        Erkennt potentiell wiederkehrende Events
+        
+        Gruppen mit aktivem recurring-Template sind bereits Serien: deren
+        Termine werden gegen die Regel geprüft (Occurrence-Cache) statt als
+        Kandidat gemeldet.
+        """
         title_groups = defaultdict(list)
         
         for event in events:
@@ -143,7 +153,34 @@ class EventDateValidator:
             title_groups[simple_title].append(event)
         
         recurring_candidates = []
+        off_pattern = []
+        occurrences = get_occurrence_cache()
         for title, title_events in title_groups.items():
+            templates = [e for e in title_events
+                         if isinstance(e['data'].get('recurring'), dict) and e['data']['recurring'].get('enabled')]
+            if templates:
+                template = templates[0]['data']
+                dates = [e['data']['date'] for e in title_events
+                         if e['data'].get('date') and e['data'] is not template]
+                if not dates:
+                    continue
+                config, default_start = event_config(template)
+                try:
+                    expected = set(occurrences.occurrences(config, min(dates), max(dates), default_start))
+                except ValueError:
+                    continue  # ungültige Regel meldet recurring_validator.py
+                for event in title_events:
+                    event_date = event['data'].get('date')
+                    if event['data'] is not template and event_date and event_date not in expected:
+                        off_pattern.append({
+                            'file': event['file'].name,
+                            'title': event['data'].get('title', ''),
+                            'date': event_date,
+                            'template': templates[0]['file'].name
+                        })
+                        self.stats['off_pattern_instances'] += 1
+                continue
+            
             if len(title_events) >= 2:
                 # Prüfe ob gleiche Location
                 locations = set(e['data'].get('location', '') for e in title_events)
@@ -164,6 +201,15 @@ class EventDateValidator:
                 'events': recurring_candidates,
                 'recommendation': 'Diese Events könnten wiederkehrend sein. Erwäge, ein "recurring"-Feld hinzuzufügen.'
             })
+        
+        if off_pattern:
+            self.issues.append({
+                'type': '📆 TERMINE AUSSERHALB DER SERIE',
+                'severity': 'WARNING',
+                'count': len(off_pattern),
+                'events': off_pattern,
+                'recommendation': 'Diese Termine passen nicht zur recurring-Regel ihres Templates. Als "additions" eintragen oder Datum prüfen.'
+            })
     
     def check_suspicious_dates(self, events):
         """Prüft auf verdächtige Datumsmuster"""
@@ -286,6 +332,13 @@ class EventDateValidator:
                     print(f"     {event['count']} Vorkommen an: {', '.join(str(d) for d in event['dates'][:3])}")
                     print()
             
+            elif issue['type'] == '📆 TERMINE AUSSERHALB DER SERIE':
+                print("   Termine:")
+                for event in issue['events'][:10]:
+                    print(f"   • {event['title']} am {event['date']}")
+                    print(f"     Datei: {event['file']} | Template: {event['template']}")
+                    print()
+            
             elif issue['type'] == '🚨 VERDÄCHTIGE DATUMSANGABEN':
                 print("   Inkonsistente Events:")
                 for event in issue['events']: